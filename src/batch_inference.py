@@ -0,0 +1,100 @@
+import argparse
+import time
+
+import cv2
+
+"""
+Kayıtlı konveyör videolarının çevrimdışı yeniden sayımı için toplu (batch) çıkarım.
+N kare okunur, modele tek çağrıda verilir ve her karenin sonucu sırasıyla
+EggCounter'ın takip/sayım mantığına aktarılır. Böylece YOLO tahmin ediciğinin
+çağrı başına sabit maliyeti N kareye bölünür.
+"""
+
+
+def read_batches(cap, batch_size):
+    """
+    Videodan batch_size uzunluğunda kare listeleri üretir.
+    Son liste daha kısa olabilir.
+
+    Parametreler:
+    cap: cv2.VideoCapture nesnesi
+    batch_size (int): Bir gruptaki kare sayısı
+    """
+    batch = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        batch.append(frame)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def count_batched(cap, model, process, batch_size=8, model_input=None):
+    """
+    Videoyu gruplar halinde modele verir ve sonuçları sırayla işler.
+
+    Parametreler:
+    cap: cv2.VideoCapture nesnesi
+    model: YOLO modeli (kare listesi alıp sonuç listesi döndüren)
+    process: (frame, result) -> bool fonksiyonu; tek bir karenin sonucunu sayaca aktarır,
+        işlem durdurulmalıysa (ör. pencerede 'q') False döndürür
+    batch_size (int): Bir çıkarım çağrısındaki kare sayısı
+    model_input: Kareyi modele verilecek girdiye çeviren isteğe bağlı fonksiyon (ör. ROI kırpma)
+
+    Return:
+    İşlenen kare sayısı
+    """
+    frames_done = 0
+    batches = read_batches(cap, batch_size)
+    for batch in batches:
+        inputs = [model_input(frame) for frame in batch] if model_input else batch
+        results = model(inputs, verbose=False)
+        # Sonuçlar karelerle aynı sırada döner; sayım sırası korunur
+        for frame, result in zip(batch, results):
+            frames_done += 1
+            if not process(frame, result):
+                # Durdurma isteği: gruptaki kalan kareler işlenmeden bırakılır, okuyucu kapatılır
+                batches.close()
+                return frames_done
+    return frames_done
+
+
+if __name__ == "__main__":
+    """
+    Farklı batch boyutları için kare/s ölçer.
+    Her batch boyutu videoyu baştan işler; sayımlar aynı olmalıdır.
+    """
+    from ultralytics import YOLO
+
+    from counting import EggCounter, results_to_detections
+
+    parser = argparse.ArgumentParser(description="Toplu çıkarım ile çevrimdışı yumurta sayımı")
+    parser.add_argument("--input", required=True, help="Giriş videosu")
+    parser.add_argument("--model", required=True, help="YOLO model ağırlıkları")
+    parser.add_argument("--line-position", type=int, default=300)
+    parser.add_argument("--direction", default="right_to_left", choices=("right_to_left", "left_to_right"))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    model = YOLO(args.model)
+
+    print(f"{'batch':>6} {'kare':>7} {'süre (s)':>9} {'kare/s':>8} {'sayım':>6}")
+    for batch_size in args.batch_sizes:
+        cap = cv2.VideoCapture(args.input)
+        egg_counter = EggCounter(args.line_position, args.direction)
+
+        def process(frame, result):
+            egg_counter.process_frame(frame, results_to_detections([result]))
+            return True
+
+        start = time.perf_counter()
+        frames = count_batched(cap, model, process, batch_size)
+        elapsed = time.perf_counter() - start
+        cap.release()
+
+        print(f"{batch_size:>6} {frames:>7} {elapsed:>9.2f} {frames / elapsed:>8.1f} "
+              f"{egg_counter.get_total_count():>6}")
@@ -0,0 +1,93 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import conveyor_detections
+from engine import EVENT_DTYPE, Checkpointer, CountingEngine, EventLog, load_checkpoint, read_events
+
+"""
+Olay kaydı (EventLog) ve checkpoint maliyetini ölçer.
+1. Kare başına farklı olay sayılarında (yüksek yumurta hızları) olay başına
+   fsync ile toplu fsync karşılaştırılır: olay/s, fsync sayısı, kare başına süre.
+2. Sentetik kalabalık bir bantta CountingEngine.feed() olay kaydı ve
+   checkpoint ile ve onlarsız çalıştırılır; ek yük kare/s olarak raporlanır.
+3. Checkpoint yazma ve geri yükleme süreleri (ms) ölçülür.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_events --frames 2000
+"""
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def synthetic_events(per_frame, frames):
+    events = np.zeros(per_frame * frames, dtype=EVENT_DTYPE)
+    events["track_id"] = np.arange(len(events))
+    events["frame"] = np.repeat(np.arange(frames), per_frame)
+    events["timestamp"] = time.time()
+    return events.reshape(frames, per_frame)
+
+
+def run_log(path, batches, batch_size, sync_interval):
+    log = EventLog(path, batch_size, sync_interval)
+    start = time.perf_counter()
+    for events in batches:
+        log.write(events)
+    log.close()
+    elapsed = time.perf_counter() - start
+    assert len(read_events(path)) == batches.size
+    os.remove(path)
+    return elapsed, log.syncs
+
+
+def run_engine(frames, directory, with_log):
+    engine = CountingEngine(WIDTH // 2)
+    if with_log:
+        engine.event_log = EventLog(os.path.join(directory, "engine.events"))
+        engine.checkpointer = Checkpointer(os.path.join(directory, "engine.ckpt"), every=300)
+    start = time.perf_counter()
+    for detections in frames:
+        engine.feed(detections)
+    if with_log:
+        engine.event_log.flush()
+    return time.perf_counter() - start, engine
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--eggs", type=int, default=200, help="Motor ölçümünde görüşteki yumurta sayısı")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.events")
+        print(f"{'olay/kare':>10} {'politika':<14} {'olay/s':>12} {'fsync':>7} {'us/kare':>9}")
+        for per_frame in (1, 10, 100):
+            batches = synthetic_events(per_frame, args.frames)
+            for name, batch_size, sync_interval in (("her yazmada", 1, 0.0), ("toplu", 256, 1.0)):
+                elapsed, syncs = run_log(path, batches, batch_size, sync_interval)
+                print(f"{per_frame:>10} {name:<14} {batches.size / elapsed:>12.0f} {syncs:>7} "
+                      f"{elapsed / args.frames * 1e6:>9.1f}")
+
+        frames = list(conveyor_detections(args.eggs, args.frames, WIDTH, HEIGHT, speed=12))
+        plain, engine = run_engine(frames, directory, with_log=False)
+        logged, logged_engine = run_engine(frames, directory, with_log=True)
+        print(f"\nCountingEngine ({args.eggs} yumurta, {engine.count} geçiş): kayıtsız {args.frames / plain:.0f} kare/s, "
+              f"olay kaydı + checkpoint ile {args.frames / logged:.0f} kare/s "
+              f"({logged_engine.event_log.syncs} fsync, {logged_engine.checkpointer.saves} checkpoint)")
+
+        checkpoint = os.path.join(directory, "engine.ckpt")
+        start = time.perf_counter()
+        logged_engine.checkpointer.save(logged_engine)
+        save_ms = (time.perf_counter() - start) * 1e3
+        restored = CountingEngine(WIDTH // 2)
+        start = time.perf_counter()
+        load_checkpoint(restored, checkpoint)
+        load_ms = (time.perf_counter() - start) * 1e3
+        logged_engine.event_log.close()
+        status = "eşit" if restored.count == logged_engine.count else "FARKLI"
+        print(f"Checkpoint: yazma {save_ms:.2f} ms, geri yükleme {load_ms:.2f} ms "
+              f"({os.path.getsize(checkpoint) / 1024:.1f} KB, sayım {status})")
@@ -0,0 +1,46 @@
+import time
+
+from benchmarks.synthetic import SyntheticResult, conveyor_detections
+from detections import extract_boxes, to_detection_array
+
+"""
+Kutu başına .tolist()/.item() çağıran eski tespit çıkarma döngüsü ile
+tensör düzeyindeki extract_boxes() fonksiyonunu karşılaştırır.
+torch kuruluysa sentetik sonuçlar torch tensörleriyle oluşturulur.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_extract
+"""
+
+
+def legacy_extract(results):
+    detections = []
+    for box in results[0].boxes:
+        x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
+        confidence = box.conf[0].item()
+        if confidence > 0.5:
+            detections.append((x1, y1, x2, y2, confidence))
+    return detections
+
+
+def vectorized_extract(results):
+    boxes, conf, _ = extract_boxes(results[0], 0.5)
+    return to_detection_array(boxes, conf)
+
+
+def measure(fn, results, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(results)
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    print(f"{'kutu':>6} {'eski (us/kare)':>15} {'tensör (us/kare)':>17} {'hızlanma':>9}")
+    for n_boxes in (1, 10, 60, 200, 500):
+        results = [SyntheticResult(next(conveyor_detections(n_boxes, 1)))]
+        assert len(legacy_extract(results)) == len(vectorized_extract(results))
+        repeat = max(20, 20000 // n_boxes)
+        legacy = measure(legacy_extract, results, repeat)
+        vectorized = measure(vectorized_extract, results, repeat)
+        print(f"{n_boxes:>6} {legacy * 1e6:>15.1f} {vectorized * 1e6:>17.1f} {legacy / vectorized:>8.1f}x")
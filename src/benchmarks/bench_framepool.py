@@ -0,0 +1,99 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic import conveyor_detections, ellipse_masks
+from frame_pool import FramePool
+from masks import MaskCompositor
+
+"""
+Kare başına yeni dizi ayıran okuma + kopyalayan bindirme yolu ile halka
+tamponlu (FramePool) okuma + yerinde bindirme yolunu karşılaştırır.
+Geçici bir video yazılır, iki yol aynı videoyu çözer, maskeleri bindirir ve
+sayım çizgisini çizer. Kare başına yeni tam kare ayırma/kopya sayısı, kare/s
+ve tepe bellek (tracemalloc) raporlanır; halka yolunda ayırma ve kopya
+sayılarının 0 olması beklenir.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_framepool
+"""
+
+WIDTH, HEIGHT = 1280, 720
+MASK_W, MASK_H = 640, 384
+
+
+def write_video(path, frames):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (WIDTH, HEIGHT))
+    frame = np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    for detections in frames:
+        frame[:] = 90
+        for x1, y1, x2, y2, _ in detections:
+            cv2.ellipse(frame, ((x1 + x2) // 2, (y1 + y2) // 2), ((x2 - x1) // 2, (y2 - y1) // 2),
+                        0, 0, 360, (230, 230, 230), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def annotate(frame, line_position=WIDTH // 2):
+    cv2.line(frame, (line_position, 0), (line_position, frame.shape[0]), (0, 0, 255), 3)
+    return frame
+
+
+def run_legacy(path, inputs):
+    cap = cv2.VideoCapture(path)
+    compositor = MaskCompositor()
+    allocations = copies = 0
+    previous = None
+    tracemalloc.start()
+    start = time.perf_counter()
+    for masks, boxes in inputs:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        allocations += frame is not previous  # cap.read() her karede yeni dizi döndürür
+        previous = frame
+        out = annotate(compositor.composite(frame, masks, boxes))  # İç tampona kopya
+        copies += out is not frame
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    cap.release()
+    return elapsed, peak, allocations / len(inputs), copies / len(inputs)
+
+
+def run_pooled(path, inputs):
+    cap = cv2.VideoCapture(path)
+    compositor = MaskCompositor()
+    pool = FramePool((HEIGHT, WIDTH, 3))
+    tracemalloc.start()
+    start = time.perf_counter()
+    for masks, boxes in inputs:
+        ret, frame = pool.read(cap)
+        if not ret:
+            break
+        pool.check(annotate(compositor.composite(frame, masks, boxes, out=frame)))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    cap.release()
+    stats = pool.stats()
+    return elapsed, peak, stats["allocations_per_frame"], stats["copies_per_frame"]
+
+
+if __name__ == "__main__":
+    n_frames = 120
+    print(f"{'yumurta':>8} {'yol':<7} {'kare/s':>8} {'tepe MB':>8} {'ayırma/kare':>12} {'kopya/kare':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "conveyor.avi")
+        for n_eggs in (10, 60):
+            frames = list(conveyor_detections(n_eggs, n_frames, WIDTH, HEIGHT))
+            write_video(path, frames)
+            inputs = [(ellipse_masks(d, (WIDTH, HEIGHT), (MASK_W, MASK_H)), np.array([det[:4] for det in d], dtype=np.int64)) for d in frames]
+            for name, run in (("eski", run_legacy), ("halka", run_pooled)):
+                elapsed, peak, allocations, copies = run(path, inputs)
+                print(f"{n_eggs:>8} {name:<7} {n_frames / elapsed:>8.1f} {peak / 2**20:>8.1f} "
+                      f"{allocations:>12.2f} {copies:>11.2f}")
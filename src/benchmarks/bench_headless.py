@@ -0,0 +1,52 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import conveyor_detections
+from counting import EggCounter
+from sinks import VideoFileSink
+
+"""
+Headless (yalnızca sayım) yol ile çizim + video kodlama yapan yolu karşılaştırır.
+Model çıkarımı dahil değildir; ölçülen fark sayım döngüsünün kendi maliyetidir.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_headless
+"""
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def run_annotated(frames, out_path):
+    counter = EggCounter(WIDTH // 2)
+    sink = VideoFileSink(out_path, 30, (WIDTH, HEIGHT))
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    start = time.perf_counter()
+    for detections in frames:
+        frame[:] = 0  # Çözülmüş yeni kareyi taklit et
+        sink.write(counter.process_frame(frame, detections))
+    elapsed = time.perf_counter() - start
+    sink.close()
+    return elapsed, counter.get_total_count()
+
+
+def run_headless(frames):
+    counter = EggCounter(WIDTH // 2)
+    start = time.perf_counter()
+    for detections in frames:
+        counter.update(detections)
+    return time.perf_counter() - start, counter.get_total_count()
+
+
+if __name__ == "__main__":
+    n_frames = 300
+    print(f"{'yumurta':>8} {'çizimli (kare/s)':>17} {'headless (kare/s)':>18} {'sayım':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_eggs in (10, 60, 200):
+            frames = list(conveyor_detections(n_eggs, n_frames, WIDTH, HEIGHT))
+            annotated, count_a = run_annotated(frames, os.path.join(tmp, "out.mp4"))
+            headless, count_h = run_headless(frames)
+            print(f"{n_eggs:>8} {n_frames / annotated:>17.1f} {n_frames / headless:>18.1f} "
+                  f"{count_a:>4} / {count_h:<4}")
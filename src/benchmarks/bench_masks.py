@@ -0,0 +1,82 @@
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic import conveyor_detections, ellipse_masks
+from masks import MaskCompositor, MaskSet
+
+"""
+segment_trying.py içindeki eski maske bindirme döngüsü (her maske için tam kare
+büyütme, tam kare renk maskesi ve addWeighted) ile tek geçişli MaskCompositor'ı
+karşılaştırır. Kare başına süre ve tepe bellek (tracemalloc) raporlanır.
+İkinci tabloda maske özellikleri (alan, ağırlık merkezi) için her maskeyi kare
+boyutuna büyüten eski yol, MaskSet.features() toplu hesabıyla karşılaştırılır;
+maskelerin yoğun (dense), RLE ve poligon temsillerindeki boyutları da verilir.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_masks
+"""
+
+WIDTH, HEIGHT = 1280, 720
+MASK_W, MASK_H = 640, 384
+
+
+def legacy_composite(frame, masks):
+    overlay = frame.copy()
+    for mask in masks:
+        mask = cv2.resize(mask, (frame.shape[1], frame.shape[0]))
+        color_mask = np.zeros_like(frame)
+        color_mask[mask > 0.5] = [0, 255, 0]
+        overlay = cv2.addWeighted(overlay, 0.7, color_mask, 0.3, 0)
+    return overlay
+
+
+def legacy_features(masks):
+    areas, centroids = [], []
+    for mask in masks:
+        binary = cv2.resize(mask, (WIDTH, HEIGHT)) > 0.5
+        ys, xs = np.nonzero(binary)
+        areas.append(len(xs))
+        centroids.append((xs.mean(), ys.mean()) if len(xs) else (np.nan, np.nan))
+    return np.array(areas), np.array(centroids)
+
+
+def measure(fn, inputs):
+    fn(*inputs[0])  # Isınma (tamponlar ilk çağrıda ayrılır)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for args in inputs:
+        fn(*args)
+    elapsed = (time.perf_counter() - start) / len(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    frame = np.full((HEIGHT, WIDTH, 3), 90, dtype=np.uint8)
+    print(f"{'yumurta':>8} {'eski ms/kare':>13} {'eski tepe MB':>13} {'yeni ms/kare':>13} {'yeni tepe MB':>13}")
+    for n_eggs in (1, 10, 30, 60):
+        frames = list(conveyor_detections(n_eggs, 20, WIDTH, HEIGHT))
+        inputs = [(frame, ellipse_masks(d, (WIDTH, HEIGHT), (MASK_W, MASK_H)), np.array([det[:4] for det in d], dtype=np.int64))
+                  for d in frames]
+
+        legacy, legacy_peak = measure(lambda f, m, b: legacy_composite(f, m), inputs)
+        compositor = MaskCompositor()
+        single, single_peak = measure(compositor.composite, inputs)
+        print(f"{n_eggs:>8} {legacy * 1e3:>13.2f} {legacy_peak / 2**20:>13.1f} "
+              f"{single * 1e3:>13.2f} {single_peak / 2**20:>13.1f}")
+
+    print(f"\n{'yumurta':>8} {'eski özellik ms':>16} {'toplu özellik ms':>17} {'dense KB':>9} {'RLE KB':>7} "
+          f"{'poligon KB':>11}")
+    for n_eggs in (1, 10, 30, 60, 200):
+        frames = list(conveyor_detections(n_eggs, 10, WIDTH, HEIGHT))
+        inputs = [(ellipse_masks(d, (WIDTH, HEIGHT), (MASK_W, MASK_H)),) for d in frames]
+        legacy, _ = measure(legacy_features, inputs)
+        bulk, _ = measure(lambda m: MaskSet(m, np.arange(len(m))).features((WIDTH, HEIGHT)), inputs)
+        masks = MaskSet(inputs[0][0], np.arange(len(inputs[0][0])))
+        polygon_bytes = sum(polygon.nbytes for polygon in masks.polygons())
+        print(f"{n_eggs:>8} {legacy * 1e3:>16.2f} {bulk * 1e3:>17.2f} {masks.dense().nbytes / 1024:>9.0f} "
+              f"{masks.to_rle().nbytes / 1024:>7.1f} {polygon_bytes / 1024:>11.1f}")
@@ -0,0 +1,47 @@
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import conveyor_detections
+from counting import EggCounter
+
+"""
+Uzun bir sentetik akış boyunca sayacın bellek kullanımını izler.
+İz kapasitesi ve süreç RSS değeri düzenli aralıklarla yazdırılır; ilk
+ısınmadan sonra her iki değerin de sabit kalması beklenir.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_memory --frames 200000 --eggs 60
+"""
+
+
+def rss_mb():
+    """
+    Sürecin o anki RSS değerini MB olarak döndürür (Linux: /proc, diğer: tepe RSS).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=200000)
+    parser.add_argument("--eggs", type=int, default=60)
+    parser.add_argument("--max-missed", type=int, default=5)
+    parser.add_argument("--every", type=int, default=20000, help="Kaç karede bir ölçüm yapılacağı")
+    args = parser.parse_args()
+
+    counter = EggCounter(640, max_missed=args.max_missed)
+    start = time.perf_counter()
+    print(f"{'kare':>9} {'sayım':>8} {'son ID':>8} {'aktif iz':>9} {'kapasite':>9} {'RSS (MB)':>9}")
+    for frame_idx, detections in enumerate(conveyor_detections(args.eggs, args.frames), 1):
+        counter.update(detections)
+        if frame_idx % args.every == 0:
+            print(f"{frame_idx:>9} {counter.get_total_count():>8} {counter.object_id:>8} "
+                  f"{len(counter.tracker):>9} {counter.tracker.capacity:>9} {rss_mb():>9.1f}")
+    elapsed = time.perf_counter() - start
+    print(f"{args.frames / elapsed:.0f} kare/s")
@@ -0,0 +1,124 @@
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import counting
+import segment_egg
+import segment_trying
+from benchmarks.synthetic import StubDetector, conveyor_detections, expected_count, render_frame
+
+"""
+Üç modülün (counting, segment_egg, segment_trying) EggCounter.process_frame
+yolunu uçtan uca ölçer: sentetik bant karesi çizilir, StubDetector gerçek
+kutulara titreme ve kayıp tespit ekleyerek YOLO sonucu döndürür, sonuç
+process_frame ile işlenir. Görüşteki yumurta sayısı 1'den 200'e kadar
+değiştirilir; kare/s, kare başına gecikme (p50/p95), kare başına geçici
+bellek ayırma (tracemalloc tepe değeri) ve gerçek sayıma göre sayım hatası
+raporlanır. Kare çizimi ve sahte dedektör süreye dahil değildir.
+
+Gerçek video, model, GPU veya ağ gerekmez; --min-fps ve --max-error
+verildiğinde eşiklerin altında kalan bir satır olursa çıkış kodu 1 olur,
+böylece performans değişiklikleri için gerileme kontrolü olarak kullanılabilir.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_process_frame --densities 1 10 50 100 200 --min-fps 20 --max-error 0
+"""
+
+WIDTH, HEIGHT = 1280, 720
+MODULES = {"counting": counting, "segment_egg": segment_egg, "segment_trying": segment_trying}
+
+
+def make_step(name, max_missed):
+    """
+    Modülün EggCounter'ını oluşturur ve (kare, YOLO sonuçları) alan işleme fonksiyonunu döndürür.
+    counting.EggCounter tespit dizisi beklediği için sonuçlar önce results_to_detections ile çevrilir.
+    """
+    counter = MODULES[name].EggCounter(WIDTH // 2, max_missed=max_missed)
+    if name == "counting":
+        step = lambda frame, results: counter.process_frame(frame, counting.results_to_detections(results))
+    else:
+        step = counter.process_frame
+    return counter, step
+
+
+def run(name, truth, detector, max_missed, alloc_frames):
+    """
+    Bir modülü bir yoğunlukta çalıştırır.
+
+    Return:
+    {"latencies", "alloc_kb", "count"} sözlüğü
+    """
+    frame = np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+    # Süre ölçümü (tracemalloc kapalı)
+    counter, step = make_step(name, max_missed)
+    latencies = np.empty(len(truth))
+    for i, detections in enumerate(truth):
+        results = detector(detections)
+        render_frame(detections, WIDTH, HEIGHT, out=frame)
+        start = time.perf_counter()
+        step(frame, results)
+        latencies[i] = time.perf_counter() - start
+    count = counter.count
+
+    # Bellek ölçümü: yalnızca process_frame içindeki geçici ayırmalar
+    _, step = make_step(name, max_missed)
+    peaks = []
+    tracemalloc.start()
+    for detections in truth[:alloc_frames]:
+        results = detector(detections)
+        render_frame(detections, WIDTH, HEIGHT, out=frame)
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        step(frame, results)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    return {"latencies": latencies, "alloc_kb": np.mean(peaks) / 1024 if peaks else 0.0, "count": count}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="process_frame uçtan uca benchmark ve gerileme kontrolü")
+    parser.add_argument("--modules", nargs="+", default=list(MODULES), choices=list(MODULES))
+    parser.add_argument("--densities", nargs="+", type=int, default=[1, 10, 50, 100, 200],
+                        help="Görüşteki yumurta sayıları")
+    parser.add_argument("--frames", type=int, default=150)
+    parser.add_argument("--speed", type=int, default=6, help="Bant hızı (piksel/kare)")
+    parser.add_argument("--jitter", type=float, default=1.0, help="Kutu köşesi gürültüsü (piksel, standart sapma)")
+    parser.add_argument("--dropout", type=float, default=0.02, help="Tespitin bir karede kaybolma olasılığı")
+    parser.add_argument("--max-missed", type=int, default=2, help="EggCounter max_missed")
+    parser.add_argument("--alloc-frames", type=int, default=20, help="Bellek ölçümündeki kare sayısı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-fps", type=float, default=None, help="Bu kare/s değerinin altı gerileme sayılır")
+    parser.add_argument("--max-error", type=int, default=None, help="Bu mutlak sayım hatasının üstü gerileme sayılır")
+    args = parser.parse_args()
+
+    print(f"{'modül':<15} {'yumurta':>8} {'kare/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'KB/kare':>9} "
+          f"{'sayım':>6} {'gerçek':>7} {'hata':>5}")
+    failures = []
+    for n_eggs in args.densities:
+        truth = list(conveyor_detections(n_eggs, args.frames, WIDTH, HEIGHT, args.speed, seed=args.seed))
+        true_count = expected_count(truth, WIDTH // 2)
+        for name in args.modules:
+            # Her modül aynı gürültüyü görür
+            detector = StubDetector(args.jitter, args.dropout, masks=name != "counting",
+                                    frame_size=(WIDTH, HEIGHT), seed=args.seed)
+            result = run(name, truth, detector, args.max_missed, args.alloc_frames)
+            latencies = result["latencies"] * 1e3
+            fps = len(latencies) / (latencies.sum() / 1e3)
+            error = result["count"] - true_count
+            print(f"{name:<15} {n_eggs:>8} {fps:>8.1f} {np.percentile(latencies, 50):>8.2f} "
+                  f"{np.percentile(latencies, 95):>8.2f} {result['alloc_kb']:>9.1f} "
+                  f"{result['count']:>6} {true_count:>7} {error:>+5d}")
+            if args.min_fps is not None and fps < args.min_fps:
+                failures.append(f"{name} / {n_eggs} yumurta: {fps:.1f} kare/s < {args.min_fps}")
+            if args.max_error is not None and abs(error) > args.max_error:
+                failures.append(f"{name} / {n_eggs} yumurta: sayım hatası {error:+d}")
+
+    if failures:
+        print("Gerileme:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
@@ -0,0 +1,214 @@
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import sys
+import time
+
+from benchmarks.synthetic import BlobDetector, conveyor_detections, expected_count, render_frame
+from multistream import StreamSpec
+from service import WS_CLOSE, WS_TEXT, CountingService, ws_accept_key, ws_encode, ws_read
+
+"""
+CountingService'i sentetik video kaynaklarıyla uçtan uca çalıştırır ve yerel
+istemcilerle bağlanır. Birden çok hat, render_frame() ile çizilen karelerden
+oluşur; BlobDetector yumurtaları yalnızca karenin piksellerinden bulur ve
+çıkarım süresini bekleyerek taklit eder.
+
+Her senaryoda farklı sayıda WebSocket abonesi bağlanır; abonelerin yarısı hiç
+okumayan yavaş istemcilerdir. Raporlanan değerler:
+- Servisin toplam kare/s değeri (abone sayısı arttıkça düşmemeli)
+- Hızlı abone başına alınan mesaj sayısı (güncellemeler birleştirilir)
+- Olay döngüsünün en büyük gecikmesi (ms)
+- send_timeout nedeniyle kapatılan abone sayısı
+- Hızlı abonelerin son mesajdaki sayımı ve aldıkları olay sayısının gerçek sayımla
+  eşitliği, HTTP /counts ve /events yanıtlarının doğruluğu
+
+Yerel bağlantıda soket tamponları okumayan abonelerin tüm mesajlarını
+emer; bu yüzden son olarak küçük gönderim tamponu (send_buffer) ve kısa
+send_timeout ile bir kopma senaryosu çalışır. Bu senaryoda tüm yavaş
+abonelerin kapatılması ve kare/s değerinin ilk senaryoya göre
+--fps-tolerance oranından fazla düşmemesi beklenir.
+
+Gerçek video, model veya ağ gerekmez (yalnızca 127.0.0.1); herhangi bir
+kontrol başarısız olursa çıkış kodu 1 olur.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_service --subscribers 0 10 100 --drop-subscribers 10
+"""
+
+WIDTH, HEIGHT = 1280, 720
+LINES = (("hat1", 640, "right_to_left"), ("hat2", 500, "right_to_left"), ("hat3", 800, "right_to_left"))
+
+
+async def http_get(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+async def ws_connect(port, path="/ws?since=0", rcvbuf=None):
+    if rcvbuf:
+        # Alım tamponu bağlantıdan önce küçültülür (TCP pencere ölçeği el sıkışmada belirlenir)
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", port))
+        reader, writer = await asyncio.open_connection(sock=sock)
+    else:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    if b" 101 " not in head or ws_accept_key(key).encode() not in head:
+        raise ConnectionError("WebSocket el sıkışması başarısız")
+    return reader, writer
+
+
+async def fast_client(port):
+    """
+    Tüm mesajları okur; sunucu kapanana kadar son durumu ve alınan olayları toplar.
+    """
+    reader, writer = await ws_connect(port)
+    messages, events, state = 0, [], None
+    try:
+        while True:
+            opcode, payload = await ws_read(reader)
+            if opcode == WS_CLOSE:
+                writer.write(ws_encode(payload[:2], WS_CLOSE, mask=os.urandom(4)))
+                break
+            if opcode == WS_TEXT:
+                message = json.loads(payload)
+                messages += 1
+                state = message["state"]
+                events.extend(message["events"])
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    writer.close()
+    return {"messages": messages, "events": events, "state": state}
+
+
+async def slow_client(port, done, rcvbuf=None):
+    """
+    Bağlanır ama hiç okumaz; servis bitince bağlantıyı kapatır.
+    """
+    try:
+        _, writer = await ws_connect(port, rcvbuf=rcvbuf)
+    except ConnectionError:
+        return
+    await done.wait()
+    writer.close()
+
+
+def synthetic_source(n_eggs, n_frames, seed):
+    for detections in conveyor_detections(n_eggs, n_frames, WIDTH, HEIGHT, seed=seed):
+        yield render_frame(detections, WIDTH, HEIGHT)
+
+
+async def scenario(args, subscribers, drop=False):
+    streams = [StreamSpec(name, synthetic_source(args.eggs, args.frames, seed), line, direction)
+               for seed, (name, line, direction) in enumerate(LINES)]
+    truth = {name: expected_count(list(conveyor_detections(args.eggs, args.frames, WIDTH, HEIGHT, seed=seed)),
+                                  line, direction)
+             for seed, (name, line, direction) in enumerate(LINES)}
+    if drop:
+        # Küçük tamponlar dolar ve okumayan aboneler send_timeout sonunda kapatılır
+        options = {"update_interval": args.drop_interval, "send_timeout": args.drop_timeout,
+                   "send_buffer": args.drop_buffer}
+    else:
+        options = {"update_interval": args.update_interval, "send_timeout": args.send_timeout}
+    service = CountingService(BlobDetector(args.detector_ms / 1e3), streams, port=0, **options)
+    run = asyncio.ensure_future(service.run(linger=0.5))
+    await service.ready.wait()
+
+    done = asyncio.Event()
+    n_fast = subscribers - subscribers // 2
+    fast = [asyncio.ensure_future(fast_client(service.port)) for _ in range(n_fast)]
+    slow = [asyncio.ensure_future(slow_client(service.port, done, args.drop_buffer if drop else None))
+            for _ in range(subscribers // 2)]
+
+    start = time.perf_counter()
+    while not all(line.done for line in service.lines):
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    counts_http = await http_get(service.port, "/counts")
+    events_http = await http_get(service.port, "/events?since=0")
+    counts = await run
+    done.set()
+    results = await asyncio.gather(*fast)
+    await asyncio.gather(*slow)
+
+    total_truth = sum(truth.values())
+    failures = []
+    if counts != truth:
+        failures.append(f"sayım {counts} != gerçek {truth}")
+    # /events yalnızca son recent_events olayı tutar; eksik kalanlar "dropped" alanında bildirilir
+    if counts_http["total"] != total_truth or len(events_http["events"]) + events_http["dropped"] != total_truth:
+        failures.append("HTTP yanıtı gerçek sayımla eşleşmiyor")
+    for result in results:
+        seqs = [event["seq"] for event in result["events"]]
+        if result["state"] is None or result["state"]["total"] != total_truth or sorted(set(seqs)) != seqs \
+                or len(seqs) != total_truth:
+            failures.append("hızlı abone son durumu veya olayları eksik / yanlış")
+            break
+    if drop and service.clients_dropped != subscribers // 2:
+        failures.append(f"{subscribers // 2} yavaş aboneden {service.clients_dropped} abone kapatıldı")
+
+    frames = sum(line.frames for line in service.lines)
+    return {"fps": frames / elapsed, "messages": sum(r["messages"] for r in results) / max(1, len(results)),
+            "lag_ms": service.loop_lag * 1e3, "dropped": service.clients_dropped, "count": sum(counts.values()),
+            "truth": total_truth, "failures": failures}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Asyncio sayım servisi uçtan uca ölçümü")
+    parser.add_argument("--subscribers", nargs="+", type=int, default=[0, 10, 100],
+                        help="WebSocket abone sayıları (yarısı hiç okumayan yavaş istemci)")
+    parser.add_argument("--eggs", type=int, default=30, help="Hat başına görüşteki yumurta sayısı")
+    parser.add_argument("--frames", type=int, default=300, help="Hat başına kare sayısı")
+    parser.add_argument("--detector-ms", type=float, default=2.0, help="Taklit edilen çıkarım süresi (ms)")
+    parser.add_argument("--update-interval", type=float, default=0.05)
+    parser.add_argument("--send-timeout", type=float, default=1.0)
+    parser.add_argument("--drop-subscribers", type=int, default=10,
+                        help="Kopma senaryosundaki abone sayısı (0: senaryo çalışmaz)")
+    parser.add_argument("--drop-timeout", type=float, default=0.2, help="Kopma senaryosunda send_timeout (s)")
+    parser.add_argument("--drop-buffer", type=int, default=4096,
+                        help="Kopma senaryosunda sunucu gönderim ve yavaş abone alım tamponu (bayt)")
+    parser.add_argument("--drop-interval", type=float, default=0.01,
+                        help="Kopma senaryosunda güncelleme aralığı (tamponların dolması için kısa)")
+    parser.add_argument("--fps-tolerance", type=float, default=0.25,
+                        help="Kopma senaryosunda ilk senaryoya göre izin verilen kare/s düşüşü (oran)")
+    args = parser.parse_args()
+
+    print(f"{'abone':>6} {'kare/s':>8} {'mesaj/abone':>12} {'döngü gecikmesi ms':>19} {'kapatılan':>10} "
+          f"{'sayım':>6} {'gerçek':>7}")
+    failures = []
+    runs = [(subscribers, False) for subscribers in args.subscribers]
+    if args.drop_subscribers:
+        runs.append((args.drop_subscribers, True))
+    baseline_fps = None
+    for subscribers, drop in runs:
+        result = asyncio.run(scenario(args, subscribers, drop))
+        label = f"{subscribers}*" if drop else str(subscribers)
+        print(f"{label:>6} {result['fps']:>8.1f} {result['messages']:>12.1f} {result['lag_ms']:>19.2f} "
+              f"{result['dropped']:>10} {result['count']:>6} {result['truth']:>7}")
+        failures.extend(f"{label} abone: {failure}" for failure in result["failures"])
+        if baseline_fps is None:
+            baseline_fps = result["fps"]
+        elif drop and result["fps"] < (1 - args.fps_tolerance) * baseline_fps:
+            failures.append(f"{label} abone: kare/s {result['fps']:.1f}, ilk senaryo {baseline_fps:.1f}")
+    if args.drop_subscribers:
+        print(f"* kopma senaryosu: send_timeout={args.drop_timeout} s, send_buffer={args.drop_buffer} B")
+
+    if failures:
+        print("Hata:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
@@ -0,0 +1,69 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import conveyor_detections
+from counting import EggCounter
+from frame_skip import AdaptiveSkipper
+
+"""
+Her karede dedektör çalıştıran yol ile uyarlamalı kare atlamayı karşılaştırır.
+Dedektör yerine sentetik tespitler kullanılır; model süresi sabit bir gecikme
+(--detector-ms) ile temsil edilir. Sayımların eşit kalması ve dedektör çağrı
+sayısının bant hızıyla birlikte artması beklenir.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_skip --detector-ms 20
+"""
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def make_detector(detections, detector_ms):
+    state = {"frame": 0}
+
+    def detect(frame):
+        if detector_ms:
+            time.sleep(detector_ms / 1000)
+        return detections[state["frame"]]
+
+    return state, detect
+
+
+def run(detections, detector_ms, adaptive):
+    counter = EggCounter(WIDTH // 2)
+    skipper = AdaptiveSkipper(counter, WIDTH) if adaptive else None
+    state, detect = make_detector(detections, detector_ms)
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    calls = 0
+    start = time.perf_counter()
+    for frame_idx in range(len(detections)):
+        state["frame"] = frame_idx
+        if skipper:
+            skipper.process(frame, detect)
+        else:
+            counter.update(detect(frame))
+            calls += 1
+    if skipper:
+        skipper.finish(frame, detect)
+        calls = skipper.detections
+    return time.perf_counter() - start, counter.get_total_count(), calls
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--detector-ms", type=float, default=20.0, help="Kare başına taklit edilen model süresi")
+    args = parser.parse_args()
+
+    print(f"{'yumurta':>8} {'hız':>4} {'her kare (kare/s)':>18} {'uyarlamalı (kare/s)':>20} "
+          f"{'dedektör':>9} {'sayım':>11}")
+    for n_eggs in (10, 60, 200):
+        for speed in (2, 6, 12):
+            detections = [np.asarray(d, dtype=np.float64)
+                          for d in conveyor_detections(n_eggs, args.frames, WIDTH, HEIGHT, speed)]
+            full, count_f, _ = run(detections, args.detector_ms, False)
+            adaptive, count_a, calls = run(detections, args.detector_ms, True)
+            print(f"{n_eggs:>8} {speed:>4} {args.frames / full:>18.1f} {args.frames / adaptive:>20.1f} "
+                  f"{calls:>4}/{args.frames:<4} {count_f:>5} / {count_a:<5}")
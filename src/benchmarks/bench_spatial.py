@@ -0,0 +1,66 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import conveyor_detections
+from tracker import CentroidTracker
+
+"""
+Geniş açılı 4K kamerada birden çok bant senaryosunda iz eşleştirmesini ölçer:
+tüm tespit-iz çiftleri için mesafe matrisi (index="dense") ile eşik boyunda
+hücrelerden oluşan ızgara (index="grid") karşılaştırılır. Görüşteki yumurta
+sayısı 1000'e kadar artırılır; kare başına süre, mesafesi hesaplanan çift
+sayısı (N x M ve eşik içindeki çiftler) ve iki yöntemin aynı ID'leri üretip üretmediği raporlanır.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_spatial --densities 50 100 200 500 1000
+"""
+
+WIDTH, HEIGHT = 3840, 2160
+
+
+def centers_of(frames, jitter, seed):
+    """
+    Kutulardan gürültülü tespit merkezleri üretir (ölçüm dışında).
+    """
+    rng = np.random.default_rng(seed)
+    result = []
+    for detections in frames:
+        boxes = np.array([d[:4] for d in detections], dtype=np.int64).reshape(-1, 4)
+        centers = (boxes[:, :2] + boxes[:, 2:]) // 2
+        result.append(centers + np.rint(rng.normal(0, jitter, centers.shape)).astype(np.int64))
+    return result
+
+
+def run(frames, index, max_distance):
+    tracker = CentroidTracker(max_distance, max_missed=2, index=index)
+    ids = []
+    start = time.perf_counter()
+    for centers in frames:
+        ids.append(tracker.update(centers)[0])
+    return (time.perf_counter() - start) / len(frames), ids, tracker
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Izgara ve tam matris iz eşleştirmesi karşılaştırması")
+    parser.add_argument("--densities", nargs="+", type=int, default=[50, 100, 200, 500, 1000],
+                        help="Görüşteki yumurta sayıları")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--speed", type=int, default=12, help="Bant hızı (piksel/kare)")
+    parser.add_argument("--jitter", type=float, default=2.0, help="Merkez gürültüsü (piksel, standart sapma)")
+    parser.add_argument("--max-distance", type=float, default=50)
+    args = parser.parse_args()
+
+    print(f"{'yumurta':>8} {'tam us/kare':>12} {'ızgara us/kare':>15} {'hızlanma':>9} {'N x M':>10} "
+          f"{'eşik içi':>12} {'ID':>6}")
+    for n_eggs in args.densities:
+        truth = conveyor_detections(n_eggs, args.frames, WIDTH, HEIGHT, args.speed)
+        frames = centers_of(truth, args.jitter, seed=n_eggs)
+        dense, dense_ids, _ = run(frames, "dense", args.max_distance)
+        grid, grid_ids, tracker = run(frames, "grid", args.max_distance)
+        same = all(np.array_equal(a, b) for a, b in zip(dense_ids, grid_ids))
+        # Son karede tam matris N x M mesafe hesaplar; eşik içindeki çiftler yalnızca yerel yoğunluğa bağlıdır
+        pairs = len(tracker.candidate_pairs(frames[-1])[0])
+        print(f"{n_eggs:>8} {dense * 1e6:>12.1f} {grid * 1e6:>15.1f} {dense / grid:>8.1f}x "
+              f"{len(frames[-1]) * len(tracker):>10} {pairs:>12} {'aynı' if same else 'FARKLI':>6}")
@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import conveyor_detections
+from tracker import CentroidTracker
+
+"""
+Eski iç içe Python döngüsü ile vektörel CentroidTracker'ı karşılaştırır.
+Görüş alanındaki yumurta sayısı arttıkça kare başına eşleştirme + sayım
+maliyetini ölçer.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_tracker
+"""
+
+
+def legacy_match(tracked_objects, object_id, detections):
+    """
+    EggCounter.process_frame içindeki eski eşleştirme döngüsünün çizimsiz kopyası.
+    """
+    updated_tracked_objects = {}
+    for x1, y1, x2, y2, confidence in detections:
+        center_x = (x1 + x2) // 2
+        center_y = (y1 + y2) // 2
+        matched_id = None
+        min_distance = float('inf')
+        for obj_id, obj_data in tracked_objects.items():
+            prev_center_x, prev_center_y = obj_data["center"]
+            distance = ((center_x - prev_center_x) ** 2 + (center_y - prev_center_y) ** 2) ** 0.5
+            if distance < 50 and distance < min_distance:
+                matched_id = obj_id
+                min_distance = distance
+        if matched_id is not None:
+            updated_tracked_objects[matched_id] = {"center": (center_x, center_y), "box": (x1, y1, x2, y2)}
+        else:
+            object_id += 1
+            updated_tracked_objects[object_id] = {"center": (center_x, center_y), "box": (x1, y1, x2, y2)}
+    return updated_tracked_objects, object_id
+
+
+def vectorized_match(tracker, detections):
+    """
+    CentroidTracker ile aynı işi yapar (kutu dizisi oluşturma dahil).
+    """
+    boxes = np.array([d[:4] for d in detections], dtype=np.int64).reshape(-1, 4)
+    centers = (boxes[:, :2] + boxes[:, 2:]) // 2
+    return tracker.update(centers)
+
+
+def run(n_eggs, n_frames=300):
+    frames = list(conveyor_detections(n_eggs, n_frames))
+
+    tracked, object_id = {}, 0
+    start = time.perf_counter()
+    for detections in frames:
+        tracked, object_id = legacy_match(tracked, object_id, detections)
+    legacy = (time.perf_counter() - start) / n_frames
+
+    tracker = CentroidTracker(max_distance=50)
+    start = time.perf_counter()
+    for detections in frames:
+        vectorized_match(tracker, detections)
+    vectorized = (time.perf_counter() - start) / n_frames
+
+    return legacy, vectorized
+
+
+if __name__ == "__main__":
+    print(f"{'yumurta':>8} {'eski (us/kare)':>16} {'vektörel (us/kare)':>20} {'hızlanma':>10}")
+    for n_eggs in (1, 10, 30, 60, 100, 200):
+        legacy, vectorized = run(n_eggs)
+        print(f"{n_eggs:>8} {legacy * 1e6:>16.1f} {vectorized * 1e6:>20.1f} {legacy / vectorized:>9.1f}x")
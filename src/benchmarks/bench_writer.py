@@ -0,0 +1,73 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import conveyor_detections
+from counting import EggCounter
+from sinks import AsyncVideoSink, VideoFileSink
+
+"""
+Sayım döngüsünü video yazıcı kapalı, senkron (VideoFileSink) ve arka plan
+(AsyncVideoSink) yazıcılarla çalıştırır. Model süresi sabit bir gecikme
+(--detector-ms) ile temsil edilir. Kare başına döngü gecikmesi (p50/p99),
+kare/s ve yazılan/atılan kare sayıları raporlanır; arka plan yazıcıda döngü
+gecikmesinin kodlama süresinden bağımsız kalması beklenir.
+
+Kullanım (src dizininden):
+    python -m benchmarks.bench_writer --detector-ms 10
+"""
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def run(frames, detector_ms, make_sink):
+    counter = EggCounter(WIDTH // 2)
+    sink = make_sink()
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    latencies = []
+    start = time.perf_counter()
+    for detections in frames:
+        t0 = time.perf_counter()
+        if detector_ms:
+            time.sleep(detector_ms / 1000)
+        frame[:] = 0  # Çözülmüş yeni kareyi taklit et
+        processed = counter.process_frame(frame, detections)
+        if sink:
+            sink.write(processed)
+        latencies.append(time.perf_counter() - t0)
+    loop = time.perf_counter() - start
+    if sink:
+        sink.close()
+    written = getattr(sink, "written", len(frames) if sink else 0)
+    dropped = getattr(sink, "dropped", 0)
+    p50, p99 = np.percentile(latencies, (50, 99)) * 1000
+    return len(frames) / loop, p50, p99, written, dropped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--eggs", type=int, default=60)
+    parser.add_argument("--detector-ms", type=float, default=10.0, help="Kare başına taklit edilen model süresi")
+    parser.add_argument("--codec", default="mp4v")
+    args = parser.parse_args()
+
+    frames = list(conveyor_detections(args.eggs, args.frames, WIDTH, HEIGHT))
+    size = (WIDTH, HEIGHT)
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "out.mp4")
+        modes = [
+            ("yazıcı yok", lambda: None),
+            ("senkron", lambda: VideoFileSink(out, 30, size, args.codec)),
+            ("arka plan", lambda: AsyncVideoSink(out, 30, size, args.codec)),
+            ("arka plan, atma", lambda: AsyncVideoSink(out, 30, size, args.codec, queue_size=4, drop=True)),
+            ("1/5 kare, yarı boyut", lambda: AsyncVideoSink(out, 30, size, args.codec,
+                                                           (WIDTH // 2, HEIGHT // 2), stride=5)),
+        ]
+        print(f"{'yazıcı':<22} {'kare/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'yazılan':>8} {'atılan':>7}")
+        for name, make_sink in modes:
+            fps, p50, p99, written, dropped = run(frames, args.detector_ms, make_sink)
+            print(f"{name:<22} {fps:>8.1f} {p50:>8.2f} {p99:>8.2f} {written:>8} {dropped:>7}")
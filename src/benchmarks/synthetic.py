@@ -0,0 +1,235 @@
+import time
+
+import cv2
+import numpy as np
+
+"""
+Sentetik konveyör bant verisi üretir.
+Benchmark betikleri gerçek video ve model olmadan çalışabilsin diye
+sabit hızla akan yumurtaların tespit kutularını, bu kutulardan çizilen
+kareleri ve maskeleri kare kare üretir. StubDetector gerçek kutulara
+titreme (jitter) ve kayıp tespit (dropout) ekleyerek modelin yerini tutar;
+BlobDetector ise yalnızca kareyi görür ve yumurtaları piksellerden bulur
+(kare dışında bilgi taşımayan akışlar için). expected_count() aynı
+kutulardan gerçek sayımı hesaplar.
+"""
+
+BELT_COLOR = (90, 90, 90)
+EGG_COLOR = (200, 225, 240)
+
+
+def conveyor_detections(n_eggs, n_frames, width=1280, height=720, speed=6,
+                        egg_size=40, direction="right_to_left", seed=0):
+    """
+    Görüş alanında sürekli n_eggs yumurta bulunan bir bant için tespitleri üretir.
+
+    Parametreler:
+    n_eggs (int): Görüş alanındaki yumurta sayısı
+    n_frames (int): Üretilecek kare sayısı
+    width, height (int): Kare boyutu
+    speed (int): Bant hızı (piksel/kare)
+    egg_size (int): Yumurta kutusunun kenar uzunluğu
+    direction (str): Bant yönü ("right_to_left" veya "left_to_right")
+    seed (int): Rastgele sayı üreteci tohumu
+
+    Return:
+    Her kare için [(x1, y1, x2, y2, confidence), ...] listesi üreten bir generator
+    """
+    rng = np.random.default_rng(seed)
+    lanes = max(1, min(n_eggs, (height - egg_size) // (egg_size + 10)))
+    per_lane = -(-n_eggs // lanes)
+    span = width + egg_size
+    pitch = span / per_lane
+
+    # Yumurtaları şeritlere eşit aralıklarla yerleştir, küçük bir kayma ekle
+    idx = np.arange(n_eggs)
+    lane_y = (idx % lanes) * (height - egg_size) // max(1, lanes - 1) if lanes > 1 else np.zeros(n_eggs)
+    offset = (idx // lanes) * pitch + rng.uniform(0, pitch / 4, n_eggs) + (idx % lanes) * pitch / lanes
+    step = -speed if direction == "right_to_left" else speed
+    conf = rng.uniform(0.6, 0.95, n_eggs)
+
+    for frame_idx in range(n_frames):
+        x = (offset + step * frame_idx) % span - egg_size
+        detections = []
+        for x1, y1, c in zip(x.astype(int).tolist(), np.asarray(lane_y, dtype=int).tolist(), conf.tolist()):
+            detections.append((x1, y1, x1 + egg_size, y1 + egg_size, c))
+        yield detections
+
+
+def render_frame(detections, width=1280, height=720, out=None):
+    """
+    Tespit kutularından bant karesi çizer (gri bant üzerinde elips yumurtalar).
+
+    Parametreler:
+    detections: [(x1, y1, x2, y2, confidence), ...]
+    width, height (int): Kare boyutu
+    out (np.ndarray): Verilirse kare bu tampona yerinde çizilir
+
+    Return:
+    (H, W, 3) uint8 kare
+    """
+    frame = np.empty((height, width, 3), dtype=np.uint8) if out is None else out
+    frame[:] = BELT_COLOR
+    for x1, y1, x2, y2, _ in detections:
+        center = (int((x1 + x2) // 2), int((y1 + y2) // 2))
+        axes = (max(1, int(x2 - x1) // 2), max(1, int(y2 - y1) * 2 // 5))
+        cv2.ellipse(frame, center, axes, 0, 0, 360, EGG_COLOR, -1)
+    return frame
+
+
+def ellipse_masks(detections, frame_size=(1280, 720), mask_size=(640, 384)):
+    """
+    Her kutu için model çözünürlüğünde elips biçimli bir maske üretir.
+
+    Parametreler:
+    detections: [(x1, y1, x2, y2, ...), ...]
+    frame_size (tuple): Kare boyutu (W, H)
+    mask_size (tuple): Maske boyutu (W, H)
+
+    Return:
+    (N, mh, mw) float32 maske dizisi
+    """
+    mask_w, mask_h = mask_size
+    masks = np.zeros((len(detections), mask_h, mask_w), dtype=np.float32)
+    sx, sy = mask_w / frame_size[0], mask_h / frame_size[1]
+    for mask, detection in zip(masks, detections):
+        x1, y1, x2, y2 = detection[:4]
+        center = (int((x1 + x2) / 2 * sx), int((y1 + y2) / 2 * sy))
+        axes = (max(1, int((x2 - x1) / 2 * sx)), max(1, int((y2 - y1) / 2 * sy)))
+        cv2.ellipse(mask, center, axes, 0, 0, 360, 1.0, -1)
+    return masks
+
+
+def expected_count(frames, line_position, direction="right_to_left"):
+    """
+    conveyor_detections() çıktısından gerçek sayımı hesaplar: her yumurtanın
+    merkezi kareden kareye çizgiyi sayım yönünde kaç kez geçtiyse o kadar.
+    Bir kenardan çıkıp diğer kenardan yeniden giren yumurta yeni bir yumurtadır.
+
+    Parametreler:
+    frames: Her kare için tespit listesi (yumurta sırası karelerde sabit)
+    line_position (int): Sayım çizgisinin x koordinatı
+    direction (str): Sayım yönü
+
+    Return:
+    Gerçek sayım
+    """
+    centers = np.array([[(d[0] + d[2]) // 2 for d in detections] for detections in frames])
+    if len(centers) < 2:
+        return 0
+    prev_x, cur_x = centers[:-1], centers[1:]
+    if direction == "right_to_left":
+        crossed = (prev_x > line_position) & (cur_x <= line_position)
+    else:
+        crossed = (prev_x < line_position) & (cur_x >= line_position)
+    return int(crossed.sum())
+
+
+def _as_tensor(array):
+    """
+    torch kuruluysa diziyi tensöre çevirir (gerçek YOLO çıktısına daha yakın), değilse aynen döndürür.
+    """
+    try:
+        import torch
+    except ImportError:
+        return array
+    return torch.from_numpy(array)
+
+
+class SyntheticBoxes:
+    def __init__(self, xyxy, conf):
+        """
+        ultralytics Boxes nesnesini taklit eder: xyxy ve conf alanları, kutu
+        kutu gezinme (her eleman tek satırlık bir SyntheticBoxes) ve len().
+        """
+        self.xyxy = xyxy
+        self.conf = conf
+
+    def __len__(self):
+        return len(self.conf)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield SyntheticBoxes(self.xyxy[i:i + 1], self.conf[i:i + 1])
+
+
+class SyntheticMasks:
+    def __init__(self, data):
+        """
+        ultralytics Masks nesnesini taklit eder: data alanı (N, mh, mw) maskeler.
+        """
+        self.data = data
+
+
+class SyntheticResult:
+    def __init__(self, detections, masks=None, orig_shape=(720, 1280)):
+        """
+        Tespit listesinden ultralytics Results benzeri bir nesne oluşturur.
+
+        Parametreler:
+        detections: [(x1, y1, x2, y2, confidence), ...]
+        masks (np.ndarray): İsteğe bağlı (N, mh, mw) maskeler
+        orig_shape (tuple): Kare boyutu (H, W)
+        """
+        self.orig_shape = orig_shape
+        array = np.asarray(detections, dtype=np.float32).reshape(-1, 5)
+        self.boxes = SyntheticBoxes(_as_tensor(np.ascontiguousarray(array[:, :4])),
+                                    _as_tensor(np.ascontiguousarray(array[:, 4])))
+        self.masks = None if masks is None else SyntheticMasks(_as_tensor(masks))
+
+
+class StubDetector:
+    def __init__(self, jitter=0.0, dropout=0.0, masks=False, frame_size=(1280, 720), mask_size=(640, 384), seed=0):
+        """
+        Gerçek kutuları model çıktısı gibi döndüren sahte dedektör.
+
+        Parametreler:
+        jitter (float): Kutu köşelerine eklenen Gauss gürültüsünün standart sapması (piksel)
+        dropout (float): Her tespitin bir karede kaybolma olasılığı
+        masks (bool): Segmentasyon maskeleri de üretilsin mi
+        frame_size, mask_size (tuple): Kare ve maske boyutu (W, H)
+        seed (int): Rastgele sayı üreteci tohumu
+        """
+        self.jitter = jitter
+        self.dropout = dropout
+        self.masks = masks
+        self.frame_size = frame_size
+        self.mask_size = mask_size
+        self._rng = np.random.default_rng(seed)
+
+    def __call__(self, detections):
+        """
+        Bir karenin gerçek kutularından, YOLO çağrısı gibi [SyntheticResult] döndürür.
+        """
+        array = np.asarray(detections, dtype=np.float32).reshape(-1, 5)
+        if self.dropout:
+            array = array[self._rng.random(len(array)) >= self.dropout]
+        if self.jitter:
+            array[:, :4] += self._rng.normal(0, self.jitter, (len(array), 4)).astype(np.float32)
+        masks = ellipse_masks(array, self.frame_size, self.mask_size) if self.masks else None
+        return [SyntheticResult(array, masks, (self.frame_size[1], self.frame_size[0]))]
+
+
+class BlobDetector:
+    def __init__(self, delay=0.0, conf=0.9):
+        """
+        render_frame() ile çizilmiş karelerdeki yumurtaları bağlantılı bileşenlerle
+        bulan sahte model; YOLO gibi model(frame) -> [SyntheticResult] çağrılır.
+        Durum tutmaz, farklı iş parçacıklarından çağrılabilir.
+
+        Parametreler:
+        delay (float): Her çağrıda çıkarım süresini taklit eden bekleme (saniye)
+        conf (float): Tespitlere verilen güven değeri
+        """
+        self.delay = delay
+        self.conf = conf
+
+    def __call__(self, frame, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        # Yumurta rengi bant renginden açıktır; mavi kanal eşiği yeterlidir
+        binary = (frame[:, :, 0] > (BELT_COLOR[0] + EGG_COLOR[0]) // 2).astype(np.uint8)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary)
+        x, y, w, h = stats[1:, 0], stats[1:, 1], stats[1:, 2], stats[1:, 3]
+        detections = np.stack([x, y, x + w, y + h, np.full(count - 1, self.conf)], axis=1)
+        return [SyntheticResult(detections, orig_shape=frame.shape[:2])]
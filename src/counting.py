@@ -1,39 +1,69 @@
+import argparse
+import os
+
 import cv2
-from ultralytics import YOLO
+
+from batch_inference import count_batched
+from detection_cache import DetectionCache, DetectionRecorder, cache_path, file_fingerprint
+from frame_pool import FramePool
+from frame_skip import AdaptiveSkipper
+from detections import extract_boxes, to_detection_array
+from engine import BoxRenderer, Checkpointer, CountingEngine, EventLog, load_checkpoint
+from pipeline import PipelineRunner
+from profiling import FrameProfiler
+from roi import RoiCropper
+from sinks import AsyncVideoSink, DisplaySink, close_sinks, write_to_sinks
+from startup import EXPORT_FORMATS, ModelLoader, StartupMetrics
 
 """
 EggCounter sınıfı, konveyör bant üzerindeki yumurtaları sayar.
 Belirli bir çizgiyi geçen yumurtaları tespit eder ve takip eder.
-Her yumurtayı yalnızca bir kez sayar.
+Her yumurtayı yalnızca bir kez sayar. Takip ve sayım engine.CountingEngine
+içindedir; bu sınıf kutu çizimini ve betiğin alışılmış API'sini ekler.
 """
-class EggCounter:
-    def __init__(self, line_position, direction="right_to_left"):
+class EggCounter(CountingEngine):
+    def __init__(self, line_position, direction="right_to_left", max_distance=50, match_method="greedy",
+                 max_missed=0):
         """
         EggCounter sınıfının başlatıcı metodu.
 
         Parametreler:
         line_position (int): Sayım çizgisinin x koordinatı
         direction (str): Sayım yönü ("right_to_left" veya "left_to_right")
+        max_distance (float): Nesne eşleştirme mesafe eşiği (piksel)
+        match_method (str): İz atama yöntemi ("greedy" veya "hungarian")
+        max_missed (int): Bir izin silinmeden önce tespit edilmeden kalabileceği kare sayısı
         """
-        self.line_position = line_position
-        self.direction = direction
-        self.count = 0  # Toplam sayım
-        self.tracked_objects = {}  # Takip edilen nesnelerin bilgileri
-        self.object_id = 0  # Benzersiz nesne ID'leri için sayaç
-        self.counted_objects = set()  # Sayılmış nesnelerin ID'lerini tutan küme
-
-    def get_total_count(self):
+        super().__init__(line_position, direction, max_distance, match_method, max_missed)
+        self.renderer = BoxRenderer()
+
+    def update(self, detections):
         """
-        Toplam sayım değerini döndürür.
+        Yalnızca takip durumunu ve sayımı günceller, kareye çizim yapmaz (headless mod).
+
+        Parametreler:
+        detections: YOLO modelinden gelen tespit sonuçları [(x1, y1, x2, y2, confidence), ...]
+                    veya aynı sütunlara sahip (N, 5) NumPy dizisi
+
+        Return:
+        boxes (np.ndarray): (N, 4) tespit kutuları
+        ids (np.ndarray): (N,) her tespitin iz ID'si
         """
-        return self.count
+        self.feed(detections)
+        return self.boxes, self.ids
 
-    def save_count_to_file(self, filename="count_result.txt"):
+    def draw(self, frame, boxes, ids):
         """
-        Sayım sonucunu dosyaya kaydeder.
+        Kutuları, ID'leri, sayım çizgisini ve toplam sayımı kareye çizer.
+
+        Parametreler:
+        frame: Üzerine çizim yapılacak video karesi
+        boxes, ids: update() veya predict() metodunun dönüş değerleri
+
+        Return:
+        İşlenmiş video karesi
         """
-        with open(filename, 'w') as f:
-            f.write(f"Toplam sayılan yumurta: {self.count}")
+        return self.renderer.draw(frame, boxes, ids, self.line_position, self.count)
 
     def process_frame(self, frame, detections):
         """
@@ -46,74 +76,24 @@ class EggCounter:
         Return:
         İşlenmiş video karesi
         """
-        updated_tracked_objects = {}
-
-        for detection in detections:
-            # Tespit kutusunun koordinatlarını ve merkez noktasını hesapla
-            x1, y1, x2, y2, confidence = detection
-            center_x = (x1 + x2) // 2
-            center_y = (y1 + y2) // 2
-
-            # En yakın eşleşen nesneyi bul
-            matched_id = None
-            min_distance = float('inf')
-
-            for obj_id, obj_data in self.tracked_objects.items():
-                prev_center_x, prev_center_y = obj_data["center"]
-                # Öklid mesafesi hesapla
-                distance = ((center_x - prev_center_x) ** 2 + (center_y - prev_center_y) ** 2) ** 0.5
-                if distance < 50 and distance < min_distance:  # 50 piksel mesafe eşiği
-                    matched_id = obj_id
-                    min_distance = distance
-
-            if matched_id is not None:
-                # Eşleşen nesnenin önceki pozisyonunu al
-                prev_center_x = self.tracked_objects[matched_id]["center"][0]
-
-                # Çizgi geçiş kontrolü yap
-                if self.direction == "right_to_left":
-                    if prev_center_x > self.line_position and center_x <= self.line_position:
-                        if matched_id not in self.counted_objects:
-                            self.count += 1
-                            self.counted_objects.add(matched_id)
-                else:  # left_to_right durumu
-                    if prev_center_x < self.line_position and center_x >= self.line_position:
-                        if matched_id not in self.counted_objects:
-                            self.count += 1
-                            self.counted_objects.add(matched_id)
-
-                # Nesne bilgilerini güncelle
-                updated_tracked_objects[matched_id] = {
-                    "center": (center_x, center_y),
-                    "box": (x1, y1, x2, y2)
-                }
-            else:
-                # Yeni nesne oluştur
-                self.object_id += 1
-                updated_tracked_objects[self.object_id] = {
-                    "center": (center_x, center_y),
-                    "box": (x1, y1, x2, y2)
-                }
+        boxes, ids = self.update(detections)
+        return self.draw(frame, boxes, ids)
 
-            # Görselleştirme işlemleri
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 0, 0), 2)
-            object_id = matched_id if matched_id is not None else self.object_id
-            cv2.putText(frame, f"ID: {object_id}", (x1, y1 - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
 
-        # Takip edilen nesneleri güncelle
-        self.tracked_objects = updated_tracked_objects
-
-        # Sayım çizgisini çiz
-        cv2.line(frame, (self.line_position, 0),
-                 (self.line_position, frame.shape[0]), (0, 0, 255), 3)
-
-        # Toplam sayımı göster
-        cv2.putText(frame, f"Count: {self.count}", (50, 50),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
+def results_to_detections(results, conf_threshold=0.5):
+    """
+    YOLO sonuçlarını EggCounter'ın beklediği tespit dizisine dönüştürür.
+    Kutular ve güvenler tek seferde alınır, eşik vektörel olarak uygulanır.
 
-        return frame
+    Parametreler:
+    results: YOLO modelinden gelen sonuçlar
+    conf_threshold (float): Güven eşiği
 
+    Return:
+    (N, 5) dizi: [[x1, y1, x2, y2, confidence], ...]
+    """
+    boxes, conf, _ = extract_boxes(results[0], conf_threshold)
+    return to_detection_array(boxes, conf)
 
 
 if __name__ == "__main__":
@@ -122,99 +102,329 @@ if __name__ == "__main__":
     Video girişini açar, YOLO modelini yükler ve yumurta sayımını gerçekleştirir.
     İşlenmiş videoyu hem gösterir hem de kaydeder.
     """
+    parser = argparse.ArgumentParser(description="Konveyör bant yumurta sayacı")
+    parser.add_argument("--input", default=r"C:\Users\Monster\Desktop\egg_dataset\Conveyor1_egg.mp4",
+                        help="Giriş videosu")
+    parser.add_argument("--model", default=r"C:\Users\Monster\Desktop\egg_dataset\best.pt",
+                        help="YOLO model ağırlıkları")
+    parser.add_argument("--output", default="output_video.mp4", help="Çıktı videosu")
+    parser.add_argument("--codec", default="mp4v", help="Çıktı videosu FourCC kodu")
+    parser.add_argument("--output-scale", type=float, default=1.0, help="Çıktı videosu ölçeği (ör. 0.5: yarı çözünürlük)")
+    parser.add_argument("--output-stride", type=int, default=1, help="Çıktıya her N karede bir kare yaz")
+    parser.add_argument("--writer-queue", type=int, default=32, help="Kodlanmayı bekleyebilecek en fazla kare")
+    parser.add_argument("--drop-frames", action="store_true",
+                        help="Kodlayıcı yetişemezse beklemek yerine çıktı karelerini at")
+    parser.add_argument("--line-position", type=int, default=300, help="Sayım çizgisinin x koordinatı")
+    parser.add_argument("--direction", default="right_to_left", choices=("right_to_left", "left_to_right"))
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Okuma, çıkarım, sayım ve yazma aşamalarını ayrı iş parçacıklarında çalıştır")
+    parser.add_argument("--queue-size", type=int, default=8, help="Aşamalar arası kuyruk kapasitesi")
+    parser.add_argument("--headless", action="store_true",
+                        help="Sadece sayım yap: çizim, pencere ve video kaydı yok")
+    parser.add_argument("--profile", action="store_true", help="Sonunda aşama bazlı gecikme tablosunu yazdır")
+    parser.add_argument("--profile-report", default=None,
+                        help="Aşama ölçümlerini bu dosyaya yaz (.json: özet, .csv: kare bazlı)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Prometheus metinlerini bu porttan /metrics adresinde sun")
+    parser.add_argument("--roi", action="store_true",
+                        help="Modele yalnızca sayım çizgisi etrafındaki bandı ver")
+    parser.add_argument("--belt-speed", type=int, default=10, help="ROI için bant hızı (piksel/kare)")
+    parser.add_argument("--egg-size", type=int, default=60, help="ROI için en büyük yumurta genişliği (piksel)")
+    parser.add_argument("--adaptive-skip", action="store_true",
+                        help="Dedektörü her k. karede çalıştır, aradaki karelerde izleri sabit hızla ilerlet")
+    parser.add_argument("--max-skip", type=int, default=8, help="Uyarlamalı modda iki tespit arasındaki en fazla kare")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Çevrimdışı mod: bu kadar kareyi modele tek çağrıda ver")
+    parser.add_argument("--conf", type=float, default=0.5, help="Güven eşiği")
+    parser.add_argument("--max-distance", type=float, default=50, help="Nesne eşleştirme mesafe eşiği (piksel)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Tespit önbelleği dizini: ilk geçişte yazılır, sonraki çalışmalarda model yerine kullanılır")
+    parser.add_argument("--export", default=None, choices=EXPORT_FORMATS,
+                        help="Ağırlıkları bir kez bu CPU biçimine dışa aktar ve onu yükle")
+    parser.add_argument("--warmup", type=int, default=1, help="Başlangıçta boş kare ile yapılacak ısınma çıkarımı sayısı")
+    parser.add_argument("--events", default=None,
+                        help="Çizgi geçiş olaylarını bu dosyaya sürekli ekle (sona eklenen ikili kayıt)")
+    parser.add_argument("--checkpoint", default=None, help="Sayaç durumunu periyodik olarak bu dosyaya yaz")
+    parser.add_argument("--checkpoint-every", type=int, default=300, help="İki checkpoint arasındaki kare sayısı")
+    parser.add_argument("--resume", action="store_true", help="Checkpoint varsa kaldığı kareden devam et")
+    args = parser.parse_args()
+    startup = StartupMetrics()
+
+    # Tespit önbelleği: video ve model ağırlıkları değişmedikçe tespitler yeniden kullanılır
+    input_video_path = args.input
+    cache_file = cache_path(args.cache_dir, input_video_path, args.model) if args.cache_dir else None
+    cache = DetectionCache.load(cache_file) if cache_file and os.path.exists(cache_file) else None
+    if cache is not None and not cache.supports(args.conf):
+        # Önbellek daha yüksek bir eşikle kaydedilmiş (ör. image_rename.py --conf); tespitler eksik kalır
+        print(f"Uyarı: önbellek {cache.min_conf} güven eşiğiyle kaydedilmiş, --conf {args.conf} için "
+              f"kullanılmıyor; model çalıştırılıp önbellek yeniden yazılacak.")
+        cache = None
+    # Önbellek yalnızca her karenin tam kare tespitleriyle yazılır (ROI ve kare atlama tespitleri eksik bırakır)
+    recorder = DetectionRecorder() if cache_file and cache is None and not (args.roi or args.adaptive_skip) else None
+    if recorder is not None and (args.pipeline or args.batch_size > 1):
+        # Aşamalı ve toplu işlem yolları tespitleri kaydetmez
+        print("Uyarı: --pipeline ve --batch-size modlarında tespit önbelleği yazılmaz; "
+              "önbelleği oluşturmak için bu seçenekler olmadan çalıştırın.")
+        recorder = None
+
+    # Model arka planda yüklenir ve ısıtılır; bu sırada video girişi açılır
+    loader = ModelLoader(args.model, args.export, warmup_runs=args.warmup) if cache is None else None
+
     # Video girişini aç
-    input_video_path = r"C:\Users\Monster\Desktop\egg_dataset\Conveyor1_egg.mp4"
     cap = cv2.VideoCapture(input_video_path)
+    startup.mark("capture_opened")
 
-    # Video özelliklerini al ve çıktı video yazıcısını ayarla
+    # Video özelliklerini al
     frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     fps = int(cap.get(cv2.CAP_PROP_FPS))
 
-    output_video_path = 'output_video.mp4'
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_video_path, fourcc, fps, (frame_width, frame_height))
+    # Görselleştirme isteğe bağlıdır; headless modda çizim, pencere ve video kaydı yapılmaz
+    if args.headless:
+        sinks = []
+    else:
+        # Video kodlama arka planda yapılır; sayım döngüsü kodlayıcıyı beklemez
+        output_size = (int(frame_width * args.output_scale), int(frame_height * args.output_scale))
+        video_sink = AsyncVideoSink(args.output, fps, (frame_width, frame_height), args.codec, output_size,
+                                    args.output_stride, args.writer_queue, args.drop_frames)
+        sinks = [video_sink, DisplaySink("Egg Counter")]
 
     # Sayaç ve model ayarları
-    line_position = 300
-    direction = "right_to_left"
-    egg_counter = EggCounter(line_position, direction)
-    model = YOLO(r"C:\Users\Monster\Desktop\egg_dataset\best.pt")
-
-    # Ana işlem döngüsü
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            # Video bittiğinde son sayımı göster ve kaydet
-            final_count = egg_counter.get_total_count()
-            print(f"\nSon sayım: {final_count} yumurta")
-            egg_counter.save_count_to_file()
-            break
-
-        # YOLO tespitlerini al
-        results = model(frame)
-        detections = []
-        for box in results[0].boxes:
-            x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-            confidence = box.conf[0].item()
-            if confidence > 0.5:  # Güven eşiği kontrolü
-                detections.append((x1, y1, x2, y2, confidence))
-
-        # Kareyi işle ve sonuçları göster/kaydet
+    line_position = args.line_position
+    direction = args.direction
+    egg_counter = EggCounter(line_position, direction, args.max_distance)
+
+    # Geçiş olayları sürekli kayda yazılır; durum periyodik olarak checkpoint'e alınır
+    if args.events:
+        egg_counter.event_log = EventLog(args.events)
+    start_frame = 0
+    if args.checkpoint:
+        if args.resume and os.path.exists(args.checkpoint):
+            start_frame = load_checkpoint(egg_counter, args.checkpoint)
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+            # Önbellek yalnızca baştan sona işlenen videolar için yazılır
+            recorder = None
+            print(f"Checkpoint'ten devam: kare {start_frame}, sayım {egg_counter.count}")
+        egg_counter.checkpointer = Checkpointer(args.checkpoint, args.checkpoint_every)
+
+    # ROI modunda modele yalnızca çizgi çevresindeki bant verilir, kutular kare koordinatlarına taşınır
+    cropper = RoiCropper(egg_counter.roi_band(frame_width, args.belt_speed, args.egg_size)) if args.roi else None
+
+    model = None
+    if loader:
+        # Isınma, modelin gerçekte göreceği boyutla yapılır
+        loader.set_frame_shape((frame_height, cropper.x1 - cropper.x0 if cropper else frame_width, 3))
+        model = loader.get()
+        startup.mark("model_ready")
+
+    def model_input(frame):
+        return cropper.crop(frame) if cropper else frame
+
+    def to_detections(results, conf_threshold=args.conf):
+        detections = results_to_detections(results, conf_threshold)
+        return cropper.to_frame(detections) if cropper else detections
+
+    def handle_detections(frame, detections):
+        """
+        Tespitleri sayaca verir; sink varsa kareyi çizip sink'lere yazar.
+        Döngü durdurulmalıysa False döndürür.
+        """
+        if not sinks:
+            egg_counter.update(detections)
+            startup.observe(egg_counter.count)
+            return True
         processed_frame = egg_counter.process_frame(frame, detections)
-        cv2.imshow("Egg Counter", processed_frame)
-        out.write(processed_frame)
-
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
+        startup.observe(egg_counter.count)
+        return write_to_sinks(sinks, processed_frame)
+
+    if cache is not None and not sinks:
+        # Önbellekten yeniden sayım: video çözülmez, model çalıştırılmaz
+        for detections in cache.replay(args.conf, start_frame):
+            egg_counter.update(detections)
+            startup.observe(egg_counter.count)
+        print(f"Önbellekten sayıldı: {cache_file} ({len(cache)} kare)")
+
+        final_count = egg_counter.get_total_count()
+        print(f"\nSon sayım: {final_count} yumurta")
+        egg_counter.save_count_to_file()
+    elif args.pipeline and cache is None:
+        # Aşamalı (pipelined) işlem: her aşama kendi iş parçacığında
+        # Kareler halkadaki tamponlara okunur; halka, kuyruklardaki ve aşamalardaki tüm kareleri kapsar
+        pool = FramePool((frame_height, frame_width, 3), size=3 * args.queue_size + 4)
+
+        def read_frame():
+            ret, frame = pool.read(cap)
+            return frame if ret else None
+
+        def track(frame, detections):
+            tracked = egg_counter.process_frame(frame, detections) if sinks else egg_counter.update(detections)
+            startup.observe(egg_counter.count)
+            return tracked
+
+        if sinks:
+            write = lambda processed_frame: write_to_sinks(sinks, pool.check(processed_frame))
+        else:
+            write = lambda tracked: True
+
+        runner = PipelineRunner(read_frame, lambda frame: to_detections(model(model_input(frame))),
+                                track, write, args.queue_size)
+        runner.run()
+        print(runner.report())
+        print(pool.report(video_sink.copies if sinks else 0))
+
+        final_count = egg_counter.get_total_count()
+        print(f"\nSon sayım: {final_count} yumurta")
+        egg_counter.save_count_to_file()
+    elif args.batch_size > 1 and cache is None:
+        # Çevrimdışı toplu çıkarım: kareler gruplar halinde modele verilir, sonuçlar sırayla sayılır
+        count_batched(cap, model, lambda frame, result: handle_detections(frame, to_detections([result])),
+                      args.batch_size, model_input)
+
+        final_count = egg_counter.get_total_count()
+        print(f"\nSon sayım: {final_count} yumurta")
+        egg_counter.save_count_to_file()
+    else:
+        # Ana işlem döngüsü (her aşamanın süresi ölçülür)
+        profiler = FrameProfiler()
+        metrics_server = profiler.serve(args.metrics_port) if args.metrics_port else None
+        skipper = AdaptiveSkipper(egg_counter, frame_width, args.max_skip) if args.adaptive_skip else None
+        # Kareler iki tamponluk halkaya okunur, yerinde çizilir ve aynı tampondan yazılır
+        pool = FramePool((frame_height, frame_width, 3))
+        last_frame = None
+
+        def detect(frame):
+            if cache is not None:
+                return cache.detections(start_frame + pool.reads - 1, args.conf)
+            return to_detections(model(model_input(frame)))
+
+        while True:
+            profiler.start_frame()
+            with profiler.stage("decode"):
+                ret, frame = pool.read(cap)
+            if not ret:
+                if skipper:
+                    # Son kare atlandıysa, son tespitten sonraki geçişleri de say
+                    skipper.finish(last_frame, detect)
+                if recorder is not None:
+                    recorder.save(cache_file, file_fingerprint(input_video_path), file_fingerprint(args.model),
+                                  fps, (frame_width, frame_height))
+                    print(f"Tespit önbelleği yazıldı: {cache_file}")
+                # Video bittiğinde son sayımı göster ve kaydet
+                final_count = egg_counter.get_total_count()
+                print(f"\nSon sayım: {final_count} yumurta")
+                egg_counter.save_count_to_file()
+                break
+
+            last_frame = frame
+
+            if skipper and not skipper.should_detect(frame):
+                # Atlanan kare: izler sabit hız varsayımıyla ilerletilir
+                with profiler.stage("track"):
+                    boxes, ids = egg_counter.predict()
+            elif cache is not None:
+                # Tespitler önbellekten okunur
+                with profiler.stage("extract"):
+                    detections = detect(frame)
+                with profiler.stage("track"):
+                    boxes, ids = egg_counter.update(detections)
+            else:
+                # YOLO tespitlerini al
+                with profiler.stage("inference"):
+                    results = model(model_input(frame))
+                profiler.split_model_time(results)
+                with profiler.stage("extract"):
+                    if recorder is not None:
+                        # Önbelleğe eşik uygulanmamış tüm tespitler yazılır
+                        detections = to_detections(results, 0.0)
+                        recorder.add(detections)
+                        detections = detections[detections[:, 4] > args.conf]
+                    else:
+                        detections = to_detections(results)
+
+                # Kareyi işle ve sonuçları göster/kaydet
+                with profiler.stage("track"):
+                    boxes, ids = egg_counter.update(detections)
+            keep_going = True
+            if sinks:
+                with profiler.stage("draw"):
+                    processed_frame = egg_counter.draw(frame, boxes, ids)
+                with profiler.stage("encode"):
+                    keep_going = write_to_sinks(sinks, pool.check(processed_frame))
+            profiler.end_frame()
+            if startup.observe(egg_counter.count):
+                # Başlangıç süreleri (ilk sonuç, ilk sayım) metriklere eklenir
+                for name, seconds in startup.marks.items():
+                    profiler.set_gauge(f"startup_{name}_seconds", seconds)
+
+            if not keep_going:
+                break
+
+        if args.profile:
+            print(profiler.report())
+            print(pool.report(video_sink.copies if sinks else 0))
+        if args.profile_report:
+            if args.profile_report.endswith(".csv"):
+                profiler.save_csv(args.profile_report)
+            else:
+                profiler.save_json(args.profile_report)
+        if metrics_server:
+            metrics_server.shutdown()
 
     # Kaynakları serbest bırak
     cap.release()
-    out.release()
-    cv2.destroyAllWindows()
-
-print(f"\nToplam sayılan yumurta: {egg_counter.get_total_count()}")
+    close_sinks(sinks)
+    if egg_counter.checkpointer is not None:
+        egg_counter.checkpointer.save(egg_counter)
+    if egg_counter.event_log is not None:
+        egg_counter.event_log.close()
+        print(f"Olay kaydı: {args.events} ({len(egg_counter.event_log)} olay, "
+              f"{egg_counter.event_log.syncs} fsync)")
+    if sinks:
+        print(f"Çıktı videosu: {video_sink.written} kare yazıldı, {video_sink.dropped} kare atıldı")
+
+    print(startup.report())
+    print(f"\nToplam sayılan yumurta: {egg_counter.get_total_count()}")
 
 """
 Notes:
 ------------------
 1- ID Takip Sistemi:
 
-self.tracked_objects = {}  # Aktif takip edilen nesneler
-self.counted_objects = set()  # Sayılmış nesnelerin ID'leri
+self.tracker = CentroidTracker(max_distance, max_missed=0)  # Aktif izler
 
 Her tespit edilen yumurta bir ID alır
-Bu ID'ler tracked_objects sözlüğünde takip edilir
-Sayılan ID'ler counted_objects setinde saklanır
+Bu ID'ler tracker içindeki sabit boyutlu NumPy dizisinde takip edilir
+Sayıldı bilgisi izin kendi "counted" alanında saklanır
+max_missed kare boyunca görülmeyen izler silinir, böylece bellek sabit kalır
 
 
 2- Nesne Eşleştirme:
 
-distance = ((center_x - prev_center_x) ** 2 + (center_y - prev_center_y) ** 2) ** 0.5
-if distance < 50 and distance < min_distance:
-    matched_id = obj_id
-    min_distance = distance
-    
-Her yeni tespit, önceki kareden en yakın nesne ile eşleştirilir
+diff = centers[:, None, :] - self.centers[None, :, :]
+dist_sq = np.einsum("nmk,nmk->nm", diff, diff)
+det_idx, trk_idx = np.nonzero(dist_sq < gate_sq)
+
+Tüm tespit-iz mesafeleri tek bir vektörel işlemle hesaplanır
 50 piksel mesafe eşiği kullanılır
-En yakın nesne ile eşleştirme yapılır
+Eşik altındaki çiftler en yakından başlayarak bire bir atanır,
+böylece iki tespit aynı ID'yi alamaz
 
 
 3- Çizgi Geçiş Kontrolü:
 
 if self.direction == "right_to_left":
-    if prev_center_x > self.line_position and center_x <= self.line_position:
-        if matched_id not in self.counted_objects:
-            self.count += 1
-            self.counted_objects.add(matched_id)
+    crossed = matched & (prev_x > self.line_position) & (cur_x <= self.line_position)
+counted = self.tracker.tracks["counted"][:len(matched)]
+crossed &= ~counted
+counted |= crossed
 
 4- Önemli fark şurada:
 
 Nesne çizgiyi geçerken ÜÇ ŞART kontrol edilir:
 
-Önceki pozisyon çizginin bir tarafında mı? (prev_center_x > self.line_position)
-Şimdiki pozisyon çizginin diğer tarafında mı? (center_x <= self.line_position)
-Bu ID daha önce sayılmamış mı? (matched_id not in self.counted_objects)
+Önceki pozisyon çizginin bir tarafında mı? (prev_x > self.line_position)
+Şimdiki pozisyon çizginin diğer tarafında mı? (cur_x <= self.line_position)
+Bu iz daha önce sayılmamış mı? (~counted)
 
 
 
@@ -227,7 +437,7 @@ Nesne eşleştirmesini mesafe bazlı yapmamak
 Bu uygulamada bu sorunlar şöyle çözülüyor:
 
 Her zaman önceki ve şimdiki pozisyon BERABER kontrol ediliyor
-counted_objects seti ile her ID sadece bir kez sayılıyor
+izin "counted" alanı ile her ID sadece bir kez sayılıyor
 Mesafe bazlı eşleştirme ile ID'ler kararlı bir şekilde takip ediliyor
 
 Yani kısaca: "Bu nesneyi daha önce saydım mı?", "Gerçekten çizgiyi geçti mi?" ve "Bu gerçekten aynı nesne mi?" sorularının hepsi kontrol ediliyor.
@@ -0,0 +1,276 @@
+import argparse
+import hashlib
+import os
+import time
+
+import numpy as np
+
+from masks import RleMasks, rle_encode
+
+"""
+Video ve model ağırlıklarına göre anahtarlanan kalıcı tespit önbelleği.
+line_position, direction, güven eşiği veya eşleştirme eşiği ayarlanırken
+tespitler değişmez; ilk geçişte modelin tüm tespitleri (eşik uygulanmadan)
+sütun bazlı sıkıştırılmış bir .npz dosyasına yazılır, sonraki çalışmalar
+modeli hiç yüklemeden bu dosyadan saniyede binlerce kare hızında tekrar
+oynatır (replay).
+
+Dosya düzeni (sütunlar):
+- offsets (F+1,): kare i'nin tespitleri [offsets[i], offsets[i+1]) aralığındadır
+- xyxy (M, 4) float32, conf (M,) float32: tüm karelerin tespitleri art arda
+- mask_offsets (M+1,), mask_runs, mask_shape: isteğe bağlı RLE maskeler
+- sources (F,): isteğe bağlı kare kaynakları (ör. görüntü dizinindeki dosya adları)
+- video_hash, model_hash, fps, frame_size: doğrulama ve bilgi alanları
+- min_conf: isteğe bağlı kayıt eşiği. Kayıt bir güven eşiğiyle yazıldıysa
+  (ör. image_rename.py --conf), bu eşiğin altındaki tespitler dosyada yoktur;
+  DetectionCache daha düşük eşikle yapılan sorguları reddeder (ValueError).
+"""
+
+CACHE_VERSION = 1
+
+
+def file_fingerprint(path, samples=16, chunk=1 << 20):
+    """
+    Büyük dosyalar için hızlı içerik özeti: dosya boyutu + eşit aralıklı
+    örnek bloklar (küçük dosyalarda tüm içerik) SHA-1 ile özetlenir.
+
+    Return:
+    Onaltılık özet dizgesi
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha1(str(size).encode())
+    with open(path, "rb") as f:
+        if size <= samples * chunk:
+            digest.update(f.read())
+        else:
+            for i in range(samples):
+                f.seek((size - chunk) * i // (samples - 1))
+                digest.update(f.read(chunk))
+    return digest.hexdigest()
+
+
+def cache_path(cache_dir, video_path, model_path):
+    """
+    Video ve model özetlerinden önbellek dosyasının yolunu üretir.
+    """
+    stem = os.path.splitext(os.path.basename(str(video_path)))[0]
+    key = f"{file_fingerprint(video_path)[:12]}-{file_fingerprint(model_path)[:12]}"
+    return os.path.join(cache_dir, f"{stem}-{key}.npz")
+
+
+class DetectionRecorder:
+    def __init__(self, min_conf=0.0):
+        """
+        Kare kare tespitleri toplar ve sütun bazlı önbellek dosyasına yazar.
+
+        Parametreler:
+        min_conf (float): Eklenen tespitlere önceden uygulanmış güven eşiği (>=); 0: eşik yok
+        """
+        self.min_conf = min_conf
+        self._xyxy = []
+        self._conf = []
+        self._counts = []
+        self._mask_runs = []
+        self._mask_lengths = []
+        self._sources = []
+        self.mask_shape = None
+
+    def __len__(self):
+        return len(self._counts)
+
+    def add(self, detections, masks=None, source=None):
+        """
+        Bir karenin tespitlerini ekler.
+
+        Parametreler:
+        detections: (N, 5) [x1, y1, x2, y2, confidence] dizisi (eşik uygulanmamış)
+        masks: İsteğe bağlı (N, mh, mw) maskeler veya MaskSet (> 0.5 ikilileştirilir)
+        source (str): İsteğe bağlı kare kaynağı (ör. görüntü dosyasının adı)
+        """
+        detections = np.asarray(detections, dtype=np.float32).reshape(-1, 5)
+        if source is not None:
+            self._sources.append(source)
+        self._xyxy.append(detections[:, :4])
+        self._conf.append(detections[:, 4])
+        self._counts.append(len(detections))
+        if masks is not None:
+            self.mask_shape = masks.shape[1:]
+            for mask in masks:
+                runs = rle_encode(mask > 0.5)
+                self._mask_runs.append(runs)
+                self._mask_lengths.append(len(runs))
+
+    def save(self, path, video_hash="", model_hash="", fps=0.0, frame_size=(0, 0)):
+        """
+        Toplanan tespitleri sıkıştırılmış .npz dosyasına yazar.
+        """
+        columns = {
+            "version": np.array(CACHE_VERSION),
+            "video_hash": np.array(video_hash),
+            "model_hash": np.array(model_hash),
+            "fps": np.array(fps, dtype=np.float64),
+            "frame_size": np.array(frame_size, dtype=np.int64),
+            "offsets": np.concatenate(([0], np.cumsum(self._counts))).astype(np.int64),
+            "xyxy": np.concatenate(self._xyxy) if self._xyxy else np.zeros((0, 4), dtype=np.float32),
+            "conf": np.concatenate(self._conf) if self._conf else np.zeros(0, dtype=np.float32),
+            "min_conf": np.array(self.min_conf, dtype=np.float64),
+        }
+        if self.mask_shape is not None:
+            columns["mask_shape"] = np.array(self.mask_shape, dtype=np.int64)
+            columns["mask_offsets"] = np.concatenate(([0], np.cumsum(self._mask_lengths))).astype(np.int64)
+            columns["mask_runs"] = np.concatenate(self._mask_runs)
+        if self._sources:
+            columns["sources"] = np.array(self._sources)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Yarım kalmış bir dosya önbellek gibi okunmasın diye önce geçici dosyaya yaz
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, **columns)
+        os.replace(tmp_path, path)
+
+
+class DetectionCache:
+    def __init__(self, offsets, xyxy, conf, mask_offsets=None, mask_runs=None, mask_shape=None,
+                 video_hash="", model_hash="", fps=0.0, frame_size=(0, 0), sources=None, min_conf=0.0):
+        """
+        Önbellekteki tespitlere kare bazlı erişim sağlar. Genellikle load() ile oluşturulur.
+        """
+        self.min_conf = min_conf  # Kayıt eşiği; daha düşük eşikli sorgular reddedilir
+        self.offsets = offsets
+        self.xyxy = xyxy
+        self.conf = conf
+        self.mask_offsets = mask_offsets
+        self.mask_runs = mask_runs
+        self.mask_shape = None if mask_shape is None else tuple(mask_shape)
+        self.video_hash = video_hash
+        self.model_hash = model_hash
+        self.fps = fps
+        self.frame_size = tuple(frame_size)
+        self.sources = None if sources is None else sources.tolist()
+        # Tüm tespitler tek bir (M, 5) dizide; kare sorguları yalnızca dilimdir
+        self._detections = np.empty((len(conf), 5), dtype=np.float64)
+        self._detections[:, :4] = xyxy
+        self._detections[:, 4] = conf
+
+    @classmethod
+    def load(cls, path):
+        """
+        Önbellek dosyasını okur.
+        """
+        with np.load(path) as data:
+            if int(data["version"]) != CACHE_VERSION:
+                raise ValueError(f"Desteklenmeyen önbellek sürümü: {int(data['version'])}")
+            has_masks = "mask_runs" in data.files
+            return cls(data["offsets"], data["xyxy"], data["conf"],
+                       data["mask_offsets"] if has_masks else None,
+                       data["mask_runs"] if has_masks else None,
+                       data["mask_shape"] if has_masks else None,
+                       str(data["video_hash"]), str(data["model_hash"]),
+                       float(data["fps"]), data["frame_size"].tolist(),
+                       data["sources"] if "sources" in data.files else None,
+                       float(data["min_conf"]) if "min_conf" in data.files else 0.0)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def supports(self, conf_threshold):
+        """
+        Önbelleğin bu güven eşiği için tüm tespitleri içerip içermediğini döndürür.
+        """
+        return conf_threshold >= self.min_conf
+
+    def _check(self, conf_threshold):
+        if not self.supports(conf_threshold):
+            raise ValueError(f"Önbellek {self.min_conf} güven eşiğiyle kaydedilmiş; "
+                             f"{conf_threshold} eşiği için tespitler eksik")
+
+    def _rows(self, frame_idx, conf_threshold):
+        self._check(conf_threshold)
+        start, end = self.offsets[frame_idx], self.offsets[frame_idx + 1]
+        return start + np.flatnonzero(self.conf[start:end] > conf_threshold)
+
+    def detections(self, frame_idx, conf_threshold=0.5):
+        """
+        Bir karenin güven eşiğini geçen tespitlerini döndürür.
+
+        Return:
+        (N, 5) [x1, y1, x2, y2, confidence] dizisi
+        """
+        self._check(conf_threshold)
+        start, end = self.offsets[frame_idx], self.offsets[frame_idx + 1]
+        frame = self._detections[start:end]
+        return frame[frame[:, 4] > conf_threshold]
+
+    def masks(self, frame_idx, conf_threshold=0.5):
+        """
+        Bir karenin güven eşiğini geçen tespitlerine ait maskeleri döndürür.
+        Maskeler sıkıştırılmış kalır; her biri erişildiğinde çözülür.
+
+        Return:
+        RleMasks: (N, mh, mw) maskeler, dense() ile bool diziye çözülür (önbellekte maske yoksa None)
+        """
+        if self.mask_runs is None:
+            return None
+        rows = self._rows(frame_idx, conf_threshold)
+        starts, ends = self.mask_offsets[rows], self.mask_offsets[rows + 1]
+        runs = [self.mask_runs[start:end] for start, end in zip(starts.tolist(), ends.tolist())]
+        offsets = np.concatenate(([0], np.cumsum(ends - starts))).astype(np.int64)
+        return RleMasks(np.concatenate(runs) if runs else self.mask_runs[:0], offsets, self.mask_shape)
+
+    def replay(self, conf_threshold=0.5, start=0):
+        """
+        Kareleri (start. kareden itibaren) sırayla EggCounter.update() girdisi olarak üretir.
+        """
+        self._check(conf_threshold)
+        return self._replay(conf_threshold, start)
+
+    def _replay(self, conf_threshold, start):
+        for frame_idx in range(start, len(self)):
+            yield self.detections(frame_idx, conf_threshold)
+
+
+if __name__ == "__main__":
+    """
+    Bir video için önbelleği oluşturur (yoksa) ve önbellekten tekrar sayım hızını ölçer.
+    """
+    import cv2
+
+    from counting import EggCounter, results_to_detections
+
+    parser = argparse.ArgumentParser(description="Tespit önbelleği oluştur ve önbellekten yeniden say")
+    parser.add_argument("--input", required=True, help="Giriş videosu")
+    parser.add_argument("--model", required=True, help="YOLO model ağırlıkları")
+    parser.add_argument("--cache-dir", default="detection_cache", help="Önbellek dizini")
+    parser.add_argument("--line-position", type=int, default=300)
+    parser.add_argument("--direction", default="right_to_left", choices=("right_to_left", "left_to_right"))
+    parser.add_argument("--conf", type=float, default=0.5, help="Güven eşiği")
+    args = parser.parse_args()
+
+    path = cache_path(args.cache_dir, args.input, args.model)
+    if not os.path.exists(path):
+        from ultralytics import YOLO
+
+        model = YOLO(args.model)
+        cap = cv2.VideoCapture(args.input)
+        recorder = DetectionRecorder()
+        start = time.perf_counter()
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            recorder.add(results_to_detections(model(frame, verbose=False), conf_threshold=0.0))
+        elapsed = time.perf_counter() - start
+        recorder.save(path, file_fingerprint(args.input), file_fingerprint(args.model),
+                      cap.get(cv2.CAP_PROP_FPS),
+                      (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))))
+        cap.release()
+        print(f"Önbellek yazıldı: {path} ({len(recorder)} kare, {len(recorder) / elapsed:.1f} kare/s)")
+
+    start = time.perf_counter()
+    cache = DetectionCache.load(path)
+    egg_counter = EggCounter(args.line_position, args.direction)
+    for detections in cache.replay(args.conf):
+        egg_counter.update(detections)
+    elapsed = time.perf_counter() - start
+    print(f"Önbellekten sayım: {egg_counter.get_total_count()} yumurta, {len(cache)} kare, "
+          f"{len(cache) / elapsed:.0f} kare/s ({os.path.getsize(path) / 2**20:.1f} MB)")
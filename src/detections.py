@@ -0,0 +1,50 @@
+import numpy as np
+
+"""
+YOLO sonuçlarından tespitleri tensör düzeyinde çıkaran yardımcılar.
+Kutu koordinatları ve güven değerleri tek seferde NumPy dizisine alınır,
+güven eşiği vektörel bir maske ile uygulanır. Kutu başına .tolist() /
+.item() çağrısı yapılmadığı için çıkarma maliyeti kutu sayısıyla Python
+düzeyinde büyümez.
+"""
+
+
+def to_numpy(x):
+    """
+    Bir torch tensörünü (CPU/GPU) veya dizi benzeri nesneyi NumPy dizisine çevirir.
+    """
+    if hasattr(x, "cpu"):
+        x = x.cpu()
+    if hasattr(x, "numpy"):
+        return x.numpy()
+    return np.asarray(x)
+
+
+def extract_boxes(result, conf_threshold=0.5, inclusive=False):
+    """
+    Tek bir YOLO sonucundan güven eşiğini geçen kutuları çıkarır.
+
+    Parametreler:
+    result: YOLO sonucu (results[0])
+    conf_threshold (float): Güven eşiği
+    inclusive (bool): True ise eşiğe eşit güvenler de kabul edilir (>=), değilse (>)
+
+    Return:
+    boxes (np.ndarray): (N, 4) int64 kutular (int() gibi sıfıra doğru kesilmiş)
+    conf (np.ndarray): (N,) güven değerleri
+    indices (np.ndarray): (N,) kutuların sonuç içindeki indeksleri (maskeler için)
+    """
+    xyxy = to_numpy(result.boxes.xyxy).reshape(-1, 4)
+    conf = to_numpy(result.boxes.conf).reshape(-1)
+    keep = conf >= conf_threshold if inclusive else conf > conf_threshold
+    return xyxy[keep].astype(np.int64), conf[keep], np.flatnonzero(keep)
+
+
+def to_detection_array(boxes, conf):
+    """
+    Kutuları ve güvenleri EggCounter'ın kabul ettiği (N, 5) diziye birleştirir.
+    """
+    detections = np.empty((len(boxes), 5), dtype=np.float64)
+    detections[:, :4] = boxes
+    detections[:, 4] = conf
+    return detections
@@ -0,0 +1,22 @@
+from engine.adapters import BoxAdapter, SegmentationAdapter
+from engine.checkpoint import Checkpointer, load_checkpoint, save_checkpoint
+from engine.core import EVENT_DTYPE, NO_EVENTS, CountingEngine
+from engine.events import EventLog, read_events
+from engine.renderers import BoxRenderer, MaskRenderer
+
+"""
+İçe aktarılabilir sayım motoru paketi.
+
+    from engine import BoxAdapter, CountingEngine
+
+    engine = CountingEngine(line_position=300)
+    adapter = BoxAdapter(conf_threshold=0.5)
+    for frame in frames:
+        events = engine.feed(adapter(model(frame, verbose=False)))
+
+- core: CountingEngine (takip + çizgi geçişi, feed() -> olaylar)
+- adapters: YOLO sonuçlarını tespit dizisine çeviren adaptörler (kutu, segmentasyon)
+- renderers: İsteğe bağlı çizim katmanı (kutu, maske)
+- events: Geçiş olaylarının sona eklenen, toplu fsync ile yazılan kaydı
+- checkpoint: Motor durumunun periyodik kaydı ve kaldığı yerden devam
+"""
@@ -0,0 +1,95 @@
+import numpy as np
+
+from detections import extract_boxes, to_detection_array
+from masks import MaskSet, selected_masks
+
+"""
+Model sonuçlarını sayım motorunun beklediği (N, 5) tespit dizisine çeviren
+adaptörler. Her adaptör çağrılabilir bir nesnedir: adapter(results) ->
+detections. Segmentasyon adaptörü ayrıca seçilen tespitlerin maske
+indekslerini saklar; masks() model çıktısı üzerinde kopyasız bir MaskSet
+görünümü döndürür, headless sayımda maskeler hiç kopyalanmaz. Maske
+özellikleri (alan, ağırlık merkezi) istenirse model çözünürlüğünde toplu
+olarak hesaplanır.
+"""
+
+
+class BoxAdapter:
+    def __init__(self, conf_threshold=0.5, inclusive=False):
+        """
+        Kutu (detect) modelleri için adaptör.
+
+        Parametreler:
+        conf_threshold (float): Güven eşiği
+        inclusive (bool): True ise eşiğe eşit güvenler de kabul edilir (>=), değilse (>)
+        """
+        self.conf_threshold = conf_threshold
+        self.inclusive = inclusive
+        self.indices = np.zeros(0, dtype=np.int64)  # Son karede seçilen tespitlerin sonuç içindeki indeksleri
+
+    def __call__(self, results):
+        """
+        Tek karelik YOLO sonuçlarını tespit dizisine çevirir.
+
+        Parametreler:
+        results: YOLO modelinden gelen sonuçlar (results[0] kullanılır)
+
+        Return:
+        (N, 5) dizi: [[x1, y1, x2, y2, confidence], ...]
+        """
+        boxes, conf, self.indices = extract_boxes(results[0], self.conf_threshold, self.inclusive)
+        return to_detection_array(boxes, conf)
+
+
+class SegmentationAdapter(BoxAdapter):
+    def __init__(self, conf_threshold=0.5, inclusive=False, centroids=False):
+        """
+        Segmentasyon modelleri için adaptör.
+
+        Parametreler:
+        conf_threshold (float), inclusive (bool): BoxAdapter ile aynı
+        centroids (bool): True ise her karede maske ağırlık merkezleri hesaplanır ve
+                          eşleştirmede kutu merkezi yerine kullanılmak üzere centers alanına yazılır
+        """
+        super().__init__(conf_threshold, inclusive)
+        self.centroids = centroids
+        self.centers = None  # Son karedeki maske merkezleri (centroids=True ise, (N, 2))
+        self._result = None
+        self._features = None
+
+    def __call__(self, results):
+        self._result = results[0]
+        self._features = None
+        detections = super().__call__(results)
+        self.centers = None
+        if self.centroids and len(detections) and len(self.masks()) == len(detections):
+            _, centroids = self.features()
+            # Maskesi boş çıkan tespitlerde kutu merkezi kullanılır
+            box_centers = (detections[:, :2] + detections[:, 2:4]) / 2
+            self.centers = np.where(np.isnan(centroids), box_centers, centroids)
+        return detections
+
+    def masks(self):
+        """
+        Son karede seçilen tespitlerin maskelerini döndürür.
+
+        Return:
+        MaskSet: (K, mh, mw) kopyasız maske görünümü (maske yoksa boş)
+        """
+        if self._result is None:
+            return MaskSet.empty()
+        return selected_masks(self._result, self.indices)
+
+    def features(self):
+        """
+        Son karede seçilen tespitlerin maske alanlarını ve ağırlık merkezlerini
+        kare koordinatlarında döndürür (kare başına bir kez hesaplanır).
+
+        Return:
+        areas (np.ndarray): (K,) alanlar (kare pikseli)
+        centroids (np.ndarray): (K, 2) ağırlık merkezleri (x, y)
+        """
+        if self._features is None:
+            height, width = self._result.orig_shape[:2]
+            self._features = self.masks().features((width, height))
+        return self._features
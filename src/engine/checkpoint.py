@@ -0,0 +1,112 @@
+import os
+import time
+
+import numpy as np
+
+"""
+Sayım motoru durumunun periyodik olarak diske yazılması (checkpoint).
+Durum küçüktür: sayım, kare indeksi, son ID ve aktif izler (yalnızca
+görüşteki yumurtalar). Bu yüzden kayıt ve geri yükleme milisaniyeler sürer;
+çöken bir süreç videonun başından değil, son checkpoint'in karesinden
+devam eder.
+
+Olay kaydı bağlıysa checkpoint yazılmadan önce kayıt diske yazılır ve o
+anki olay sayısı checkpoint'e eklenir. Devam ederken kayıt bu sayıya
+kısaltılır; checkpoint sonrasındaki kareler yeniden işlenirken aynı olaylar
+tekrar üretildiği için kayıtta çift olay oluşmaz.
+"""
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(engine, path):
+    """
+    Motor durumunu atomik olarak dosyaya yazar.
+
+    Parametreler:
+    engine: CountingEngine nesnesi
+    path (str): Checkpoint dosyası (.npz)
+    """
+    event_count = -1
+    if engine.event_log is not None:
+        engine.event_log.flush()
+        event_count = engine.event_log.count
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # Yarım kalmış bir dosya checkpoint gibi okunmasın diye önce geçici dosyaya yaz
+    tmp_path = path + ".tmp.npz"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, version=np.array(CHECKPOINT_VERSION),
+                 line_position=np.array(engine.line_position), direction=np.array(engine.direction),
+                 count=np.array(engine.count), frame_index=np.array(engine.frame_index),
+                 last_id=np.array(engine.tracker.last_id), tracks=engine.tracker.tracks,
+                 boxes=engine.boxes, ids=engine.ids, event_count=np.array(event_count))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(engine, path):
+    """
+    Motor durumunu checkpoint dosyasından geri yükler. Motora olay kaydı
+    bağlıysa kayıt, checkpoint anındaki olay sayısına kısaltılır.
+
+    Parametreler:
+    engine: Aynı çizgi ve yön ayarlarıyla oluşturulmuş CountingEngine nesnesi
+    path (str): Checkpoint dosyası
+
+    Return:
+    Devam edilecek kare indeksi
+    """
+    with np.load(path) as data:
+        if int(data["version"]) != CHECKPOINT_VERSION:
+            raise ValueError(f"Desteklenmeyen checkpoint sürümü: {int(data['version'])}")
+        if int(data["line_position"]) != engine.line_position or str(data["direction"]) != engine.direction:
+            raise ValueError(f"Checkpoint farklı bir sayım çizgisine ait: {int(data['line_position'])}, "
+                             f"{data['direction']}")
+        engine.count = int(data["count"])
+        engine.frame_index = int(data["frame_index"])
+        engine.tracker.restore(data["tracks"], data["last_id"])
+        engine.boxes = data["boxes"]
+        engine.ids = data["ids"]
+        event_count = int(data["event_count"])
+
+    if engine.event_log is not None and 0 <= event_count <= engine.event_log.count:
+        engine.event_log.truncate(event_count)
+    return engine.frame_index
+
+
+class Checkpointer:
+    def __init__(self, path, every=300):
+        """
+        Motor durumunu her every karede bir checkpoint dosyasına yazar.
+        CountingEngine.checkpointer alanına atanır; feed() ve predict() her karede step() çağırır.
+
+        Parametreler:
+        path (str): Checkpoint dosyası
+        every (int): İki checkpoint arasındaki kare sayısı
+        """
+        self.path = path
+        self.every = every
+        self.saves = 0
+        self.save_time = 0.0  # Checkpoint yazmak için harcanan toplam süre
+        self._last_frame = None
+
+    def step(self, engine):
+        """
+        Son checkpoint'ten bu yana every kare geçtiyse durumu yazar.
+        """
+        if self._last_frame is None:
+            self._last_frame = engine.frame_index
+        elif engine.frame_index - self._last_frame >= self.every:
+            self.save(engine)
+
+    def save(self, engine):
+        """
+        Durumu hemen yazar (ör. video bittiğinde).
+        """
+        start = time.perf_counter()
+        save_checkpoint(engine, self.path)
+        self.save_time += time.perf_counter() - start
+        self.saves += 1
+        self._last_frame = engine.frame_index
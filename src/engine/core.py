@@ -0,0 +1,173 @@
+import time
+
+import numpy as np
+
+from tracker import CentroidTracker
+
+"""
+Tek sayım motoru (counting engine): counting.py, segment_egg.py ve
+segment_trying.py aynı eşleştirme ve çizgi geçiş mantığını bu sınıftan alır.
+Model sonuçlarının tespit dizisine çevrilmesi (adapters) ve çizim
+(renderers) ayrı katmanlardır; motor yalnızca (N, 5) tespit dizisi alır.
+
+Akış API'si: feed(detections) her kare için çağrılır ve o karede çizgiyi
+geçen izleri olay (event) dizisi olarak döndürür. Geçiş olmayan karelerde
+paylaşılan boş dizi döner; kare başına olay nesnesi oluşturulmaz.
+event_log atanmışsa olaylar ayrıca kalıcı olay kaydına (engine.events),
+checkpointer atanmışsa durum periyodik olarak diske (engine.checkpoint) yazılır.
+"""
+
+EVENT_DTYPE = np.dtype([
+    ("track_id", np.int64),  # Çizgiyi geçen izin ID'si
+    ("frame", np.int64),  # Geçişin görüldüğü kare indeksi (0'dan başlar)
+    ("timestamp", np.float64),  # Geçiş zamanı (saniye, varsayılan: time.time())
+    ("position", np.int64, (2,)),  # Geçişteki merkez (x, y)
+])
+
+NO_EVENTS = np.zeros(0, dtype=EVENT_DTYPE)
+NO_EVENTS.flags.writeable = False
+
+
+class CountingEngine:
+    def __init__(self, line_position, direction="right_to_left", max_distance=50, match_method="greedy",
+                 max_missed=0):
+        """
+        CountingEngine sınıfının başlatıcı metodu.
+
+        Parametreler:
+        line_position (int): Sayım çizgisinin x koordinatı
+        direction (str): Sayım yönü ("right_to_left" veya "left_to_right")
+        max_distance (float): Nesne eşleştirme mesafe eşiği (piksel)
+        match_method (str): İz atama yöntemi ("greedy" veya "hungarian")
+        max_missed (int): Bir izin silinmeden önce tespit edilmeden kalabileceği kare sayısı
+        """
+        self.line_position = line_position
+        self.direction = direction
+        self.count = 0  # Toplam sayım
+        self.frame_index = 0  # Bir sonraki feed()/predict() çağrısının kare indeksi
+        self.tracker = CentroidTracker(max_distance, match_method, max_missed)  # İzler ve sayıldı bilgileri
+        self.boxes = np.zeros((0, 4), dtype=np.int64)  # Son tespit karesindeki kutular
+        self.ids = np.zeros(0, dtype=np.int64)  # Kutuların iz ID'leri
+        self.event_log = None  # İsteğe bağlı engine.events.EventLog
+        self.checkpointer = None  # İsteğe bağlı engine.checkpoint.Checkpointer
+
+    @property
+    def object_id(self):
+        """
+        Son atanan nesne ID'sini döndürür.
+        """
+        return self.tracker.last_id
+
+    def get_total_count(self):
+        """
+        Toplam sayım değerini döndürür.
+        """
+        return self.count
+
+    def save_count_to_file(self, filename="count_result.txt"):
+        """
+        Sayım sonucunu dosyaya kaydeder.
+        """
+        with open(filename, 'w') as f:
+            f.write(f"Toplam sayılan yumurta: {self.count}")
+
+    def _count_crossings(self, prev_x, cur_x, matched):
+        """
+        Çizgiyi bu karede geçen ve daha önce sayılmamış izleri sayar.
+
+        Return:
+        (N,) bool dizi: bu karede sayılan tespitler
+        """
+        if self.direction == "right_to_left":
+            crossed = matched & (prev_x > self.line_position) & (cur_x <= self.line_position)
+        else:  # left_to_right durumu
+            crossed = matched & (prev_x < self.line_position) & (cur_x >= self.line_position)
+
+        # Sayıldı bilgisi izin kendisinde tutulur; ilk N iz, N tespitle aynı sıradadır
+        counted = self.tracker.tracks["counted"][:len(matched)]
+        crossed &= ~counted
+        counted |= crossed
+        self.count += int(np.count_nonzero(crossed))
+        return crossed
+
+    def roi_band(self, frame_width, belt_speed=10, object_size=60):
+        """
+        Sayım kararı için gereken, çizgi etrafındaki dikey bandı döndürür.
+        Çizgiye (eşleştirme eşiği + bir karelik ilerleme) mesafesindeki her
+        yumurtanın kutusu bandın içinde kesilmeden kalır.
+
+        Parametreler:
+        frame_width (int): Kare genişliği
+        belt_speed (int): Bant hızı (piksel/kare)
+        object_size (int): En büyük yumurta genişliği (piksel)
+
+        Return:
+        (x0, x1) bant sınırları
+        """
+        margin = int(self.tracker.max_distance + belt_speed + object_size)
+        return max(0, self.line_position - margin), min(frame_width, self.line_position + margin)
+
+    def feed(self, detections, timestamp=None, centers=None):
+        """
+        Bir karenin tespitleriyle takip durumunu ve sayımı günceller.
+
+        Parametreler:
+        detections: [(x1, y1, x2, y2, confidence), ...] veya aynı sütunlara sahip (N, 5) NumPy dizisi
+                    (güven eşiği uygulanmış; bkz. engine.adapters)
+        timestamp (float): Karenin zamanı (verilmezse geçiş olduğunda time.time())
+        centers (np.ndarray): İsteğe bağlı (N, 2) eşleştirme merkezleri (ör. maske ağırlık
+                              merkezleri, bkz. SegmentationAdapter); verilmezse kutu merkezleri
+
+        Return:
+        EVENT_DTYPE dizisi: bu karede çizgiyi geçen izler (geçiş yoksa boş)
+        """
+        boxes = np.asarray(detections, dtype=np.float64).reshape(-1, 5)[:, :4].astype(np.int64)
+        if centers is None:
+            # Tespit kutularının merkez noktalarını hesapla
+            centers = (boxes[:, :2] + boxes[:, 2:]) // 2
+        else:
+            centers = np.rint(centers).astype(np.int64).reshape(-1, 2)
+
+        # Tespitleri önceki kareden gelen izlerle bire bir eşleştir
+        ids, prev_centers, matched = self.tracker.update(centers)
+
+        # Çizgi geçiş kontrolü yap
+        crossed = self._count_crossings(prev_centers[:, 0], centers[:, 0], matched)
+
+        self.boxes = boxes
+        self.ids = ids
+        frame = self.frame_index
+        self.frame_index += 1
+        events = NO_EVENTS
+        if crossed.any():
+            rows = np.flatnonzero(crossed)
+            events = np.empty(len(rows), dtype=EVENT_DTYPE)
+            events["track_id"] = ids[rows]
+            events["frame"] = frame
+            events["timestamp"] = time.time() if timestamp is None else timestamp
+            events["position"] = centers[rows]
+
+        if self.event_log is not None:
+            self.event_log.write(events)
+        if self.checkpointer is not None:
+            self.checkpointer.step(self)
+        return events
+
+    def predict(self):
+        """
+        Dedektörün çalıştırılmadığı bir karede izleri sabit hız varsayımıyla bir
+        kare ilerletir. Sayım yapılmaz; çizgiyi arada geçen yumurtalar bir sonraki
+        tespit karesinde, son gözlenen konumları ile karşılaştırılarak sayılır.
+
+        Return:
+        boxes (np.ndarray): (N, 4) son tespit kutularının tahmini konumları
+        ids (np.ndarray): (N,) kutuların iz ID'leri
+        """
+        self.tracker.predict()
+        self.frame_index += 1
+        if self.checkpointer is not None:
+            self.checkpointer.step(self)
+        n = len(self.boxes)
+        tracks = self.tracker.tracks[:n]
+        offset = self.tracker.positions()[:n] - tracks["center"]
+        return self.boxes + np.tile(offset, 2), tracks["id"].copy()
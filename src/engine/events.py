@@ -0,0 +1,123 @@
+import os
+import time
+
+import numpy as np
+
+from engine.core import EVENT_DTYPE
+
+"""
+Sayım olaylarının (çizgi geçişleri) yalnızca sona eklenen (append-only) kaydı.
+Her olay EVENT_DTYPE düzeninde sabit boyutlu bir ikili kayıttır; dosya,
+başlıksız art arda kayıtlardan oluşur. Böylece:
+- Yazma, olay dizisinin baytlarını dosyanın sonuna eklemekten ibarettir.
+- Okuyucular dosyayı yazma sürerken takip edebilir: read_events(path, start)
+  yalnızca start. olaydan sonraki tam kayıtları döndürür.
+- Çökme sırasında yarım kalan son kayıt, bir sonraki açılışta kesilir.
+
+Olaylar bellekte biriktirilir; batch_size olaya ulaşıldığında veya son
+senkronizasyondan bu yana sync_interval saniye geçtiğinde tek bir write +
+fsync ile diske yazılır. Yüksek yumurta hızlarında olay başına fsync
+maliyeti ödenmez; çökme durumunda en fazla sync_interval saniyelik olay
+kaybolur (ve son checkpoint'ten yeniden işlenirken tekrar üretilir).
+"""
+
+
+class EventLog:
+    def __init__(self, path, batch_size=256, sync_interval=1.0):
+        """
+        EventLog sınıfının başlatıcı metodu. Dosya varsa sonuna eklenir.
+
+        Parametreler:
+        path (str): Olay dosyası
+        batch_size (int): Bu kadar olay biriktiğinde diske yazılır
+        sync_interval (float): Bekleyen olaylar en geç bu kadar saniye sonra diske yazılır
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "ab")
+        size = self._file.seek(0, os.SEEK_END)
+        partial = size % EVENT_DTYPE.itemsize
+        if partial:
+            # Çökme sırasında yarım yazılmış son kaydı at
+            self._file.truncate(size - partial)
+        self.count = size // EVENT_DTYPE.itemsize  # Kayda eklenen toplam olay (bekleyenler dahil)
+        self.syncs = 0  # fsync çağrısı sayısı
+        self.sync_time = 0.0  # Yazma + fsync için harcanan toplam süre
+        self._pending = []
+        self._pending_count = 0
+        self._last_sync = time.perf_counter()
+
+    def __len__(self):
+        return self.count
+
+    def write(self, events):
+        """
+        Olayları kayda ekler; gerekiyorsa bekleyen olayları diske yazar.
+        Boş diziyle de çağrılabilir (her karede çağrılması, bekleyen olayların
+        sync_interval içinde yazılmasını sağlar).
+
+        Parametreler:
+        events (np.ndarray): EVENT_DTYPE dizisi
+        """
+        if len(events):
+            self._pending.append(events.tobytes())
+            self._pending_count += len(events)
+            self.count += len(events)
+        if self._pending and (self._pending_count >= self.batch_size
+                              or time.perf_counter() - self._last_sync >= self.sync_interval):
+            self.flush()
+
+    def flush(self):
+        """
+        Bekleyen olayları dosyaya yazar ve fsync ile diske kalıcı hale getirir.
+        """
+        start = time.perf_counter()
+        if self._pending:
+            self._file.write(b"".join(self._pending))
+            self._pending.clear()
+            self._pending_count = 0
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.syncs += 1
+        self._last_sync = time.perf_counter()
+        self.sync_time += self._last_sync - start
+
+    def truncate(self, count):
+        """
+        Kaydı ilk count olaya kısaltır (checkpoint'ten devam ederken, checkpoint
+        sonrasında yazılmış ve yeniden üretilecek olayları atmak için).
+        """
+        self.flush()
+        self._file.truncate(count * EVENT_DTYPE.itemsize)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.count = count
+
+    def close(self):
+        """
+        Bekleyen olayları yazar ve dosyayı kapatır.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def read_events(path, start=0):
+    """
+    Olay kaydını okur. Yazma sürerken de güvenle çağrılabilir; yalnızca tam
+    kayıtlar döndürülür.
+
+    Parametreler:
+    path (str): Olay dosyası
+    start (int): Atlanacak olay sayısı (takip eden okuyucu için son okunan konum)
+
+    Return:
+    EVENT_DTYPE dizisi
+    """
+    with open(path, "rb") as f:
+        f.seek(start * EVENT_DTYPE.itemsize)
+        data = f.read()
+    usable = len(data) - len(data) % EVENT_DTYPE.itemsize
+    return np.frombuffer(data[:usable], dtype=EVENT_DTYPE)
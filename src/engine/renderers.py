@@ -0,0 +1,82 @@
+import cv2
+
+from masks import MaskCompositor
+
+"""
+Sayım motorunun durumunu kareye çizen görselleştirme katmanı.
+Çizim tamamen isteğe bağlıdır (headless modda hiç çağrılmaz) ve karenin
+üzerine yerinde yapılır. Renk ve yazı ayarları parametrelidir; her betik
+kendi görünümünü korur.
+"""
+
+
+class BoxRenderer:
+    def __init__(self, box_color=(255, 0, 0), label_color=(255, 255, 0), label_scale=0.5, label_offset=-10,
+                 line_color=(0, 0, 255), line_thickness=3, count_color=(0, 0, 255), count_thickness=3):
+        """
+        Kutuları, ID'leri, sayım çizgisini ve toplam sayımı çizer.
+
+        Parametreler:
+        box_color (tuple): Kutu rengi (BGR)
+        label_color (tuple): ID yazısının rengi
+        label_scale (float): ID yazısının boyutu
+        label_offset (int): ID yazısının kutunun üst kenarına göre dikey konumu
+        line_color (tuple), line_thickness (int): Sayım çizgisi
+        count_color (tuple), count_thickness (int): Toplam sayım yazısı
+        """
+        self.box_color = box_color
+        self.label_color = label_color
+        self.label_scale = label_scale
+        self.label_offset = label_offset
+        self.line_color = line_color
+        self.line_thickness = line_thickness
+        self.count_color = count_color
+        self.count_thickness = count_thickness
+
+    def draw(self, frame, boxes, ids, line_position, count):
+        """
+        Kareye çizim yapar.
+
+        Parametreler:
+        frame: Üzerine çizim yapılacak video karesi
+        boxes, ids: Motorun son kutuları ve iz ID'leri
+        line_position (int): Sayım çizgisinin x koordinatı
+        count (int): Toplam sayım
+
+        Return:
+        İşlenmiş video karesi (aynı dizi)
+        """
+        for (x1, y1, x2, y2), object_id in zip(boxes.tolist(), ids.tolist()):
+            cv2.rectangle(frame, (x1, y1), (x2, y2), self.box_color, 2)
+            cv2.putText(frame, f"ID: {object_id}", (x1, y1 + self.label_offset),
+                        cv2.FONT_HERSHEY_SIMPLEX, self.label_scale, self.label_color, 2)
+
+        # Sayım çizgisini çiz
+        cv2.line(frame, (line_position, 0), (line_position, frame.shape[0]), self.line_color, self.line_thickness)
+
+        # Toplam sayımı göster
+        cv2.putText(frame, f"Count: {count}", (50, 50),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, self.count_color, self.count_thickness)
+        return frame
+
+
+class MaskRenderer(BoxRenderer):
+    def __init__(self, compositor=None, **style):
+        """
+        Segmentasyon maskelerini bindirir, ardından BoxRenderer gibi çizer.
+
+        Parametreler:
+        compositor (MaskCompositor): Maske bindirici (varsayılan: yeni MaskCompositor)
+        style: BoxRenderer parametreleri
+        """
+        super().__init__(**style)
+        self.compositor = compositor or MaskCompositor()  # Maskeler kareye yerinde bindirilir
+
+    def draw(self, frame, boxes, ids, line_position, count, masks=None):
+        """
+        Kareye maskeleri ve kutuları çizer; masks BoxRenderer.draw() parametrelerine ek olarak
+        (K, mh, mw) maske dizisi, MaskSet veya RleMasks'tir (ör. SegmentationAdapter.masks()).
+        """
+        if masks is not None:
+            frame = self.compositor.composite(frame, masks, boxes, out=frame)
+        return super().draw(frame, boxes, ids, line_position, count)
@@ -0,0 +1,109 @@
+import numpy as np
+
+"""
+Yakalama ve çıktı için önceden ayrılmış kare tamponu halkası (ring).
+cap.read(image=tampon) kareyi doğrudan halkadaki bir sonraki tampona çözer;
+çizim bu tampon üzerinde yerinde yapılır. Böylece kararlı durumda kare başına
+yeni bir tam kare dizisi oluşturulmaz. Arka plan yazıcı (AsyncVideoSink)
+yazılan her kareyi kendi kuyruk tamponuna bir kez kopyalar; sayım döngüsü
+kodlamayı beklemez ve halka kodlanmamış karelerle sınırlanmaz.
+
+Halka boyutu, aynı anda kullanımda olabilecek kare sayısından büyük olmalıdır
+(sıralı döngü için 2, aşamalı modda kuyruk kapasiteleri + aşama sayısı);
+aksi halde henüz yazılmamış bir kare bir sonraki okumayla ezilir.
+
+Sayaçlar:
+- allocations: Oluşturulan tam kare tamponu sayısı. Başlangıçtaki halka
+  boyutundan sonra artıyorsa okuyucu tamponu kullanmamış (ör. kare boyutu
+  değişmiş) ve yeni dizi ayırmıştır.
+- copies: Yazıcıya halkadan olmayan bir kare verildi (çizim aşaması kareyi
+  kopyalamış veya yeni bir dizi oluşturmuştur).
+- Yazıcının kendi kopyaları stats() / report() çağrısına sink_copies olarak
+  verilir ve kare başına kopya sayısına eklenir.
+"""
+
+
+class FramePool:
+    def __init__(self, shape, size=2, dtype=np.uint8):
+        """
+        FramePool sınıfının başlatıcı metodu.
+
+        Parametreler:
+        shape (tuple): Kare boyutu (H, W, 3)
+        size (int): Halkadaki tampon sayısı
+        dtype: Kare veri tipi
+        """
+        self._buffers = [np.empty(shape, dtype=dtype) for _ in range(size)]
+        self._next = 0
+        self.reads = 0  # Başarılı okuma sayısı
+        self.allocations = size  # Oluşturulan tam kare tamponları
+        self.copies = 0  # Yazıcıya halkadan olmayan kare verilme sayısı
+
+    def __len__(self):
+        return len(self._buffers)
+
+    def read(self, cap):
+        """
+        Bir sonraki kareyi halkadaki sıradaki tampona okur.
+
+        Parametreler:
+        cap: read(image=...) destekleyen kaynak (cv2.VideoCapture)
+
+        Return:
+        (ret, frame) çifti; frame halkadaki tampondur
+        """
+        slot = self._next
+        buffer = self._buffers[slot]
+        ret, frame = cap.read(image=buffer)
+        if not ret:
+            return False, None
+        if frame is not buffer:
+            # Okuyucu tamponu kullanmadı; yeni diziyi halkaya al ki bir sonraki turda kullanılsın
+            self._buffers[slot] = frame
+            self.allocations += 1
+        self._next = (slot + 1) % len(self._buffers)
+        self.reads += 1
+        return True, frame
+
+    def owns(self, frame):
+        """
+        Karenin halkadaki tamponlardan biri olup olmadığını döndürür.
+        """
+        return any(frame is buffer for buffer in self._buffers)
+
+    def check(self, frame):
+        """
+        Yazıcıya gidecek kareyi kontrol eder; halkadan değilse kopya sayacını artırır.
+
+        Return:
+        Aynı kare (write_to_sinks çağrısına zincirlenebilir)
+        """
+        if not self.owns(frame):
+            self.copies += 1
+        return frame
+
+    def stats(self, sink_copies=0):
+        """
+        Kare başına ayırma ve kopya sayılarını döndürür.
+
+        Parametreler:
+        sink_copies (int): Sink'lerin kendi tamponlarına yaptığı kare kopyaları (ör. AsyncVideoSink.copies)
+
+        Return:
+        {"frames", "buffers", "allocations", "copies", "sink_copies", "allocations_per_frame", "copies_per_frame"}
+        """
+        frames = max(1, self.reads)
+        extra = self.allocations - len(self._buffers)
+        copies = self.copies + sink_copies
+        return {"frames": self.reads, "buffers": len(self._buffers), "allocations": self.allocations,
+                "copies": copies, "sink_copies": sink_copies, "allocations_per_frame": extra / frames,
+                "copies_per_frame": copies / frames}
+
+    def report(self, sink_copies=0):
+        """
+        Sayaçları tek satırlık bir özet olarak döndürür.
+        """
+        s = self.stats(sink_copies)
+        return (f"Kare tamponu: {s['buffers']} tampon, {s['frames']} kare, "
+                f"kare başına {s['allocations_per_frame']:.3f} ayırma, {s['copies_per_frame']:.3f} kopya "
+                f"(yazıcı: {s['sink_copies']})")
@@ -0,0 +1,205 @@
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+"""
+Uyarlamalı kare atlama (adaptive frame skipping).
+Yavaş bir bantta ardışık kareler neredeyse aynıdır; dedektör her k. karede
+çalıştırılır, aradaki karelerde EggCounter izleri sabit hız varsayımıyla
+ilerletir (predict). Sayım yalnızca tespit karelerinde, izin son gözlenen
+konumu ile yeni konumu karşılaştırılarak yapılır; bu yüzden çizgiyi atlanan
+bir karede geçen yumurta da bir sonraki tespitte sayılır.
+
+k, hiçbir geçişin kaçırılmaması için bant hızına göre ayarlanır:
+- İki tespit arasında bir yumurtanın aldığı yol eşleştirme eşiğinin altında
+  kalmalıdır; aksi halde iz kopar, yumurta yeni ID alır ve geçişi kaçırılabilir.
+- Banda yeni giren bir yumurta çizgiye ulaşmadan en az bir kez görülmelidir.
+- Hız henüz bilinmiyorsa (tespit edilen izlerin hiçbiri eşleşmediyse) kare atlanmaz.
+Bant boşken veya dururken dedektör, son tespit karesine göre ucuz bir kare
+farkı kontrolü bir değişiklik gösterene kadar (veya max_skip kare) çalıştırılmaz.
+"""
+
+
+class AdaptiveSkipper:
+    def __init__(self, counter, frame_width, max_skip=8, safety=0.5, min_speed=0.5, diff_threshold=2.0,
+                 diff_scale=8):
+        """
+        AdaptiveSkipper sınıfının başlatıcı metodu.
+
+        Parametreler:
+        counter: EggCounter nesnesi (izler ve sayım çizgisi buradan okunur)
+        frame_width (int): Kare genişliği
+        max_skip (int): İki tespit arasındaki en fazla kare sayısı
+        safety (float): İki tespit arasında izin verilen yolun, eşleştirme eşiğine
+                        (veya giriş kenarı-çizgi mesafesine) oranı
+        min_speed (float): Bu hızın (piksel/kare) altında bant duruyor kabul edilir
+        diff_threshold (float): Boş bantta tespiti tetikleyen ortalama piksel farkı (0-255)
+        diff_scale (int): Kare farkı için küçültme oranı
+        """
+        self.counter = counter
+        self.max_skip = max_skip
+        self.safety = safety
+        self.min_speed = min_speed
+        self.diff_threshold = diff_threshold
+        self.diff_scale = diff_scale
+        # Yeni yumurtaların girdiği kenar ile çizgi arasındaki mesafe
+        line = counter.line_position
+        self.upstream = frame_width - line if counter.direction == "right_to_left" else line
+        self._reference = None  # Son tespit karesinin küçültülmüş gri hali
+        self._since = 0  # Son tespitten bu yana geçen kare
+        self._speed_known = False  # Son tespitte en az bir iz eşleşti mi?
+        self._last_id = None  # Son tespit kararından önceki son ID
+        self.frames = 0
+        self.detections = 0  # Dedektörün çalıştırıldığı kare sayısı
+
+    def speed(self):
+        """
+        İzlerin en yüksek hızını (piksel/kare) döndürür; iz yoksa 0.
+        """
+        tracker = self.counter.tracker
+        if not len(tracker):
+            return 0.0
+        return float(np.abs(tracker.tracks["velocity"]).max())
+
+    def interval(self):
+        """
+        Güncel bant hızına göre iki tespit arasındaki kare sayısını (k) döndürür.
+        """
+        if len(self.counter.tracker) and not self._speed_known:
+            return 1
+        speed = self.speed()
+        if speed < self.min_speed:
+            return self.max_skip
+        travel = self.safety * min(self.counter.tracker.max_distance, self.upstream)
+        return int(max(1, min(self.max_skip, travel // speed)))
+
+    def _small_gray(self, frame):
+        h, w = frame.shape[:2]
+        small = cv2.resize(frame, (max(1, w // self.diff_scale), max(1, h // self.diff_scale)),
+                           interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def should_detect(self, frame):
+        """
+        Bu karede dedektörün çalıştırılıp çalıştırılmayacağına karar verir.
+        True dönerse kare, sonraki fark kontrolleri için referans olur ve çağıran
+        bu karenin tespitleriyle EggCounter.update(), aksi halde predict() çağırmalıdır.
+        """
+        if self._last_id is not None:
+            # Son tespitten önce var olan ve bu tespitte görülen izler eşleşmiştir
+            tracks = self.counter.tracker.tracks
+            self._speed_known = bool(np.any((tracks["id"] <= self._last_id) & (tracks["missed"] == 0)))
+            self._last_id = None
+
+        self.frames += 1
+        self._since += 1
+        if self._reference is None or self._since >= self.interval():
+            detect = True
+        elif self.speed() >= self.min_speed:
+            detect = False
+        else:
+            # Boş veya duran bant: yalnızca görüntü değiştiyse dedektörü çalıştır
+            diff = cv2.absdiff(self._small_gray(frame), self._reference)
+            detect = float(diff.mean()) > self.diff_threshold
+
+        if detect:
+            self._reference = self._small_gray(frame)
+            self._since = 0
+            self.detections += 1
+            self._last_id = self.counter.object_id
+        return detect
+
+    def process(self, frame, detect):
+        """
+        Bir kareyi uyarlamalı modda işler.
+
+        Parametreler:
+        frame: Video karesi
+        detect: Kareyi (N, 5) tespit dizisine çeviren fonksiyon (ör. model + results_to_detections)
+
+        Return:
+        boxes, ids: EggCounter.update() veya predict() dönüş değerleri
+        """
+        if self.should_detect(frame):
+            return self.counter.update(detect(frame))
+        return self.counter.predict()
+
+    def finish(self, frame, detect):
+        """
+        Akışın son karesi atlandıysa dedektörü bu karede çalıştırır; böylece
+        son tespitten sonra çizgiyi geçen yumurtalar da sayılır.
+
+        Parametreler:
+        frame: Akışın son karesi
+        detect: process() ile aynı tespit fonksiyonu
+        """
+        if frame is not None and self._since:
+            self._since = 0
+            self.detections += 1
+            self.counter.update(detect(frame))
+
+
+def count_video(video_path, detect, counter, skipper=None):
+    """
+    Bir videoyu baştan sona sayar; skipper verilirse uyarlamalı modda.
+
+    Return:
+    (sayım, kare sayısı, dedektör çağrısı, süre)
+    """
+    cap = cv2.VideoCapture(video_path)
+    frames = 0
+    last_frame = None
+    start = time.perf_counter()
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames += 1
+        last_frame = frame
+        if skipper:
+            skipper.process(frame, detect)
+        else:
+            counter.update(detect(frame))
+    if skipper:
+        skipper.finish(last_frame, detect)
+    elapsed = time.perf_counter() - start
+    cap.release()
+    calls = skipper.detections if skipper else frames
+    return counter.get_total_count(), frames, calls, elapsed
+
+
+if __name__ == "__main__":
+    """
+    Aynı videoyu her karede dedektör çalıştırarak ve uyarlamalı kare atlama ile
+    sayar; sayım doğruluğunu ve işlem hızını karşılaştırır.
+    """
+    from ultralytics import YOLO
+
+    from counting import EggCounter, results_to_detections
+
+    parser = argparse.ArgumentParser(description="Her kare ve uyarlamalı kare atlama karşılaştırması")
+    parser.add_argument("--input", required=True, help="Giriş videosu")
+    parser.add_argument("--model", required=True, help="YOLO model ağırlıkları")
+    parser.add_argument("--line-position", type=int, default=300)
+    parser.add_argument("--direction", default="right_to_left", choices=("right_to_left", "left_to_right"))
+    parser.add_argument("--max-skip", type=int, default=8, help="İki tespit arasındaki en fazla kare")
+    args = parser.parse_args()
+
+    model = YOLO(args.model)
+    detect = lambda frame: results_to_detections(model(frame, verbose=False))
+    cap = cv2.VideoCapture(args.input)
+    frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    cap.release()
+
+    counter = EggCounter(args.line_position, args.direction)
+    baseline = count_video(args.input, detect, counter)
+    counter = EggCounter(args.line_position, args.direction)
+    adaptive = count_video(args.input, detect, counter, AdaptiveSkipper(counter, frame_width, args.max_skip))
+
+    print(f"{'mod':<12} {'sayım':>6} {'kare':>7} {'dedektör':>9} {'kare/s':>8}")
+    for name, (count, frames, calls, elapsed) in (("her kare", baseline), ("uyarlamalı", adaptive)):
+        print(f"{name:<12} {count:>6} {frames:>7} {calls:>9} {frames / elapsed:>8.1f}")
+    status = "eşit" if adaptive[0] == baseline[0] else f"fark {adaptive[0] - baseline[0]:+d}"
+    print(f"Sayım: {status}, hızlanma {baseline[3] / adaptive[3]:.1f}x")
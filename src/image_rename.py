@@ -1,18 +1,198 @@
-from ultralytics import YOLO
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-# Modeli yükle
-model_path = r"C:\Users\Monster\Desktop\best.pt"
-model = YOLO(model_path)
+import cv2
 
-# Videoyu çalıştır ve sonuçları kaydet
-video_path = r"C:\Users\Monster\Desktop\Conveyor1_egg.mp4"
+from detection_cache import DetectionRecorder, cache_path, file_fingerprint
+from detections import extract_boxes, to_detection_array
+from startup import EXPORT_FORMATS, load_model
 
-# Modeli video üzerinde çalıştır (GPU kullanarak)
-results = model.predict(
-    source=video_path,   # İşlenecek video
-    conf=0.5,            # Güven eşiği
-    save=True,           # Sonuçları kaydet
-    device='cuda'        # GPU kullanımı
-)
+"""
+Birden fazla video veya görüntü dizini üzerinde toplu tahmin (batch predict).
+- Cihaz otomatik seçilir (CUDA, Apple MPS, yoksa CPU); yalnızca CPU olan
+  çıkarım sunucularında da çalışır.
+- model.predict(stream=True) sonuçları kare kare üretir; videonun tüm
+  sonuçları hiçbir zaman bellekte tutulmaz.
+- Kaynaklar, çekirdek sayısına göre boyutlandırılan bir işçi süreç havuzuna
+  dağıtılır; her işçi kendi modelini yükler ve çekirdekleri paylaşır.
+- Varsayılan çıktı, işlenmiş medya yerine sıkıştırılmış tespit kayıtlarıdır
+  (detection_cache biçimi). Videoların kayıtları counting.py --cache-dir ile
+  aynı adlandırmayı kullanır, yani sayım modeli yüklemeden bu kayıtlardan
+  tekrar oynatılabilir. Kayıtlar --conf eşiğiyle yazıldığı için eşik dosyaya
+  da yazılır; daha düşük bir eşikle sayım/tarama yapılırsa önbellek reddedilir
+  (counting.py bu durumda modeli yeniden çalıştırır). Sonradan düşük eşikler
+  denenecekse kayıtlar düşük bir --conf ile alınmalıdır.
+  İşlenmiş medya yalnızca --save-media ile yazılır.
+"""
 
-print("Sonuçlar kaydedildi.")
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".m4v", ".wmv")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+
+
+def select_device():
+    """
+    Kullanılabilir en iyi çıkarım cihazını döndürür: "cuda", "mps" veya "cpu".
+    """
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def collect_sources(paths):
+    """
+    Verilen yolları tahmin kaynaklarına çevirir.
+    Video dosyaları tek tek, görüntü içeren dizinler ise bir bütün olarak
+    kaynak olur; dizinlerdeki videolar ayrı kaynaklar olarak eklenir.
+
+    Return:
+    Kaynak yolları listesi
+    """
+    sources = []
+    for path in paths:
+        if not os.path.isdir(path):
+            sources.append(path)
+            continue
+        names = sorted(os.listdir(path))
+        sources.extend(os.path.join(path, name) for name in names if name.lower().endswith(VIDEO_EXTENSIONS))
+        if any(name.lower().endswith(IMAGE_EXTENSIONS) for name in names):
+            sources.append(path)
+    return sources
+
+
+def records_path(records_dir, source, model_path):
+    """
+    Bir kaynağın tespit kaydı dosyasının yolunu döndürür.
+    Videolar için yol counting.py'nin önbellek yoluyla aynıdır.
+    """
+    if os.path.isdir(source):
+        return os.path.join(records_dir, os.path.basename(os.path.normpath(source)) + ".npz")
+    return cache_path(records_dir, source, model_path)
+
+
+def predict_source(source, model_path, device="cpu", conf=0.5, records_dir="detection_cache", save_media=False,
+                   threads=None, export_format=None):
+    """
+    Bir kaynağı (video veya görüntü dizini) akış modunda işler (işçi süreçte çalışır).
+
+    Parametreler:
+    source (str): Video dosyası veya görüntü dizini
+    model_path (str): YOLO model ağırlıkları
+    device (str): Çıkarım cihazı
+    conf (float): Güven eşiği
+    records_dir (str): Tespit kayıtlarının dizini (None: kayıt yazılmaz)
+    save_media (bool): İşlenmiş görüntü/videoyu da kaydet (ultralytics runs/ dizinine)
+    threads (int): İşçi başına torch iş parçacığı sayısı
+    export_format (str): İsteğe bağlı "onnx" veya "openvino" (bkz. startup.load_model)
+
+    Return:
+    {"source", "frames", "detections", "elapsed", "records"} sözlüğü
+    """
+    if threads:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+
+    t0 = time.perf_counter()
+    model = load_model(model_path, export_format)
+    # Kayıtlar yalnızca conf eşiğini geçen tespitleri içerir; eşik dosyaya yazılır
+    recorder = DetectionRecorder(min_conf=conf) if records_dir else None
+    is_directory = os.path.isdir(source)
+    frames = 0
+    detections = 0
+    frame_size = (0, 0)
+    for result in model.predict(source=source, conf=conf, device=device, stream=True, save=save_media,
+                                verbose=False):
+        boxes, scores, _ = extract_boxes(result, conf, inclusive=True)
+        frames += 1
+        detections += len(boxes)
+        if recorder is not None:
+            recorder.add(to_detection_array(boxes, scores),
+                         source=os.path.basename(result.path) if is_directory else None)
+            frame_size = (result.orig_shape[1], result.orig_shape[0])
+
+    path = None
+    if recorder is not None:
+        path = records_path(records_dir, source, model_path)
+        fps = 0.0
+        if not is_directory:
+            cap = cv2.VideoCapture(source)
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            cap.release()
+        recorder.save(path, "" if is_directory else file_fingerprint(source), file_fingerprint(model_path),
+                      fps, frame_size)
+    return {"source": source, "frames": frames, "detections": detections,
+            "elapsed": time.perf_counter() - t0, "records": path}
+
+
+def predict_batch(sources, model_path, device=None, conf=0.5, records_dir="detection_cache", save_media=False,
+                  workers=None, export_format=None):
+    """
+    Kaynakları işçi süreç havuzunda işler.
+
+    Parametreler:
+    sources (list): Video dosyaları ve/veya görüntü dizinleri
+    device (str): Çıkarım cihazı (varsayılan: select_device())
+    workers (int): İşçi süreç sayısı (varsayılan: CPU'da çekirdek sayısı, GPU'da 1)
+    Diğerleri: predict_source() ile aynı
+
+    Return:
+    Kaynak sonuçları listesi (kaynak sırasıyla)
+    """
+    device = device or select_device()
+    if workers is None:
+        # GPU tek bir süreçle doyurulur; CPU'da kaynaklar çekirdeklere dağıtılır
+        workers = (os.cpu_count() or 1) if device == "cpu" else 1
+    workers = max(1, min(workers, len(sources)))
+    # Her işçi kendi torch iş parçacığı havuzunu kullanır; çekirdekleri paylaştır
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(predict_source, source, model_path, device, conf, records_dir, save_media,
+                               threads, export_format)
+                   for source in sources]
+        return [f.result() for f in futures]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Videolar ve görüntü dizinleri üzerinde toplu tahmin")
+    parser.add_argument("inputs", nargs="+", help="Video dosyaları ve/veya görüntü dizinleri")
+    parser.add_argument("--model", default=r"C:\Users\Monster\Desktop\best.pt", help="YOLO model ağırlıkları")
+    parser.add_argument("--conf", type=float, default=0.5, help="Güven eşiği")
+    parser.add_argument("--device", default=None, help="Çıkarım cihazı (varsayılan: otomatik; cpu, cuda, mps, 0...)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="İşçi süreç sayısı (varsayılan: CPU'da çekirdek sayısı, GPU'da 1)")
+    parser.add_argument("--records-dir", default="detection_cache", help="Tespit kayıtlarının dizini")
+    parser.add_argument("--no-records", action="store_true", help="Tespit kaydı yazma")
+    parser.add_argument("--save-media", action="store_true", help="İşlenmiş görüntü/videoları da kaydet")
+    parser.add_argument("--export", default=None, choices=EXPORT_FORMATS,
+                        help="CPU için modeli bir kez dışa aktar ve onu kullan")
+    args = parser.parse_args()
+
+    sources = collect_sources(args.inputs)
+    if not sources:
+        parser.error("İşlenecek video veya görüntü bulunamadı")
+    device = args.device or select_device()
+    print(f"{len(sources)} kaynak, cihaz: {device}")
+
+    start = time.perf_counter()
+    outcomes = predict_batch(sources, args.model, device, args.conf, None if args.no_records else args.records_dir,
+                             args.save_media, args.workers, args.export)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'kaynak':<40} {'kare':>7} {'tespit':>8} {'kare/s':>8}  kayıt")
+    for outcome in outcomes:
+        print(f"{os.path.basename(os.path.normpath(outcome['source'])):<40} {outcome['frames']:>7} "
+              f"{outcome['detections']:>8} {outcome['frames'] / max(outcome['elapsed'], 1e-9):>8.1f}  "
+              f"{outcome['records'] or '-'}")
+    frames = sum(outcome["frames"] for outcome in outcomes)
+    print(f"Toplam: {frames} kare, {elapsed:.2f} s ({frames / elapsed:.1f} kare/s)")
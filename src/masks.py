@@ -0,0 +1,356 @@
+import cv2
+import numpy as np
+
+from detections import to_numpy
+
+"""
+Segmentasyon maskelerinin kareye tek geçişte bindirilmesi (compositing).
+Tüm örnek maskeleri tek bir birleşim (union) maskesinde toplanır; büyütme
+işlemi yalnızca her kutunun ROI bölgesinde yapılır ve renk karışımı kare
+başına bir kez, yeniden kullanılan tamponlara uygulanır. Böylece bellek
+kullanımı görüntüdeki yumurta sayısından bağımsız kalır. out=frame verilirse
+bindirme karenin kendisine yapılır ve tam kare kopyası da oluşmaz.
+
+Maskeler hafif temsillerle taşınır ve yalnızca bir tüketici istediğinde çözülür:
+- MaskSet: model çıktısındaki (N, mh, mw) tensör üzerinde seçilen tespitlerin
+  görünümü. Kopya yapılmaz; bindirme yalnızca kutu bölgelerini (ROI) okur.
+  Alan, ağırlık merkezi gibi özellikler satır/sütun izdüşümleriyle toplu
+  olarak model çözünürlüğünde hesaplanır; CPU'ya yalnızca (K, mh + mw)
+  boyutunda izdüşümler aktarılır.
+- RleMasks: uzunluk kodlamalı (RLE) maskeler; her maske erişildiğinde çözülür.
+- polygons(): maskelerin dış konturları (en küçük temsil).
+"""
+
+SIZE_GRADES = ("S", "M", "L", "XL")
+
+
+def rle_encode(mask):
+    """
+    İkili maskeyi satır sıralı (C order) uzunluk kodlamasına (RLE) çevirir.
+    Uzunluklar sıfırlarla başlar: [0 sayısı, 1 sayısı, 0 sayısı, ...].
+
+    Parametreler:
+    mask (np.ndarray): (H, W) ikili maske
+
+    Return:
+    uint32 uzunluk dizisi
+    """
+    flat = np.asarray(mask, dtype=bool).ravel()
+    if flat.size == 0:
+        return np.zeros(0, dtype=np.uint32)
+    change = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    runs = np.diff(np.concatenate(([0], change, [flat.size])))
+    if flat[0]:
+        runs = np.concatenate(([0], runs))
+    return runs.astype(np.uint32)
+
+
+def rle_decode(runs, shape):
+    """
+    rle_encode() çıktısını (H, W) bool maskeye geri çevirir.
+    """
+    values = np.arange(len(runs)) % 2 == 1
+    return np.repeat(values, runs).reshape(shape)
+
+
+def grade_sizes(areas, bounds):
+    """
+    Yumurtaları alanlarına göre boy sınıflarına ayırır.
+
+    Parametreler:
+    areas (np.ndarray): (K,) alanlar (kare pikseli)
+    bounds (list): Artan sırada sınıf sınırları; len(bounds) + 1 sınıf oluşur
+                   (ör. 3 sınır: S, M, L, XL)
+
+    Return:
+    (K,) sınıf indeksleri (0: en küçük)
+    """
+    return np.searchsorted(np.asarray(bounds), areas, side="right")
+
+
+def grade_names(count):
+    """
+    count boy sınıfı için etiketler (4 sınıfta S, M, L, XL; diğer durumlarda G1, G2, ...).
+    """
+    return SIZE_GRADES if count == len(SIZE_GRADES) else tuple(f"G{i + 1}" for i in range(count))
+
+
+class MaskSet:
+    def __init__(self, data, indices, threshold=0.5, chunk=32):
+        """
+        Model çözünürlüğündeki maskelerden seçilen tespitlerin tembel görünümü.
+
+        Parametreler:
+        data: (N, mh, mw) maske tensörü veya dizisi (ör. results[0].masks.data)
+        indices (np.ndarray): Seçilen tespitlerin indeksleri
+        threshold (float): Maske ikilileştirme eşiği
+        chunk (int): Toplu özellik hesabında aynı anda işlenen maske sayısı (tepe belleği sınırlar)
+        """
+        self.data = data
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.threshold = threshold
+        self.chunk = chunk
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros((0, 1, 1), dtype=np.float32), np.zeros(0, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.indices)
+
+    @property
+    def shape(self):
+        return (len(self),) + tuple(self.data.shape[1:])
+
+    def __getitem__(self, i):
+        """
+        i. maskeyi (mh, mw) float32 olarak döndürür (NumPy verisinde kopyasız görünüm).
+        """
+        return to_numpy(self.data[int(self.indices[i])])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def roi(self, i, rows, cols):
+        """
+        i. maskenin yalnızca verilen bölgesini döndürür; GPU tensöründe yalnızca bu bölge aktarılır.
+        """
+        return to_numpy(self.data[int(self.indices[i]), rows, cols])
+
+    def dense(self):
+        """
+        Seçilen maskeleri (K, mh, mw) float32 diziye çözer.
+        """
+        if not len(self):
+            return np.zeros((0,) + self.shape[1:], dtype=np.float32)
+        return to_numpy(self.data[self.indices.tolist()])
+
+    def projections(self):
+        """
+        İkili maskelerin satır ve sütun izdüşümlerini toplu olarak hesaplar.
+
+        Return:
+        rows (np.ndarray): (K, mh) her satırdaki maske pikseli sayısı
+        cols (np.ndarray): (K, mw) her sütundaki maske pikseli sayısı
+        """
+        mh, mw = self.shape[1:]
+        rows = np.zeros((len(self), mh), dtype=np.int64)
+        cols = np.zeros((len(self), mw), dtype=np.int64)
+        for start in range(0, len(self), self.chunk):
+            block = self.data[self.indices[start:start + self.chunk].tolist()] > self.threshold
+            rows[start:start + len(block)] = to_numpy(block.sum(2))
+            cols[start:start + len(block)] = to_numpy(block.sum(1))
+        return rows, cols
+
+    def features(self, frame_size=None):
+        """
+        Maske alanlarını ve ağırlık merkezlerini toplu olarak hesaplar.
+
+        Parametreler:
+        frame_size (tuple): (W, H); verilirse sonuçlar kare koordinatlarına ölçeklenir
+
+        Return:
+        areas (np.ndarray): (K,) alanlar (piksel)
+        centroids (np.ndarray): (K, 2) ağırlık merkezleri (x, y); boş maskelerde NaN
+        """
+        rows, cols = self.projections()
+        mh, mw = self.shape[1:]
+        areas = rows.sum(1).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            centroids = np.stack([(cols @ np.arange(mw)) / areas, (rows @ np.arange(mh)) / areas], axis=1)
+        # Piksel merkezleri (i + 0.5)
+        centroids += 0.5
+        if frame_size is not None:
+            sx, sy = frame_size[0] / mw, frame_size[1] / mh
+            areas *= sx * sy
+            centroids *= (sx, sy)
+        return areas, centroids
+
+    def to_rle(self):
+        """
+        Maskeleri uzunluk kodlamasıyla sıkıştırır.
+        """
+        return RleMasks.encode(self, self.shape[1:], self.threshold)
+
+    def polygons(self):
+        """
+        Her maskenin en büyük dış konturunu döndürür (model çözünürlüğünde).
+
+        Return:
+        [(P, 2) int32 nokta dizisi, ...]
+        """
+        polygons = []
+        for mask in self:
+            contours, _ = cv2.findContours((mask > self.threshold).astype(np.uint8), cv2.RETR_EXTERNAL,
+                                           cv2.CHAIN_APPROX_SIMPLE)
+            polygons.append(max(contours, key=cv2.contourArea).reshape(-1, 2) if contours
+                            else np.zeros((0, 2), dtype=np.int32))
+        return polygons
+
+
+class RleMasks:
+    def __init__(self, runs, offsets, shape):
+        """
+        Uzunluk kodlamalı maskeler; i. maske runs[offsets[i]:offsets[i + 1]] aralığındadır.
+
+        Parametreler:
+        runs (np.ndarray): Tüm maskelerin art arda uzunlukları
+        offsets (np.ndarray): (K + 1,) maske sınırları
+        shape (tuple): Tek maskenin (mh, mw) boyutu
+        """
+        self.runs = runs
+        self.offsets = offsets
+        self.mask_shape = tuple(int(x) for x in shape)
+
+    @classmethod
+    def encode(cls, masks, shape, threshold=0.5):
+        """
+        (mh, mw) maskeler üreten bir diziyi veya MaskSet'i kodlar.
+        """
+        encoded = [rle_encode(mask > threshold) for mask in masks]
+        offsets = np.concatenate(([0], np.cumsum([len(runs) for runs in encoded]))).astype(np.int64)
+        runs = np.concatenate(encoded) if encoded else np.zeros(0, dtype=np.uint32)
+        return cls(runs, offsets, shape)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def shape(self):
+        return (len(self),) + self.mask_shape
+
+    @property
+    def nbytes(self):
+        return self.runs.nbytes + self.offsets.nbytes
+
+    def __getitem__(self, i):
+        """
+        i. maskeyi (mh, mw) float32 olarak çözer.
+        """
+        return rle_decode(self.runs[self.offsets[i]:self.offsets[i + 1]], self.mask_shape).astype(np.float32)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def roi(self, i, rows, cols):
+        return self[i][rows, cols]
+
+    def dense(self):
+        """
+        Tüm maskeleri (K, mh, mw) bool diziye çözer.
+        """
+        masks = np.zeros(self.shape, dtype=bool)
+        for i, mask in enumerate(masks):
+            mask[:] = rle_decode(self.runs[self.offsets[i]:self.offsets[i + 1]], self.mask_shape)
+        return masks
+
+
+def selected_masks(result, indices):
+    """
+    Sonuçtaki maskelerden seçilen indekslerin kopyasız MaskSet görünümünü döndürür.
+
+    Parametreler:
+    result: Tek bir YOLO sonucu
+    indices (np.ndarray): Seçilen tespitlerin indeksleri
+
+    Return:
+    MaskSet (maske yoksa boş); dense() ile (K, mh, mw) diziye çözülür
+    """
+    if not len(indices) or getattr(result, "masks", None) is None:
+        return MaskSet.empty()
+    return MaskSet(result.masks.data, indices)
+
+
+class MaskCompositor:
+    def __init__(self, color=(0, 255, 0), alpha=0.3, threshold=0.5):
+        """
+        MaskCompositor sınıfının başlatıcı metodu.
+
+        Parametreler:
+        color (tuple): Maske rengi (BGR)
+        alpha (float): Maske renginin karışım ağırlığı
+        threshold (float): Maske ikilileştirme eşiği
+        """
+        self.color = color
+        self.alpha = alpha
+        self.threshold = threshold
+        self._union = None  # (H, W) birleşim maskesi
+        self._tint = None  # (H, W, 3) sabit renk görüntüsü
+        self._blend = None  # (H, W, 3) karışım tamponu
+        self._out = None  # (H, W, 3) çıktı tamponu
+
+    def _ensure_buffers(self, frame):
+        if self._blend is None or self._blend.shape != frame.shape:
+            h, w = frame.shape[:2]
+            self._union = np.zeros((h, w), dtype=np.uint8)
+            self._tint = np.empty_like(frame)
+            self._tint[:] = self.color
+            self._blend = np.empty_like(frame)
+            self._out = None
+
+    def union_mask(self, frame_shape, masks, boxes):
+        """
+        Model çözünürlüğündeki maskeleri kare çözünürlüğünde tek bir birleşim maskesine yazar.
+        Her maske yalnızca kendi kutusunun içinde büyütülür.
+
+        Parametreler:
+        frame_shape (tuple): Kare boyutu (H, W, ...)
+        masks: (K, mh, mw) model çözünürlüğündeki maskeler (dizi, MaskSet veya RleMasks)
+        boxes (np.ndarray): (K, 4) kare koordinatlarında kutular
+
+        Return:
+        (H, W) uint8 birleşim maskesi (yeniden kullanılan tampon)
+        """
+        h, w = frame_shape[:2]
+        union = self._union
+        union[:] = 0
+        if len(masks) == 0:
+            return union
+
+        mh, mw = masks.shape[1:]
+        sx, sy = mw / w, mh / h
+        # MaskSet/RleMasks yalnızca kutu bölgesini okur (tam maske kopyalanmaz veya çözülmez)
+        lazy = isinstance(masks, (MaskSet, RleMasks))
+        for i, (x1, y1, x2, y2) in enumerate(np.asarray(boxes).tolist()[:len(masks)]):
+            x1, x2 = max(0, x1), min(w, x2)
+            y1, y2 = max(0, y1), min(h, y2)
+            if x2 <= x1 or y2 <= y1:
+                continue
+            # Kutunun model çözünürlüğündeki karşılığı
+            mx1, mx2 = int(x1 * sx), min(mw, int(np.ceil(x2 * sx)))
+            my1, my2 = int(y1 * sy), min(mh, int(np.ceil(y2 * sy)))
+            rows, cols = slice(my1, max(my2, my1 + 1)), slice(mx1, max(mx2, mx1 + 1))
+            roi = masks.roi(i, rows, cols) if lazy else masks[i, rows, cols]
+            roi = cv2.resize(roi, (x2 - x1, y2 - y1), interpolation=cv2.INTER_LINEAR)
+            union[y1:y2, x1:x2] |= (roi > self.threshold).view(np.uint8)
+        return union
+
+    def composite(self, frame, masks, boxes, out=None):
+        """
+        Tüm maskeleri kareye tek bir karışım işlemiyle bindirir.
+
+        Parametreler:
+        frame: Video karesi
+        masks: (K, mh, mw) model çözünürlüğündeki maskeler (dizi, MaskSet veya RleMasks)
+        boxes (np.ndarray): (K, 4) kare koordinatlarında kutular
+        out (np.ndarray): Çıktı dizisi. Verilmezse yeniden kullanılan bir iç
+            tampon kullanılır ve kare değiştirilmez; out=frame ile bindirme
+            yerinde yapılır (kopya yok).
+
+        Return:
+        Maskeli kare (out veya iç tampon; iç tampon bir sonraki çağrıda üzerine yazılır)
+        """
+        self._ensure_buffers(frame)
+        union = self.union_mask(frame.shape, masks, boxes)
+        if out is None:
+            if self._out is None:
+                self._out = np.empty_like(frame)
+            out = self._out
+        if out is not frame:
+            np.copyto(out, frame)
+        if union.any():
+            cv2.addWeighted(frame, 1 - self.alpha, self._tint, self.alpha, 0, dst=self._blend)
+            np.copyto(out, self._blend, where=union[:, :, None].view(bool))
+        return out
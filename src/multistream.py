@@ -0,0 +1,244 @@
+import argparse
+import queue
+import threading
+import time
+
+import cv2
+
+"""
+Birden fazla konveyör hattını tek makinede sayan çoklu akış çalıştırıcısı.
+Her akışın kendi sayım çizgisi, yönü ve EggCounter'ı vardır; model tek bir
+kez yüklenir ve tüm akışlardan gelen kareler tek bir çıkarım çağrısında
+toplu (cross-batch) işlenir.
+
+Her akış kendi okuma iş parçacığında sınırlı bir kuyruğa kare doldurur.
+Ana döngü kuyrukları dönüşümlü (round-robin) sırayla tarar ve her turda bir
+akıştan en fazla bir kare alır; böylece hızlı bir akış diğerlerini aç bırakamaz.
+"""
+
+_END = object()  # Akış sonu işareti
+
+
+class StreamSpec:
+    def __init__(self, name, source, line_position, direction="right_to_left"):
+        """
+        Bir konveyör akışının tanımı.
+
+        Parametreler:
+        name (str): Akış adı (raporlarda kullanılır)
+        source: Video dosyası yolu, kamera indeksi, read() metodu olan bir nesne
+                (cv2.VideoCapture gibi) veya kare üreten bir iterable/generator
+        line_position (int): Sayım çizgisinin x koordinatı
+        direction (str): Sayım yönü ("right_to_left" veya "left_to_right")
+        """
+        self.name = name
+        self.source = source
+        self.line_position = line_position
+        self.direction = direction
+
+
+def open_source(source):
+    """
+    Bir kaynağı, her çağrıda bir sonraki kareyi (veya bitince None) döndüren
+    bir fonksiyona ve kaynağı kapatan bir fonksiyona dönüştürür.
+
+    Return:
+    (read, release) fonksiyon çifti
+    """
+    if isinstance(source, (str, int)):
+        source = cv2.VideoCapture(source)
+    if hasattr(source, "read"):
+        def read():
+            ret, frame = source.read()
+            return frame if ret else None
+        return read, getattr(source, "release", lambda: None)
+
+    iterator = iter(source)
+    return (lambda: next(iterator, None)), getattr(source, "close", lambda: None)
+
+
+class _StreamState:
+    def __init__(self, spec, counter, prefetch):
+        self.spec = spec
+        self.counter = counter
+        self.frames = queue.Queue(prefetch)
+        self.done = False
+        self.frames_done = 0
+        self.start = None
+        self.end = None
+
+    def fps(self):
+        if self.start is None:
+            return 0.0
+        elapsed = (self.end or time.perf_counter()) - self.start
+        return self.frames_done / elapsed if elapsed > 0 else 0.0
+
+
+class MultiStreamRunner:
+    def __init__(self, model, streams, counter_factory, to_detections, max_batch=None, prefetch=4):
+        """
+        MultiStreamRunner sınıfının başlatıcı metodu.
+
+        Parametreler:
+        model: Paylaşılan model; kare listesi alıp sonuç listesi döndürür
+        streams (list): StreamSpec listesi
+        counter_factory: StreamSpec -> sayaç fonksiyonu (ör. EggCounter oluşturan)
+        to_detections: Tek bir kare sonucunu sayacın update() girdisine çeviren fonksiyon
+        max_batch (int): Bir çıkarım çağrısındaki en fazla kare sayısı (varsayılan: akış sayısı)
+        prefetch (int): Akış başına okuma kuyruğu kapasitesi
+        """
+        self.model = model
+        self.to_detections = to_detections
+        self.max_batch = max_batch or len(streams)
+        self.prefetch = prefetch
+        self.streams = [_StreamState(spec, counter_factory(spec), prefetch) for spec in streams]
+        self.batches = 0  # Yapılan çıkarım çağrısı sayısı
+        self.wall_time = 0.0
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._next = 0  # Round-robin başlangıç indeksi
+
+    def stop(self):
+        """
+        Tüm akışları durdurur.
+        """
+        self._stop.set()
+        self._ready.set()
+
+    def _reader(self, state):
+        read, release = open_source(state.spec.source)
+        try:
+            while not self._stop.is_set():
+                frame = read()
+                item = _END if frame is None else frame
+                while not self._stop.is_set():
+                    try:
+                        state.frames.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                self._ready.set()
+                if item is _END:
+                    break
+        finally:
+            release()
+
+    def _next_batch(self):
+        """
+        Hazır akışlardan round-robin sırasıyla, akış başına en fazla bir kare toplar.
+        """
+        batch = []
+        n = len(self.streams)
+        last = n - 1  # Bu turda son bakılan akışın (self._next'e göre) konumu
+        for offset in range(n):
+            if len(batch) == self.max_batch:
+                last = offset - 1
+                break
+            state = self.streams[(self._next + offset) % n]
+            if state.done:
+                continue
+            try:
+                item = state.frames.get_nowait()
+            except queue.Empty:
+                continue
+            if item is _END:
+                state.done = True
+                state.end = time.perf_counter()
+                continue
+            batch.append((state, item))
+        # Bir sonraki tur, bu turda son bakılan akıştan sonra başlar
+        self._next = (self._next + last + 1) % n
+        return batch
+
+    def run(self):
+        """
+        Tüm akışlar bitene (veya stop() çağrılana) kadar çalışır.
+
+        Return:
+        Akış adı -> toplam sayım sözlüğü
+        """
+        readers = [threading.Thread(target=self._reader, args=(state,), name=state.spec.name, daemon=True)
+                   for state in self.streams]
+        start = time.perf_counter()
+        for state in self.streams:
+            state.start = start
+        for t in readers:
+            t.start()
+
+        try:
+            while not self._stop.is_set() and not all(state.done for state in self.streams):
+                self._ready.clear()
+                batch = self._next_batch()
+                if not batch:
+                    self._ready.wait(0.05)
+                    continue
+
+                results = self.model([frame for _, frame in batch], verbose=False)
+                self.batches += 1
+                for (state, frame), result in zip(batch, results):
+                    state.counter.update(self.to_detections(result))
+                    state.frames_done += 1
+        finally:
+            # Model veya sayaç hata verse de okuyucular durdurulur ve kaynaklar serbest bırakılır
+            self.stop()
+            for t in readers:
+                t.join()
+            self.wall_time = time.perf_counter() - start
+        return self.counts()
+
+    def counts(self):
+        """
+        Akış başına güncel toplam sayımı döndürür.
+        """
+        return {state.spec.name: state.counter.get_total_count() for state in self.streams}
+
+    def report(self):
+        """
+        Akış başına kare, sayım ve FPS değerlerini tablo olarak döndürür.
+        """
+        total = sum(state.frames_done for state in self.streams)
+        avg_batch = total / self.batches if self.batches else 0.0
+        lines = [f"{len(self.streams)} akış, {total} kare, {self.batches} çıkarım çağrısı "
+                 f"(ortalama batch {avg_batch:.1f}), {self.wall_time:.2f} s",
+                 f"{'akış':<16} {'kare':>7} {'sayım':>7} {'FPS':>7}"]
+        for state in self.streams:
+            lines.append(f"{state.spec.name:<16} {state.frames_done:>7} "
+                         f"{state.counter.get_total_count():>7} {state.fps():>7.1f}")
+        return "\n".join(lines)
+
+
+def parse_stream(text, index):
+    """
+    "kaynak,çizgi,yön" biçimindeki komut satırı argümanını StreamSpec'e çevirir.
+    Çizgi ve yön isteğe bağlıdır (varsayılan: 300, right_to_left).
+    """
+    parts = text.rsplit(",", 2)
+    source = parts[0]
+    line_position = int(parts[1]) if len(parts) > 1 else 300
+    direction = parts[2] if len(parts) > 2 else "right_to_left"
+    return StreamSpec(f"hat{index + 1}", int(source) if source.isdigit() else source, line_position, direction)
+
+
+if __name__ == "__main__":
+    from ultralytics import YOLO
+
+    from counting import EggCounter, results_to_detections
+
+    parser = argparse.ArgumentParser(description="Çoklu konveyör hattı sayım sunucusu")
+    parser.add_argument("--model", required=True, help="YOLO model ağırlıkları")
+    parser.add_argument("--stream", action="append", required=True,
+                        help="kaynak[,çizgi[,yön]] (ör. hat1.mp4,300,right_to_left); birden fazla verilebilir")
+    parser.add_argument("--max-batch", type=int, default=None, help="Bir çıkarım çağrısındaki en fazla kare")
+    args = parser.parse_args()
+
+    streams = [parse_stream(text, i) for i, text in enumerate(args.stream)]
+    model = YOLO(args.model)
+    runner = MultiStreamRunner(model, streams,
+                               lambda spec: EggCounter(spec.line_position, spec.direction),
+                               lambda result: results_to_detections([result]),
+                               max_batch=args.max_batch)
+    try:
+        runner.run()
+    except KeyboardInterrupt:
+        runner.stop()
+    print(runner.report())
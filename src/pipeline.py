@@ -0,0 +1,215 @@
+import queue
+import threading
+import time
+
+"""
+PipelineRunner sınıfı, sayım döngüsünü dört aşamaya böler ve her aşamayı
+kendi iş parçacığında çalıştırır:
+
+    okuma (decode) -> çıkarım (model) -> takip/sayım -> yazma (encode)
+
+Aşamalar arasında sınırlı kuyruklar vardır; bir aşama yavaşladığında önceki
+aşamalar kuyruk dolunca bekler (backpressure). Her aşama tek iş parçacığı
+olduğu ve kuyruklar FIFO olduğu için kare sırası korunur, bu yüzden sayım
+sonucu sıralı döngü ile birebir aynıdır.
+"""
+
+_END = object()  # Akış sonu işareti
+
+
+class StageStats:
+    def __init__(self, name):
+        """
+        Bir aşamanın zaman istatistikleri.
+
+        Parametreler:
+        name (str): Aşama adı
+        """
+        self.name = name
+        self.items = 0  # İşlenen kare sayısı
+        self.busy = 0.0  # Aşama fonksiyonunda geçen süre (s)
+        self.wait_in = 0.0  # Giriş kuyruğunu bekleyerek geçen süre (s)
+        self.wait_out = 0.0  # Dolu çıkış kuyruğunu bekleyerek geçen süre (s)
+
+    def utilisation(self, wall_time):
+        """
+        Aşamanın meşgul olduğu sürenin toplam süreye oranını döndürür.
+        """
+        return self.busy / wall_time if wall_time > 0 else 0.0
+
+
+class PipelineRunner:
+    def __init__(self, read, infer, track, write, queue_size=8):
+        """
+        PipelineRunner sınıfının başlatıcı metodu.
+
+        Parametreler:
+        read: Bir sonraki kareyi döndüren fonksiyon, video bitince None döndürür
+        infer: frame -> detections fonksiyonu (model çıkarımı)
+        track: (frame, detections) -> işlenmiş kare fonksiyonu (EggCounter.process_frame)
+        write: İşlenmiş kareyi yazan/gösteren fonksiyon; False döndürürse akış durdurulur
+        queue_size (int): Aşamalar arası kuyrukların kapasitesi
+        """
+        self.read = read
+        self.infer = infer
+        self.track = track
+        self.write = write
+        self.queue_size = queue_size
+        self.stats = {name: StageStats(name) for name in ("decode", "infer", "track", "encode")}
+        self.wall_time = 0.0
+        self._stop = threading.Event()
+        self._error = None
+
+    def stop(self):
+        """
+        Akışı durdurur; kuyruktaki kareler atılır.
+        """
+        self._stop.set()
+
+    def _put(self, q, item, stats):
+        start = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        stats.wait_out += time.perf_counter() - start
+
+    def _get(self, q, stats):
+        start = time.perf_counter()
+        while True:
+            try:
+                item = q.get(timeout=0.1)
+                break
+            except queue.Empty:
+                if self._stop.is_set():
+                    item = _END
+                    break
+        stats.wait_in += time.perf_counter() - start
+        return item
+
+    def _fail(self, error):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _reader(self, out_q):
+        stats = self.stats["decode"]
+        index = 0
+        try:
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                frame = self.read()
+                stats.busy += time.perf_counter() - start
+                if frame is None:
+                    break
+                stats.items += 1
+                self._put(out_q, (index, frame), stats)
+                index += 1
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put_end(out_q)
+
+    def _worker(self, name, fn, in_q, out_q):
+        stats = self.stats[name]
+        try:
+            while True:
+                item = self._get(in_q, stats)
+                # Durdurma isteğinden sonra kuyrukta kalan kareler işlenmeden atılır
+                if item is _END or self._stop.is_set():
+                    break
+                index, payload = item
+                start = time.perf_counter()
+                result = fn(payload)
+                stats.busy += time.perf_counter() - start
+                stats.items += 1
+                self._put(out_q, (index, result), stats)
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put_end(out_q)
+
+    def _writer(self, in_q):
+        stats = self.stats["encode"]
+        expected = 0
+        try:
+            while True:
+                item = self._get(in_q, stats)
+                if item is _END or self._stop.is_set():
+                    break
+                index, frame = item
+                if index != expected:
+                    raise RuntimeError(f"Kare sırası bozuldu: {expected} bekleniyordu, {index} geldi")
+                expected += 1
+                start = time.perf_counter()
+                keep_going = self.write(frame)
+                stats.busy += time.perf_counter() - start
+                stats.items += 1
+                if keep_going is False:
+                    self.stop()
+                    break
+        except Exception as e:
+            self._fail(e)
+
+    def _put_end(self, q):
+        # Akış sonu işareti durdurma isteğinde de iletilmeli; kuyruk doluysa yer açılana kadar bekle
+        while True:
+            try:
+                q.put(_END, timeout=0.1)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def run(self):
+        """
+        Tüm aşamaları başlatır ve akış bitene kadar bekler.
+
+        Return:
+        Aşama adı -> StageStats sözlüğü
+        """
+        decoded = queue.Queue(self.queue_size)
+        detected = queue.Queue(self.queue_size)
+        tracked = queue.Queue(self.queue_size)
+
+        threads = [
+            threading.Thread(target=self._reader, args=(decoded,), name="decode"),
+            threading.Thread(target=self._worker, name="infer",
+                             args=("infer", lambda frame: (frame, self.infer(frame)), decoded, detected)),
+            threading.Thread(target=self._worker, name="track",
+                             args=("track", lambda item: self.track(*item), detected, tracked)),
+            threading.Thread(target=self._writer, args=(tracked,), name="encode"),
+        ]
+
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.wall_time = time.perf_counter() - start
+
+        if self._error is not None:
+            raise self._error
+        return self.stats
+
+    def report(self):
+        """
+        Aşama başına kullanım oranını okunabilir bir tablo olarak döndürür.
+        En yüksek kullanım oranına sahip aşama akışı sınırlayan aşamadır.
+        """
+        frames = self.stats["encode"].items
+        fps = frames / self.wall_time if self.wall_time > 0 else 0.0
+        lines = [f"{frames} kare, {self.wall_time:.2f} s, {fps:.1f} FPS",
+                 f"{'aşama':<8} {'kullanım':>9} {'ms/kare':>9} {'giriş bekleme':>14} {'çıkış bekleme':>14}"]
+        for s in self.stats.values():
+            per_frame = s.busy / s.items * 1000 if s.items else 0.0
+            lines.append(f"{s.name:<8} {s.utilisation(self.wall_time):>8.0%} {per_frame:>9.2f} "
+                         f"{s.wait_in:>13.2f}s {s.wait_out:>13.2f}s")
+        bottleneck = max(self.stats.values(), key=lambda s: s.busy)
+        lines.append(f"Darboğaz: {bottleneck.name}")
+        return "\n".join(lines)
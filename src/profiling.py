@@ -0,0 +1,220 @@
+import csv
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+"""
+Sayım döngüsü için aşama bazlı ölçüm (profiling) araçları.
+FrameProfiler her kare için aşama sürelerini (okuma, ön işleme, çıkarım,
+tespit çıkarma, takip, çizim, yazma) kaydeder; son N kare üzerinden
+p50/p95/p99 gecikme ve FPS hesaplar. Sonuçlar CSV/JSON raporu olarak ya da
+Prometheus metin biçiminde (isteğe bağlı küçük bir HTTP uç noktası ile)
+dışa aktarılabilir.
+"""
+
+STAGES = ("decode", "preprocess", "inference", "extract", "track", "draw", "encode")
+
+
+class FrameProfiler:
+    def __init__(self, window=1000, stages=STAGES):
+        """
+        FrameProfiler sınıfının başlatıcı metodu.
+
+        Parametreler:
+        window (int): Yüzdelik ve FPS hesapları için tutulacak son kare sayısı
+        stages (tuple): Aşama adları (rapor sırası)
+        """
+        self.stages = list(stages)
+        self.window = window
+        self._samples = {name: deque(maxlen=window) for name in self.stages}
+        self._totals = deque(maxlen=window)  # Kare başına toplam süre
+        self._ends = deque(maxlen=window)  # Kare bitiş zamanları (FPS için)
+        self._current = {}
+        self._frame_start = None
+        self.frames = 0
+        self.gauges = {}  # Ek ölçümler (ör. başlangıç süreleri), Prometheus'a gauge olarak yazılır
+        self._lock = threading.Lock()
+
+    def start_frame(self):
+        """
+        Yeni bir karenin ölçümünü başlatır.
+        """
+        self._current = {}
+        self._frame_start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Bir aşamanın süresini ölçen bağlam yöneticisi.
+
+        Kullanım:
+        with profiler.stage("inference"):
+            results = model(frame)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        """
+        Bir aşamaya süre ekler (aynı karede birden fazla çağrı toplanır).
+        """
+        if name not in self._samples:
+            self.stages.append(name)
+            self._samples[name] = deque(maxlen=self.window)
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def split_model_time(self, results, stage="inference"):
+        """
+        Ultralytics sonuçlarındaki speed bilgisini kullanarak model çağrısının
+        ön işleme süresini "inference" aşamasından "preprocess" aşamasına taşır.
+
+        Parametreler:
+        results: YOLO modelinden gelen sonuçlar
+        stage (str): Model çağrısının ölçüldüğü aşama
+        """
+        speed = getattr(results[0], "speed", None) if len(results) else None
+        if not speed or stage not in self._current:
+            return
+        preprocess = min(speed.get("preprocess", 0.0) / 1000, self._current[stage])
+        self._current[stage] -= preprocess
+        self.add("preprocess", preprocess)
+
+    def end_frame(self):
+        """
+        Karenin ölçümünü bitirir ve aşama sürelerini kayan pencereye ekler.
+        """
+        end = time.perf_counter()
+        with self._lock:
+            for name in self.stages:
+                self._samples[name].append(self._current.get(name, 0.0))
+            self._totals.append(end - self._frame_start if self._frame_start else sum(self._current.values()))
+            self._ends.append(end)
+            self.frames += 1
+
+    def set_gauge(self, name, value):
+        """
+        Kare ölçümleri dışındaki bir değeri (ör. ilk sayıma kadar geçen süre) kaydeder.
+        """
+        with self._lock:
+            self.gauges[name] = float(value)
+
+    def fps(self):
+        """
+        Kayan penceredeki karelere göre FPS döndürür.
+        """
+        with self._lock:
+            if len(self._ends) < 2:
+                return 0.0
+            return (len(self._ends) - 1) / (self._ends[-1] - self._ends[0])
+
+    def summary(self):
+        """
+        Aşama başına ortalama ve p50/p95/p99 gecikmeyi (ms) döndürür.
+
+        Return:
+        {"frames", "fps", "stages": {aşama: {"mean_ms", "p50_ms", "p95_ms", "p99_ms"}}, "total": {...}, "gauges": {...}}
+        """
+        with self._lock:
+            series = {name: np.array(self._samples[name]) for name in self.stages}
+            series["total"] = np.array(self._totals)
+            gauges = dict(self.gauges)
+        fps = self.fps()
+
+        def stats(values):
+            if len(values) == 0:
+                return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+            p50, p95, p99 = np.percentile(values, (50, 95, 99)) * 1000
+            return {"mean_ms": float(values.mean() * 1000), "p50_ms": float(p50),
+                    "p95_ms": float(p95), "p99_ms": float(p99)}
+
+        return {"frames": self.frames, "fps": fps,
+                "stages": {name: stats(series[name]) for name in self.stages},
+                "total": stats(series["total"]), "gauges": gauges}
+
+    def report(self):
+        """
+        Özet istatistikleri okunabilir bir tablo olarak döndürür.
+        """
+        summary = self.summary()
+        lines = [f"{summary['frames']} kare, {summary['fps']:.1f} FPS",
+                 f"{'aşama':<11} {'ort. ms':>8} {'p50':>8} {'p95':>8} {'p99':>8}"]
+        rows = list(summary["stages"].items()) + [("toplam", summary["total"])]
+        for name, s in rows:
+            lines.append(f"{name:<11} {s['mean_ms']:>8.2f} {s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f}")
+        return "\n".join(lines)
+
+    def save_json(self, path):
+        """
+        Özet istatistikleri JSON dosyasına yazar.
+        """
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def save_csv(self, path):
+        """
+        Kayan penceredeki kare bazlı aşama sürelerini (ms) CSV dosyasına yazar.
+        """
+        with self._lock:
+            columns = [list(self._samples[name]) for name in self.stages] + [list(self._totals)]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.stages + ["total"])
+            for row in zip(*columns):
+                writer.writerow([f"{value * 1000:.3f}" for value in row])
+
+    def prometheus(self, prefix="egg_counter"):
+        """
+        Özet istatistikleri Prometheus metin biçiminde döndürür.
+        """
+        summary = self.summary()
+        lines = [f"# TYPE {prefix}_frames_total counter",
+                 f"{prefix}_frames_total {summary['frames']}",
+                 f"# TYPE {prefix}_fps gauge",
+                 f"{prefix}_fps {summary['fps']:.3f}",
+                 f"# TYPE {prefix}_stage_latency_seconds summary"]
+        rows = list(summary["stages"].items()) + [("total", summary["total"])]
+        for name, s in rows:
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'{prefix}_stage_latency_seconds{{stage="{name}",quantile="{quantile}"}} '
+                             f"{s[key] / 1000:.6f}")
+        for name, value in summary["gauges"].items():
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=9100, host="127.0.0.1"):
+        """
+        Prometheus metinlerini /metrics adresinde sunan bir HTTP sunucusunu
+        arka plan iş parçacığında başlatır.
+
+        Return:
+        ThreadingHTTPServer nesnesi (shutdown() ile durdurulabilir)
+        """
+        profiler = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = profiler.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True, name="metrics").start()
+        return server
@@ -1,42 +1,74 @@
+import argparse
+
 import cv2
 import numpy as np
-from ultralytics import YOLO
+
+from engine import CountingEngine, MaskRenderer, SegmentationAdapter
+from frame_pool import FramePool
+from masks import grade_names, grade_sizes
+from sinks import AsyncVideoSink, DisplaySink, close_sinks, write_to_sinks
+from startup import EXPORT_FORMATS, ModelLoader, StartupMetrics
 
 """
 EggCounter sınıfı, konveyör bant üzerindeki yumurtaları sayar.
 Belirli bir çizgiyi geçen yumurtaları tespit eder ve takip eder.
 Her yumurtayı yalnızca bir kez sayar.
+İsteğe bağlı olarak eşleştirmede kutu merkezi yerine maske ağırlık merkezi
+kullanılır ve sayılan yumurtalar maske alanlarına göre boy sınıflarına ayrılır;
+her iki özellik de model çözünürlüğündeki maskelerden toplu olarak hesaplanır.
 """
 
 
-class EggCounter:
-    def __init__(self, line_position, direction="right_to_left"):
+class EggCounter(CountingEngine):
+    def __init__(self, line_position, direction="right_to_left", max_distance=50, match_method="greedy",
+                 max_missed=0, centroids=False, grade_bounds=None):
         """
         EggCounter sınıfının başlatıcı metodu.
 
         Parametreler:
         line_position (int): Sayım çizgisinin x koordinatı
         direction (str): Sayım yönü ("right_to_left" veya "left_to_right")
+        max_distance (float): Nesne eşleştirme mesafe eşiği (piksel)
+        match_method (str): İz atama yöntemi ("greedy" veya "hungarian")
+        max_missed (int): Bir izin silinmeden önce tespit edilmeden kalabileceği kare sayısı
+        centroids (bool): Eşleştirmede maske ağırlık merkezlerini kullan
+        grade_bounds (list): İsteğe bağlı artan alan sınırları (kare pikseli); verilirse
+                             sayılan yumurtalar boy sınıflarına ayrılır
         """
-        self.line_position = line_position
-        self.direction = direction
-        self.count = 0  # Toplam sayım
-        self.tracked_objects = {}  # Takip edilen nesnelerin bilgileri
-        self.object_id = 0  # Benzersiz nesne ID'leri için sayaç
-        self.counted_objects = set()  # Sayılmış nesnelerin ID'lerini tutan küme
-
-    def get_total_count(self):
-        """
-        Toplam sayım değerini döndürür.
+        super().__init__(line_position, direction, max_distance, match_method, max_missed)
+        # Güven eşiğine eşit tespitler de kabul edilir
+        self.adapter = SegmentationAdapter(0.5, inclusive=True, centroids=centroids)
+        self.renderer = MaskRenderer(label_color=(0, 0, 255), label_scale=1, label_offset=30)
+        self.grade_bounds = grade_bounds
+        self.grade_counts = np.zeros(0 if grade_bounds is None else len(grade_bounds) + 1, dtype=np.int64)
+
+    def update(self, results):
         """
-        return self.count
+        Yalnızca takip durumunu ve sayımı günceller; maskeleri çizmez (headless mod).
+
+        Parametreler:
+        results: YOLO modelinden gelen segmentasyon sonuçları
 
-    def save_count_to_file(self, filename="count_result.txt"):
+        Return:
+        boxes (np.ndarray): (N, 4) güven eşiğini geçen tespit kutuları
+        ids (np.ndarray): (N,) her tespitin iz ID'si
+        """
+        events = self.feed(self.adapter(results), centers=self.adapter.centers)
+        if self.grade_bounds is not None and len(events):
+            areas, _ = self.adapter.features()
+            if len(areas) == len(self.ids):
+                crossed = np.isin(self.ids, events["track_id"])
+                np.add.at(self.grade_counts, grade_sizes(areas[crossed], self.grade_bounds), 1)
+        return self.boxes, self.ids
+
+    def grade_report(self):
         """
-        Sayım sonucunu dosyaya kaydeder.
+        Boy sınıflarına göre sayımları döndürür.
+
+        Return:
+        {"S": 12, "M": 40, ...} sözlüğü (grade_bounds verilmediyse boş)
         """
-        with open(filename, 'w') as f:
-            f.write(f"Toplam sayılan yumurta: {self.count}")
+        return dict(zip(grade_names(len(self.grade_counts)), self.grade_counts.tolist()))
 
     def process_frame(self, frame, results):
         """
@@ -47,86 +79,11 @@ class EggCounter:
         results: YOLO modelinden gelen segmentasyon sonuçları
 
         Return:
-        İşlenmiş video karesi
+        İşlenmiş video karesi (aynı dizi; çizim yerinde yapılır)
         """
-        # YOLO sonuçlarını çiz (segmentasyon dahil)
-        annotated_frame = results[0].plot()
-
-        updated_tracked_objects = {}
-
-        # Her bir tespit için işlem yap
-        for r in results:
-            boxes = r.boxes
-
-            for box in boxes:
-                # Tespit kutusunun koordinatlarını ve merkez noktasını hesapla
-                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                confidence = box.conf[0].item()
-
-                if confidence < 0.5:  # Güven eşiği kontrolü
-                    continue
-
-                center_x = (x1 + x2) // 2
-                center_y = (y1 + y2) // 2
-
-                # En yakın eşleşen nesneyi bul
-                matched_id = None
-                min_distance = float('inf')
-
-                for obj_id, obj_data in self.tracked_objects.items():
-                    prev_center_x, prev_center_y = obj_data["center"]
-                    # Öklid mesafesi hesapla
-                    distance = ((center_x - prev_center_x) ** 2 + (center_y - prev_center_y) ** 2) ** 0.5
-                    if distance < 50 and distance < min_distance:  # 50 piksel mesafe eşiği
-                        matched_id = obj_id
-                        min_distance = distance
-
-                if matched_id is not None:
-                    # Eşleşen nesnenin önceki pozisyonunu al
-                    prev_center_x = self.tracked_objects[matched_id]["center"][0]
-
-                    # Çizgi geçiş kontrolü yap
-                    if self.direction == "right_to_left":
-                        if prev_center_x > self.line_position and center_x <= self.line_position:
-                            if matched_id not in self.counted_objects:
-                                self.count += 1
-                                self.counted_objects.add(matched_id)
-                    else:  # left_to_right durumu
-                        if prev_center_x < self.line_position and center_x >= self.line_position:
-                            if matched_id not in self.counted_objects:
-                                self.count += 1
-                                self.counted_objects.add(matched_id)
-
-                    # Nesne bilgilerini güncelle
-                    updated_tracked_objects[matched_id] = {
-                        "center": (center_x, center_y),
-                        "box": (x1, y1, x2, y2)
-                    }
-                else:
-                    # Yeni nesne oluştur
-                    self.object_id += 1
-                    updated_tracked_objects[self.object_id] = {
-                        "center": (center_x, center_y),
-                        "box": (x1, y1, x2, y2)
-                    }
-
-                # ID'yi göster
-                object_id = matched_id if matched_id is not None else self.object_id
-                cv2.putText(annotated_frame, f"ID: {object_id}", (x1, y1 + 30),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-
-        # Takip edilen nesneleri güncelle
-        self.tracked_objects = updated_tracked_objects
-
-        # Sayım çizgisini çiz
-        cv2.line(annotated_frame, (self.line_position, 0),
-                 (self.line_position, annotated_frame.shape[0]), (0, 0, 255), 3)
-
-        # Toplam sayımı göster
-        cv2.putText(annotated_frame, f"Count: {self.count}", (50, 50),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
-
-        return annotated_frame
+        boxes, ids = self.update(results)
+        # Segmentasyon maskeleri kareye yerinde bindirilir (results[0].plot() yeni bir kare oluşturur)
+        return self.renderer.draw(frame, boxes, ids, self.line_position, self.count, self.adapter.masks())
 
 
 if __name__ == "__main__":
@@ -135,6 +92,23 @@ if __name__ == "__main__":
     Video girişini açar, YOLO modelini yükler ve yumurta sayımını gerçekleştirir.
     İşlenmiş videoyu hem gösterir hem de kaydeder.
     """
+    parser = argparse.ArgumentParser(description="Segmentasyon tabanlı yumurta sayacı")
+    parser.add_argument("--headless", action="store_true",
+                        help="Sadece sayım yap: maske çizimi, pencere ve video kaydı yok")
+    parser.add_argument("--centroids", action="store_true",
+                        help="Eşleştirmede kutu merkezi yerine maske ağırlık merkezini kullan")
+    parser.add_argument("--grade-bounds", type=float, nargs="+", default=None,
+                        help="Boy sınıfı alan sınırları (kare pikseli, artan), ör. 2500 3500 4500 -> S, M, L, XL")
+    parser.add_argument("--export", default=None, choices=EXPORT_FORMATS,
+                        help="Ağırlıkları bir kez bu CPU biçimine dışa aktar ve onu yükle")
+    parser.add_argument("--warmup", type=int, default=1, help="Başlangıçta boş kare ile yapılacak ısınma çıkarımı sayısı")
+    args = parser.parse_args()
+    startup = StartupMetrics()
+
+    # Model arka planda yüklenir ve ısıtılır (segmentasyon modunda); bu sırada video girişi açılır
+    loader = ModelLoader(r"C:\Users\Monster\Desktop\egg_dataset\best.pt", args.export, task="segment",
+                         warmup_runs=args.warmup)
+
     # Video girişini aç
     input_video_path = r"C:\Users\Monster\Desktop\egg_dataset\Conveyor1_egg.mp4"
     cap = cv2.VideoCapture(input_video_path)
@@ -147,19 +121,25 @@ if __name__ == "__main__":
     frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     fps = int(cap.get(cv2.CAP_PROP_FPS))
+    startup.mark("capture_opened")
 
+    # Görselleştirme isteğe bağlıdır; headless modda çizim, pencere ve video kaydı yapılmaz
     output_video_path = 'output_video.mp4'
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_video_path, fourcc, fps, (frame_width, frame_height))
+    if args.headless:
+        sinks = []
+    else:
+        sinks = [AsyncVideoSink(output_video_path, fps, (frame_width, frame_height)), DisplaySink("Egg Counter")]
 
     # Sayaç ve model ayarları
     line_position = 300
     direction = "right_to_left"
-    egg_counter = EggCounter(line_position, direction)
+    egg_counter = EggCounter(line_position, direction, centroids=args.centroids, grade_bounds=args.grade_bounds)
 
     try:
-        # Modeli yükle (segmentasyon modunda)
-        model = YOLO(r"C:\Users\Monster\Desktop\egg_dataset\best.pt")
+        # Isınma, modelin gerçekte göreceği boyutla yapılır
+        loader.set_frame_shape((frame_height, frame_width, 3))
+        model = loader.get()
+        startup.mark("model_ready")
         print("Model başarıyla yüklendi.")
     except Exception as e:
         print(f"Model yüklenirken hata oluştu: {e}")
@@ -167,9 +147,10 @@ if __name__ == "__main__":
 
     print("Video işleniyor...")
     frame_count = 0
+    pool = FramePool((frame_height, frame_width, 3))  # Kareler yeniden kullanılan tamponlara okunur
 
     while True:
-        ret, frame = cap.read()
+        ret, frame = pool.read(cap)
         if not ret:
             print(f"\nVideo işleme tamamlandı.")
             final_count = egg_counter.get_total_count()
@@ -181,12 +162,14 @@ if __name__ == "__main__":
         try:
             results = model(frame)
 
-            # Kareyi işle ve sonuçları göster
-            processed_frame = egg_counter.process_frame(frame, results)
-
-            # Görüntüyü göster ve kaydet
-            cv2.imshow("Egg Counter", processed_frame)
-            out.write(processed_frame)
+            if sinks:
+                # Kareyi işle, göster ve kaydet
+                processed_frame = egg_counter.process_frame(frame, results)
+                keep_going = write_to_sinks(sinks, pool.check(processed_frame))
+            else:
+                egg_counter.update(results)
+                keep_going = True
+            startup.observe(egg_counter.count)
 
             frame_count += 1
             if frame_count % 30 == 0:  # Her 30 karede bir ilerleme göster
@@ -197,13 +180,15 @@ if __name__ == "__main__":
             continue
 
         # 'q' tuşuna basılırsa döngüyü sonlandır
-        if cv2.waitKey(1) & 0xFF == ord('q'):
+        if not keep_going:
             print("\nKullanıcı tarafından sonlandırıldı.")
             break
 
     # Kaynakları serbest bırak
     cap.release()
-    out.release()
-    cv2.destroyAllWindows()
+    close_sinks(sinks)
 
-print(f"\nToplam sayılan yumurta: {egg_counter.get_total_count()}")
\ No newline at end of file
+    print(startup.report())
+    print(f"\nToplam sayılan yumurta: {egg_counter.get_total_count()}")
+    if args.grade_bounds:
+        print("Boy sınıfları: " + ", ".join(f"{name}: {count}" for name, count in egg_counter.grade_report().items()))
\ No newline at end of file
@@ -0,0 +1,408 @@
+import argparse
+import asyncio
+import base64
+import collections
+import hashlib
+import json
+import socket
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from engine import BoxAdapter, CountingEngine
+from multistream import open_source, parse_stream
+
+"""
+Sayım döngüsünü asyncio tabanlı bir servis olarak çalıştırır ve canlı sonuçları
+yerel bir HTTP / WebSocket uç noktasından yayınlar. MES gibi sistemler dosya
+okumak yerine bu uç noktalara bağlanır.
+
+- Her hat (StreamSpec) kendi asyncio görevinde döner. Kare okuma varsayılan
+  executor'da, çıkarım + sayım ayrı bir çıkarım executor'ında çalışır; olay
+  döngüsü hiçbir zaman bloklanmaz. Model paylaşıldığı için çıkarım executor'ı
+  varsayılan olarak tek iş parçacıklıdır.
+- Yayıncı görev, durum değiştiyse en fazla update_interval saniyede bir yeni
+  bir anlık görüntü (snapshot) hazırlar. Aboneler her zaman en son görüntüyü
+  alır; yavaş bir istemci aradaki görüntüleri atlar (coalescing) ve kare
+  döngüsünü hiçbir zaman bekletemez. send_timeout içinde veri alamayan
+  istemcinin bağlantısı kapatılır.
+- Geçiş olayları sıra numarasıyla (seq) sınırlı bir halka tamponda tutulur;
+  her WebSocket mesajı, abonenin son gördüğü olaydan sonraki olayları taşır.
+  Tampondan düşen olay sayısı "dropped" alanında bildirilir.
+
+Uç noktalar:
+    GET /counts             Hat bazlı sayım, kare sayısı, FPS (JSON)
+    GET /events?since=N     N sıra numarasından sonraki geçiş olayları (JSON)
+    GET /ws[?since=N]       WebSocket: {"state": ..., "events": [...], "dropped": n} mesajları
+
+Kullanım:
+    python service.py --model best.pt --stream hat1.mp4,300 --stream hat2.mp4,420,left_to_right --port 8765
+"""
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B65"
+WS_TEXT, WS_CLOSE, WS_PING, WS_PONG = 0x1, 0x8, 0x9, 0xA
+
+HTTP_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def ws_accept_key(key):
+    """
+    İstemcinin Sec-WebSocket-Key başlığından Sec-WebSocket-Accept değerini hesaplar (RFC 6455).
+    """
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+
+def ws_encode(payload, opcode=WS_TEXT, mask=None):
+    """
+    Tek parçalı (FIN) bir WebSocket çerçevesi oluşturur.
+
+    Parametreler:
+    payload (bytes): Çerçeve içeriği
+    opcode (int): Çerçeve tipi (WS_TEXT, WS_CLOSE, ...)
+    mask (bytes): İstemci çerçeveleri için 4 baytlık maske (sunucu çerçeveleri maskesizdir)
+
+    Return:
+    bytes
+    """
+    n = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if n < 126:
+        header = struct.pack("!BB", 0x80 | opcode, mask_bit | n)
+    elif n < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, mask_bit | 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, mask_bit | 127, n)
+    if mask:
+        payload = _apply_mask(payload, mask)
+        header += mask
+    return header + payload
+
+
+async def ws_read(reader):
+    """
+    Bir WebSocket çerçevesi okur.
+
+    Return:
+    (opcode, payload) çifti
+    """
+    first, second = await reader.readexactly(2)
+    n = second & 0x7F
+    if n == 126:
+        n, = struct.unpack("!H", await reader.readexactly(2))
+    elif n == 127:
+        n, = struct.unpack("!Q", await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(n)
+    return first & 0x0F, _apply_mask(payload, mask) if mask else payload
+
+
+def _apply_mask(payload, mask):
+    # Maske 4 baytta bir tekrar eder; tek bir büyük tamsayı XOR'u ile uygulanır
+    repeated = (mask * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(payload), "big")
+
+
+class _Line:
+    def __init__(self, spec, conf_threshold, max_distance, fps_window):
+        self.spec = spec
+        self.engine = CountingEngine(spec.line_position, spec.direction, max_distance)
+        self.adapter = BoxAdapter(conf_threshold)
+        self.read, self.release = open_source(spec.source)
+        self.frames = 0
+        self.done = False
+        self._times = collections.deque(maxlen=fps_window)  # Son karelerin bitiş zamanları
+
+    def tick(self):
+        self.frames += 1
+        self._times.append(time.perf_counter())
+
+    def fps(self):
+        if len(self._times) < 2:
+            return 0.0
+        return (len(self._times) - 1) / (self._times[-1] - self._times[0])
+
+    def state(self):
+        return {"count": self.engine.count, "frames": self.frames, "fps": round(self.fps(), 2),
+                "line_position": self.spec.line_position, "direction": self.spec.direction, "done": self.done}
+
+
+class CountingService:
+    def __init__(self, model, streams, conf_threshold=0.5, max_distance=50, host="127.0.0.1", port=8765,
+                 workers=1, update_interval=0.1, recent_events=1024, send_timeout=10.0, send_buffer=None,
+                 fps_window=60):
+        """
+        CountingService sınıfının başlatıcı metodu.
+
+        Parametreler:
+        model: Paylaşılan model; model(frame, verbose=False) -> sonuç listesi
+        streams (list): StreamSpec listesi (bkz. multistream)
+        conf_threshold (float): Güven eşiği
+        max_distance (float): Nesne eşleştirme mesafe eşiği (piksel)
+        host (str), port (int): Dinlenecek adres (port=0: boş bir port seçilir, bkz. self.port)
+        workers (int): Çıkarım executor'ındaki iş parçacığı sayısı
+        update_interval (float): Abonelere iki güncelleme arasındaki en kısa süre (saniye)
+        recent_events (int): Bellekte tutulan son geçiş olayı sayısı
+        send_timeout (float): Bir mesajı bu kadar saniyede alamayan abonenin bağlantısı kapatılır
+        send_buffer (int): Abone başına gönderim tamponu üst sınırı (bayt; soket ve yazma tamponu).
+                           None: işletim sistemi varsayılanı (yerel ağda yavaş abone MB'larca veri biriktirebilir)
+        fps_window (int): FPS hesabındaki kare sayısı
+        """
+        self.model = model
+        self.lines = [_Line(spec, conf_threshold, max_distance, fps_window) for spec in streams]
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.update_interval = update_interval
+        self.send_timeout = send_timeout
+        self.send_buffer = send_buffer
+        self.events = collections.deque(maxlen=recent_events)  # (seq, JSON metni) çiftleri
+        self.event_seq = 0  # Son geçiş olayının sıra numarası (ilk olay 1)
+        self.version = 0  # Yayınlanan anlık görüntü sayısı
+        self.subscribers = 0  # Bağlı WebSocket istemcisi sayısı
+        self.messages_sent = 0
+        self.clients_dropped = 0  # send_timeout nedeniyle kapatılan abone sayısı
+        self.loop_lag = 0.0  # Yayıncının ölçtüğü en büyük olay döngüsü gecikmesi (saniye)
+        self.ready = asyncio.Event()  # Sunucu dinlemeye başladığında kurulur
+        self._snapshot = "{}"
+        self._changed = asyncio.Event()  # Her yayında kurulur ve yenisiyle değiştirilir
+        self._dirty = True
+        self._stopping = False
+        self._stop_event = asyncio.Event()  # stop() ile kurulur; bekleme (linger) süresini sonlandırır
+        self._closed = False
+        self._executor = None
+
+    def counts(self):
+        """
+        Hat adı -> toplam sayım sözlüğü.
+        """
+        return {line.spec.name: line.engine.count for line in self.lines}
+
+    def state(self):
+        """
+        Tüm hatların güncel durumu (JSON'a çevrilebilir sözlük).
+        """
+        return {"lines": {line.spec.name: line.state() for line in self.lines},
+                "total": sum(line.engine.count for line in self.lines),
+                "event_seq": self.event_seq, "subscribers": self.subscribers,
+                "loop_lag_ms": round(self.loop_lag * 1e3, 2), "time": time.time()}
+
+    def events_since(self, since):
+        """
+        since sıra numarasından sonraki olayları döndürür.
+
+        Return:
+        (olay JSON metinleri listesi, tampondan düşmüş olay sayısı)
+        """
+        first = self.event_seq - len(self.events) + 1
+        skip = max(0, since - first + 1)
+        dropped = max(0, first - since - 1) if self.events else 0
+        return [text for _, text in list(self.events)[skip:]], dropped
+
+    def stop(self):
+        """
+        Hatları durdurur; run() son durumu yayınlayıp döner.
+        Olay döngüsünün iş parçacığından çağrılmalıdır (başka iş parçacığından: loop.call_soon_threadsafe).
+        """
+        self._stopping = True
+        self._stop_event.set()
+
+    def _infer(self, line, frame):
+        # Çıkarım executor'ında çalışır; motor yalnızca bu hattın tek uçuştaki karesi tarafından güncellenir
+        return line.engine.feed(line.adapter(self.model(frame, verbose=False)))
+
+    def _add_events(self, line, events):
+        for track_id, frame, timestamp, position in events.tolist():
+            self.event_seq += 1
+            self.events.append((self.event_seq, json.dumps(
+                {"seq": self.event_seq, "line": line.spec.name, "track_id": track_id, "frame": frame,
+                 "timestamp": timestamp, "position": [int(value) for value in position]})))
+
+    async def _run_line(self, line):
+        loop = asyncio.get_running_loop()
+        try:
+            while not self._stopping:
+                frame = await loop.run_in_executor(None, line.read)
+                if frame is None:
+                    break
+                events = await loop.run_in_executor(self._executor, self._infer, line, frame)
+                line.tick()
+                if len(events):
+                    self._add_events(line, events)
+                self._dirty = True
+        finally:
+            line.done = True
+            self._dirty = True
+            await loop.run_in_executor(None, line.release)
+
+    def _publish(self):
+        self._snapshot = json.dumps(self.state())
+        self.version += 1
+        self._dirty = False
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def _publisher(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.update_interval)
+            self.loop_lag = max(self.loop_lag, time.perf_counter() - start - self.update_interval)
+            if self._dirty:
+                self._publish()
+
+    async def _respond(self, writer, status, body, content_type="application/json"):
+        body = body.encode()
+        writer.write(f"HTTP/1.1 {status} {HTTP_STATUS[status]}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            request, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, _ = request.split(" ", 2)
+            headers = {}
+            for header in header_lines:
+                if ":" in header:
+                    name, value = header.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            url = urlsplit(target)
+            query = parse_qs(url.query)
+            since = int(query["since"][0]) if "since" in query else None
+
+            if method != "GET":
+                await self._respond(writer, 405, '{"error": "method"}')
+            elif url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._websocket(reader, writer, headers, self.event_seq if since is None else since)
+            elif url.path in ("/", "/counts"):
+                await self._respond(writer, 200, json.dumps(self.state()))
+            elif url.path == "/events":
+                events, dropped = self.events_since(since or 0)
+                await self._respond(writer, 200, f'{{"event_seq": {self.event_seq}, "dropped": {dropped}, '
+                                                 f'"events": [{", ".join(events)}]}}')
+            else:
+                await self._respond(writer, 404, '{"error": "not found"}')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _websocket(self, reader, writer, headers, since):
+        if "sec-websocket-key" not in headers:
+            await self._respond(writer, 400, '{"error": "websocket key"}')
+            return
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {ws_accept_key(headers['sec-websocket-key'])}\r\n\r\n").encode())
+        await writer.drain()
+        if self.send_buffer:
+            # Okumayan abone için tutulan bellek sınırlanır; tampon dolunca send_timeout devreye girer
+            writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer)
+            writer.transport.set_write_buffer_limits(high=self.send_buffer)
+
+        self.subscribers += 1
+        sender = asyncio.ensure_future(self._send_updates(writer, since))
+        receiver = asyncio.ensure_future(self._receive(reader, writer))
+        try:
+            done, _ = await asyncio.wait((sender, receiver), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sender.cancel()
+            receiver.cancel()
+            self.subscribers -= 1
+        for task in done:
+            if isinstance(task.exception(), asyncio.TimeoutError):
+                self.clients_dropped += 1
+
+    async def _send_updates(self, writer, since):
+        seen = -1
+        while not self._closed:
+            if self.version == seen:
+                # Yeni yayın gelene kadar bekle; arada yayınlanan görüntüler atlanır (yalnızca en sonuncusu gönderilir)
+                await self._changed.wait()
+                continue
+            seen = self.version
+            events, dropped = self.events_since(since)
+            since = self.event_seq
+            message = f'{{"state": {self._snapshot}, "events": [{", ".join(events)}], "dropped": {dropped}}}'
+            writer.write(ws_encode(message.encode()))
+            await asyncio.wait_for(writer.drain(), self.send_timeout)
+            self.messages_sent += 1
+        # Sunucu kapanıyor (1001: going away)
+        writer.write(ws_encode(struct.pack("!H", 1001), WS_CLOSE))
+        await asyncio.wait_for(writer.drain(), self.send_timeout)
+
+    async def _receive(self, reader, writer):
+        # İstemci çerçeveleri yalnızca kapatma ve ping için okunur
+        while True:
+            opcode, payload = await ws_read(reader)
+            if opcode == WS_CLOSE:
+                writer.write(ws_encode(payload[:2], WS_CLOSE))
+                return
+            if opcode == WS_PING:
+                writer.write(ws_encode(payload, WS_PONG))
+
+    async def run(self, linger=None):
+        """
+        Sunucuyu başlatır ve tüm hatlar bitene (veya stop() çağrılana) kadar sayar.
+
+        Parametreler:
+        linger (float): Hatlar bittikten sonra son durumun sunulmaya devam edeceği süre
+                        (saniye; None: stop() çağrılana veya iptal edilene kadar)
+
+        Return:
+        Hat adı -> toplam sayım sözlüğü
+        """
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="inference")
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        publisher = asyncio.ensure_future(self._publisher())
+        self.ready.set()
+        tasks = [asyncio.ensure_future(self._run_line(line)) for line in self.lines]
+        try:
+            await asyncio.gather(*tasks)
+            self._publish()
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), linger)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            # Bir hat hata verdiyse diğerleri iptal edilir; executor ancak tüm hatlar bitince kapatılır
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            publisher.cancel()
+            server.close()
+            # Abonelere kapatma çerçevesi gönderilsin
+            self._closed = True
+            self._changed.set()
+            await asyncio.sleep(0)
+            # Süren son çıkarımlar olay döngüsünü bloklamadan beklenir
+            await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        return self.counts()
+
+
+if __name__ == "__main__":
+    from startup import load_model
+
+    parser = argparse.ArgumentParser(description="Canlı sayımları HTTP / WebSocket üzerinden yayınlayan servis")
+    parser.add_argument("--model", required=True, help="YOLO model ağırlıkları")
+    parser.add_argument("--stream", action="append", required=True,
+                        help="kaynak[,çizgi[,yön]] (ör. hat1.mp4,300,right_to_left); birden fazla verilebilir")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--conf", type=float, default=0.5, help="Güven eşiği")
+    parser.add_argument("--max-distance", type=float, default=50, help="Nesne eşleştirme mesafe eşiği (piksel)")
+    parser.add_argument("--update-interval", type=float, default=0.1,
+                        help="Abonelere iki güncelleme arasındaki en kısa süre (saniye)")
+    parser.add_argument("--linger", type=float, default=None,
+                        help="Kaynaklar bittikten sonra sunucunun açık kalacağı süre (varsayılan: Ctrl+C'ye kadar)")
+    args = parser.parse_args()
+
+    streams = [parse_stream(text, i) for i, text in enumerate(args.stream)]
+    service = CountingService(load_model(args.model), streams, args.conf, args.max_distance, args.host, args.port,
+                              update_interval=args.update_interval)
+    print(f"Servis: http://{args.host}:{args.port}/counts, ws://{args.host}:{args.port}/ws")
+    try:
+        asyncio.run(service.run(args.linger))
+    except KeyboardInterrupt:
+        pass
+    print(", ".join(f"{name}: {count}" for name, count in service.counts().items()))
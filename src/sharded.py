@@ -0,0 +1,195 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+"""
+Uzun kayıtların çevrimdışı yeniden sayımı için süreç havuzu ile parçalı işlem.
+Video zaman parçalarına bölünür ve her parça ayrı bir işçi süreçte (kendi YOLO
+modeli ve EggCounter'ı ile) sayılır.
+
+Her parça, kendinden önceki küçük bir örtüşme (overlap) penceresiyle başlar.
+Bu pencerede sayaç yalnızca ısınır: izler kurulur ama çizgi geçişleri
+sayılmaz. Parçanın kendi aralığındaki [start, end) geçişler sayılır; aynı
+geçiş iki parçanın aralığına birden düşmez.
+
+Bir izin sayıldı bilgisi ise izin tüm ömrü boyunca sürer ve önceki parçadan
+aktarılamaz. Örneğin bant durduğunda çizginin üzerinde bekleyen ve titreşimle
+çizgiyi yeniden geçen bir yumurta, sıralı sayımda bir kez sayılır; ısınma
+penceresinde ise bu yumurtanın daha önce sayıldığı bilinmez. Bu yüzden ısınma
+penceresinde ilk kez çizginin akış yönündeki tarafında görülen izler sayılmış
+kabul edilir (çizgiyi zaten geçmişlerdir). Kalan sınırlama: ısınma penceresi
+boyunca çizginin gerisinde kalıp parça başladıktan sonra yeniden geçen, daha
+önce sayılmış bir yumurta iki kez sayılabilir; bu durumda örtüşme, bandın
+durma süresinden uzun seçilmelidir. Parçalı toplam bu yüzden sıralı sayımla
+her zaman birebir aynı olmayabilir; --verify farkı raporlar.
+"""
+
+
+def plan_segments(total_frames, n_segments, overlap):
+    """
+    Kare aralığını örtüşmeli parçalara böler.
+
+    Parametreler:
+    total_frames (int): Videodaki toplam kare sayısı
+    n_segments (int): Parça sayısı
+    overlap (int): Her parçanın başındaki ısınma penceresi (kare)
+
+    Return:
+    [(warmup_start, start, end), ...] listesi
+    """
+    n_segments = max(1, min(n_segments, total_frames))
+    bounds = [total_frames * i // n_segments for i in range(n_segments + 1)]
+    return [(max(0, start - overlap), start, end) for start, end in zip(bounds, bounds[1:])]
+
+
+def mark_downstream_tracks(egg_counter, last_id):
+    """
+    last_id'den sonra oluşturulan ve çizginin akış yönündeki tarafında bulunan
+    izleri sayılmış olarak işaretler (ısınma penceresinde kullanılır).
+
+    Parametreler:
+    egg_counter: EggCounter (CountingEngine) nesnesi
+    last_id (int): Güncellemeden önceki son iz ID'si
+    """
+    tracks = egg_counter.tracker.tracks
+    x = tracks["center"][:, 0]
+    if egg_counter.direction == "right_to_left":
+        downstream = x <= egg_counter.line_position
+    else:
+        downstream = x >= egg_counter.line_position
+    tracks["counted"] |= (tracks["id"] > last_id) & downstream
+
+
+def count_frames(egg_counter, detections, warmup_start, start):
+    """
+    warmup_start. kareden başlayan tespit dizilerini sayar; start'tan önceki
+    kareler ısınma penceresidir ve geçişleri sayıma katılmaz.
+
+    Parametreler:
+    egg_counter: EggCounter (CountingEngine) nesnesi
+    detections: Her kare için (N, 5) tespit dizisi üreten iterable
+    warmup_start (int), start (int): Isınma penceresinin ve parçanın ilk karesi
+
+    Return:
+    (parça aralığındaki sayım, işlenen kare sayısı)
+    """
+    count_at_start = None
+    frames = 0
+    for frame_idx, frame_detections in enumerate(detections, warmup_start):
+        if frame_idx == start:
+            # Isınma bitti; bundan önceki geçişler önceki parçaya aittir
+            count_at_start = egg_counter.get_total_count()
+        last_id = egg_counter.object_id
+        egg_counter.update(frame_detections)
+        if frame_idx < start:
+            mark_downstream_tracks(egg_counter, last_id)
+        frames += 1
+
+    # Video parça başlangıcına ulaşmadan bittiyse bu parçada geçiş yoktur
+    count = 0 if count_at_start is None else egg_counter.get_total_count() - count_at_start
+    return count, frames
+
+
+def count_segment(video_path, model_path, line_position, direction, warmup_start, start, end, threads=None):
+    """
+    Bir video parçasını sayar (işçi süreçte çalışır).
+
+    Return:
+    {"start", "end", "count", "frames", "elapsed"} sözlüğü
+    """
+    if threads:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    from ultralytics import YOLO
+
+    from counting import EggCounter, results_to_detections
+
+    t0 = time.perf_counter()
+    model = YOLO(model_path)
+    egg_counter = EggCounter(line_position, direction)
+    cap = cv2.VideoCapture(video_path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, warmup_start)
+
+    def read_detections():
+        for _ in range(warmup_start, end):
+            ret, frame = cap.read()
+            if not ret:
+                return
+            yield results_to_detections(model(frame, verbose=False))
+
+    count, frames = count_frames(egg_counter, read_detections(), warmup_start, start)
+    cap.release()
+    return {"start": start, "end": end, "count": count, "frames": frames,
+            "elapsed": time.perf_counter() - t0}
+
+
+def count_sharded(video_path, model_path, line_position=300, direction="right_to_left",
+                  workers=None, overlap=30):
+    """
+    Videoyu parçalara bölüp işçi süreçlerde sayar ve sonuçları birleştirir.
+
+    Parametreler:
+    video_path (str): Giriş videosu
+    model_path (str): YOLO model ağırlıkları
+    line_position (int): Sayım çizgisinin x koordinatı
+    direction (str): Sayım yönü
+    workers (int): İşçi süreç sayısı (varsayılan: çekirdek sayısı)
+    overlap (int): Parça başına ısınma penceresi (kare)
+
+    Return:
+    (toplam sayım, parça sonuçları listesi)
+    """
+    workers = workers or os.cpu_count() or 1
+    cap = cv2.VideoCapture(video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    segments = plan_segments(total_frames, workers, overlap)
+    # Her işçi kendi torch iş parçacığı havuzunu kullanır; çekirdekleri paylaştır
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(count_segment, video_path, model_path, line_position, direction,
+                               warmup_start, start, end, threads)
+                   for warmup_start, start, end in segments]
+        parts = [f.result() for f in futures]
+    return sum(part["count"] for part in parts), parts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Uzun kayıtları işçi süreçlerle parçalı sayma")
+    parser.add_argument("--input", required=True, help="Giriş videosu")
+    parser.add_argument("--model", required=True, help="YOLO model ağırlıkları")
+    parser.add_argument("--line-position", type=int, default=300)
+    parser.add_argument("--direction", default="right_to_left", choices=("right_to_left", "left_to_right"))
+    parser.add_argument("--workers", type=int, default=None, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--overlap", type=int, default=30, help="Parça başına ısınma penceresi (kare)")
+    parser.add_argument("--verify", action="store_true", help="Sonucu tek süreçli sıralı sayımla karşılaştır")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    total, parts = count_sharded(args.input, args.model, args.line_position, args.direction,
+                                 args.workers, args.overlap)
+    sharded_time = time.perf_counter() - start
+
+    print(f"{'parça':>12} {'kare':>7} {'sayım':>6} {'süre (s)':>9}")
+    for part in parts:
+        print(f"{part['start']:>5}-{part['end']:<6} {part['frames']:>7} {part['count']:>6} {part['elapsed']:>9.2f}")
+    print(f"Toplam: {total} yumurta, {len(parts)} işçi, {sharded_time:.2f} s")
+
+    if args.verify:
+        cap = cv2.VideoCapture(args.input)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        start = time.perf_counter()
+        sequential = count_segment(args.input, args.model, args.line_position, args.direction,
+                                   0, 0, total_frames)
+        sequential_time = time.perf_counter() - start
+        status = "eşit" if sequential["count"] == total else "FARKLI"
+        print(f"Sıralı: {sequential['count']} yumurta, {sequential_time:.2f} s "
+              f"({status}, hızlanma {sequential_time / sharded_time:.1f}x)")
@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+"""
+Görselleştirme çıkışları (sink). Sayım döngüsü işlenmiş kareleri bu nesnelere
+verir; headless modda hiç sink açılmaz, böylece çizim, pencere ve video
+kodlama maliyeti tamamen ortadan kalkar.
+
+Her sink write(frame) ve close() metotlarına sahiptir. write() False
+döndürürse döngü durdurulur (ör. kullanıcı 'q' tuşuna bastığında).
+
+AsyncVideoSink video kodlamayı arka plan iş parçacığına taşır: sayım döngüsü
+kareyi yalnızca önceden ayrılmış bir tampona kopyalar (veya küçültür) ve
+devam eder; böylece sayım gecikmesi kodlama hızına bağlı kalmaz.
+"""
+
+
+class VideoFileSink:
+    def __init__(self, path, fps, frame_size, codec="mp4v"):
+        """
+        İşlenmiş kareleri bir video dosyasına yazar.
+
+        Parametreler:
+        path (str): Çıktı video yolu
+        fps (float): Kare hızı
+        frame_size (tuple): (genişlik, yükseklik)
+        codec (str): FourCC kodu
+        """
+        fourcc = cv2.VideoWriter_fourcc(*codec)
+        self.writer = cv2.VideoWriter(path, fourcc, fps, frame_size)
+
+    def write(self, frame):
+        self.writer.write(frame)
+        return True
+
+    def close(self):
+        self.writer.release()
+
+
+class AsyncVideoSink:
+    def __init__(self, path, fps, frame_size, codec="mp4v", output_size=None, stride=1, queue_size=32,
+                 drop=False):
+        """
+        İşlenmiş kareleri arka planda bir video dosyasına yazar.
+
+        Parametreler:
+        path (str): Çıktı video yolu
+        fps (float): Giriş kare hızı (stride ile bölünerek çıktıya yazılır)
+        frame_size (tuple): Giriş kare boyutu (genişlik, yükseklik)
+        codec (str): FourCC kodu (ör. "mp4v", "MJPG", "avc1")
+        output_size (tuple): Çıktı boyutu (genişlik, yükseklik); verilmezse giriş boyutu
+        stride (int): Her stride karede bir kare yazılır (ör. 5: beş kareden biri)
+        queue_size (int): Kodlanmayı bekleyebilecek en fazla kare
+        drop (bool): Kuyruk doluysa beklemek yerine kareyi at
+        """
+        self.output_size = tuple(output_size or frame_size)
+        self.stride = max(1, stride)
+        self.drop = drop
+        fourcc = cv2.VideoWriter_fourcc(*codec)
+        self.writer = cv2.VideoWriter(path, fourcc, fps / self.stride, self.output_size)
+
+        # Kuyruktaki kareler için önceden ayrılmış tamponlar; kodlanan tampon boş listeye döner
+        w, h = self.output_size
+        self._free = queue.Queue()
+        for _ in range(queue_size):
+            self._free.put(np.empty((h, w, 3), dtype=np.uint8))
+        self._pending = queue.Queue()
+        self._error = None
+        self.frames = 0  # write() çağrısı sayısı
+        self.written = 0  # Kodlanan kare sayısı
+        self.dropped = 0  # Kuyruk dolu olduğu için atılan kare sayısı
+        self.copies = 0  # Kuyruk tamponuna kopyalanan (veya küçültülen) kare sayısı
+        self.encode_time = 0.0
+        self._thread = threading.Thread(target=self._encode, name="video-writer", daemon=True)
+        self._thread.start()
+
+    def _encode(self):
+        while True:
+            buffer = self._pending.get()
+            if buffer is None:
+                break
+            try:
+                if self._error is None:
+                    start = time.perf_counter()
+                    self.writer.write(buffer)
+                    self.encode_time += time.perf_counter() - start
+                    self.written += 1
+            except Exception as e:
+                self._error = e
+            finally:
+                self._free.put(buffer)
+
+    def write(self, frame):
+        if self._error is not None:
+            raise self._error
+        index = self.frames
+        self.frames += 1
+        if index % self.stride:
+            return True
+
+        try:
+            buffer = self._free.get(block=not self.drop)
+        except queue.Empty:
+            self.dropped += 1
+            return True
+
+        # Kare, çağıran tamponu yeniden kullanmadan önce kopyalanır (veya küçültülür)
+        if buffer.shape[1::-1] == frame.shape[1::-1]:
+            np.copyto(buffer, frame)
+        else:
+            cv2.resize(frame, self.output_size, dst=buffer, interpolation=cv2.INTER_AREA)
+        self.copies += 1
+        self._pending.put(buffer)
+        return True
+
+    def backlog(self):
+        """
+        Kodlanmayı bekleyen kare sayısını döndürür.
+        """
+        return self._pending.qsize()
+
+    def close(self):
+        """
+        Kuyruktaki tüm kareler kodlanana kadar bekler ve dosyayı kapatır.
+        """
+        self._pending.put(None)
+        self._thread.join()
+        self.writer.release()
+        if self._error is not None:
+            raise self._error
+
+
+class DisplaySink:
+    def __init__(self, window_name="Egg Counter"):
+        """
+        İşlenmiş kareleri bir pencerede gösterir.
+
+        Parametreler:
+        window_name (str): Pencere başlığı
+        """
+        self.window_name = window_name
+
+    def write(self, frame):
+        cv2.imshow(self.window_name, frame)
+        return not (cv2.waitKey(1) & 0xFF == ord('q'))
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+def write_to_sinks(sinks, frame):
+    """
+    Kareyi tüm sink'lere yazar.
+
+    Return:
+    Döngü devam etmeli ise True, herhangi bir sink durdurma istediyse False
+    """
+    keep_going = True
+    for sink in sinks:
+        if sink.write(frame) is False:
+            keep_going = False
+    return keep_going
+
+
+def close_sinks(sinks):
+    """
+    Tüm sink'leri kapatır.
+    """
+    for sink in sinks:
+        sink.close()
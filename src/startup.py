@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+"""
+Sayım giriş noktaları için hızlı başlangıç yardımcıları.
+- ultralytics (ve torch) yalnızca model gerçekten yüklenirken içe aktarılır.
+- ModelLoader modeli arka plan iş parçacığında yükler; ana iş parçacığı bu
+  sırada video kaynağını açar (kamera/RTSP açılışı saniyeler sürebilir).
+- Yüklemeden sonra boş bir kare üzerinde ısınma çıkarımı yapılır; ilk gerçek
+  karenin tembel başlatma (lazy init) maliyeti ödemesi engellenir.
+- İsteğe bağlı olarak ağırlıklar bir kez ONNX/OpenVINO biçimine dışa aktarılır
+  ve sonraki başlangıçlarda bu CPU için iyileştirilmiş model yüklenir.
+- StartupMetrics süreç başlangıcından itibaren aşama zamanlarını ve ilk
+  sayıma kadar geçen süreyi (time-to-first-count) kaydeder.
+"""
+
+_IMPORTED_AT = time.perf_counter()  # Bu modül ilk içe aktarıldığında (giriş noktasının başı)
+
+EXPORT_FORMATS = ("onnx", "openvino")
+
+
+def exported_path(weights, export_format):
+    """
+    ultralytics'in dışa aktarma çıktısının yolunu döndürür
+    (onnx: best.onnx, openvino: best_openvino_model/).
+    """
+    stem = os.path.splitext(weights)[0]
+    if export_format == "onnx":
+        return stem + ".onnx"
+    if export_format == "openvino":
+        return stem + "_openvino_model"
+    raise ValueError(f"Bilinmeyen dışa aktarma biçimi: {export_format}")
+
+
+def load_model(weights, export_format=None, task=None):
+    """
+    YOLO modelini yükler; ultralytics burada içe aktarılır.
+
+    Parametreler:
+    weights (str): Model ağırlıkları (.pt) veya dışa aktarılmış model yolu
+    export_format (str): "onnx" veya "openvino" verilirse, dışa aktarılmış model
+        yoksa bir kez oluşturulur (ağırlıklardan eskiyse yenilenir) ve o yüklenir
+    task (str): Dışa aktarılmış modeller için görev ("detect", "segment")
+
+    Return:
+    YOLO modeli
+    """
+    from ultralytics import YOLO
+
+    if export_format:
+        target = exported_path(weights, export_format)
+        if not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(weights):
+            model = YOLO(weights)
+            task = task or model.task
+            target = model.export(format=export_format)
+        return YOLO(target, task=task)
+    return YOLO(weights, task=task)
+
+
+def warm_up(model, frame_shape, runs=1):
+    """
+    Boş bir kare üzerinde çıkarım yaparak modelin tembel başlatmasını tamamlar.
+
+    Parametreler:
+    model: YOLO modeli
+    frame_shape (tuple): Gerçek karelerle aynı (H, W, 3) boyut
+    runs (int): Isınma çıkarımı sayısı
+    """
+    frame = np.zeros(frame_shape, dtype=np.uint8)
+    for _ in range(runs):
+        model(frame, verbose=False)
+
+
+class ModelLoader:
+    def __init__(self, weights, export_format=None, task=None, warmup_runs=1):
+        """
+        Modeli arka plan iş parçacığında yükler ve ısıtır.
+
+        Kullanım:
+        loader = ModelLoader("best.pt")   # Yükleme hemen başlar
+        cap = cv2.VideoCapture(...)        # Bu sırada kaynak açılır
+        loader.set_frame_shape((h, w, 3))  # Isınma gerçek kare boyutuyla yapılır
+        model = loader.get()
+
+        Parametreler:
+        weights (str): Model ağırlıkları
+        export_format (str): İsteğe bağlı "onnx" veya "openvino"
+        task (str): Dışa aktarılmış modeller için görev
+        warmup_runs (int): Isınma çıkarımı sayısı (0: ısınma yok)
+        """
+        self.weights = weights
+        self.export_format = export_format
+        self.task = task
+        self.warmup_runs = warmup_runs
+        self.load_time = 0.0
+        self.warmup_time = 0.0
+        self._model = None
+        self._error = None
+        self._frame_shape = None
+        self._shape_ready = threading.Event()
+        self._thread = threading.Thread(target=self._load, name="model-loader", daemon=True)
+        self._thread.start()
+
+    def _load(self):
+        try:
+            start = time.perf_counter()
+            model = load_model(self.weights, self.export_format, self.task)
+            self.load_time = time.perf_counter() - start
+            if self.warmup_runs:
+                self._shape_ready.wait()
+                start = time.perf_counter()
+                warm_up(model, self._frame_shape, self.warmup_runs)
+                self.warmup_time = time.perf_counter() - start
+            self._model = model
+        except Exception as e:
+            self._error = e
+
+    def set_frame_shape(self, frame_shape):
+        """
+        Isınma çıkarımı için kare boyutunu bildirir (kaynak açıldıktan sonra).
+        """
+        self._frame_shape = tuple(frame_shape)
+        self._shape_ready.set()
+
+    def get(self):
+        """
+        Yükleme (ve ısınma) bitene kadar bekler ve modeli döndürür.
+        Kare boyutu bildirilmediyse ısınma varsayılan 640x640 kare ile yapılır.
+        """
+        if not self._shape_ready.is_set():
+            self.set_frame_shape((640, 640, 3))
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._model
+
+
+class StartupMetrics:
+    def __init__(self, start=None):
+        """
+        Başlangıç aşamalarının zamanlarını kaydeder.
+
+        Parametreler:
+        start (float): Referans zaman (perf_counter); varsayılan bu modülün içe aktarılma anı
+        """
+        self.start = _IMPORTED_AT if start is None else start
+        self.marks = {}
+
+    def mark(self, name):
+        """
+        Bir aşamanın bitişini kaydeder (yalnızca ilk çağrı kaydedilir).
+        """
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.start
+
+    def observe(self, count):
+        """
+        Her işlenen kareden sonra çağrılır: ilk sonucu ve ilk sayımı işaretler.
+
+        Return:
+        Yeni bir işaret eklendiyse True
+        """
+        added = False
+        if "first_result" not in self.marks:
+            self.mark("first_result")
+            added = True
+        if count and "first_count" not in self.marks:
+            self.mark("first_count")
+            added = True
+        return added
+
+    def report(self):
+        """
+        Aşama zamanlarını tek satırlık bir özet olarak döndürür.
+        """
+        return "Başlangıç: " + ", ".join(f"{name} {seconds:.2f} s" for name, seconds in self.marks.items())
@@ -0,0 +1,210 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+
+from detection_cache import DetectionCache
+from tracker import CentroidTracker
+
+"""
+Önbelleğe alınmış tespitler üzerinde parametre taraması (sweep).
+Sayım çizgisi konumu, güven eşiği ve eşleştirme eşiği ızgarası, gerçek
+(elle sayılmış) sayımlara karşı değerlendirilir; her yapılandırmanın sayım
+hatası ve en hızlı doğru yapılandırma raporlanır.
+
+Takip yalnızca güven eşiğine ve eşleştirme eşiğine bağlıdır; çizgi konumu
+takibi etkilemez. Bu yüzden her (güven, eşik) çifti için tespitler bir kez
+takip edilir ve eşleşen her adım (iz ID'si, önceki x, yeni x) kaydedilir.
+Tüm çizgi konumları bu adımlar üzerinden tek vektörel işlemle sayılır: bir
+çizgi için sayım, o çizgiyi en az bir adımda geçen farklı iz sayısıdır
+(EggCounter'ın "her iz bir kez sayılır" kuralıyla aynı). (güven, eşik)
+çiftleri işçi süreçlere dağıtılır.
+"""
+
+_caches = []  # İşçi süreçteki önbellekler (initializer ile yüklenir)
+
+
+def _load_caches(paths):
+    global _caches
+    _caches = [DetectionCache.load(path) for path in paths]
+
+
+def track_steps(cache, conf_threshold, max_distance, match_method="greedy", max_missed=0):
+    """
+    Önbellekteki tespitleri bir kez takip eder ve eşleşen adımları döndürür.
+
+    Return:
+    ids, prev_x, cur_x (np.ndarray): Eşleşen her tespit için iz ID'si ve x merkezleri
+    """
+    tracker = CentroidTracker(max_distance, match_method, max_missed)
+    ids, prev_x, cur_x = [], [], []
+    for detections in cache.replay(conf_threshold):
+        # EggCounter.update() ile aynı merkez hesabı
+        boxes = detections[:, :4].astype(np.int64)
+        centers = (boxes[:, :2] + boxes[:, 2:]) // 2
+        frame_ids, prev_centers, matched = tracker.update(centers)
+        ids.append(frame_ids[matched])
+        prev_x.append(prev_centers[matched, 0])
+        cur_x.append(centers[matched, 0])
+    return np.concatenate(ids), np.concatenate(prev_x), np.concatenate(cur_x)
+
+
+def count_lines(ids, prev_x, cur_x, lines, direction="right_to_left"):
+    """
+    Tüm çizgi konumları için sayımları tek geçişte hesaplar.
+
+    Parametreler:
+    ids, prev_x, cur_x: track_steps() çıktısı
+    lines (np.ndarray): Artan sırada çizgi konumları
+    direction (str): Sayım yönü
+
+    Return:
+    (L,) her çizgi için sayım
+    """
+    lines = np.asarray(lines)
+    if direction == "right_to_left":
+        # prev_x > L >= cur_x
+        lo = np.searchsorted(lines, cur_x, side="left")
+        hi = np.searchsorted(lines, prev_x, side="left")
+    else:
+        # prev_x < L <= cur_x
+        lo = np.searchsorted(lines, prev_x, side="right")
+        hi = np.searchsorted(lines, cur_x, side="right")
+
+    spans = np.maximum(hi - lo, 0)
+    crossing = np.flatnonzero(spans)
+    spans = spans[crossing]
+    # Her (adım, geçilen çizgi) çifti için çizgi indeksi
+    first = np.repeat(lo[crossing] - np.cumsum(spans) + spans, spans)
+    line_idx = first + np.arange(spans.sum())
+    keys = np.unique(np.repeat(ids[crossing], spans) * len(lines) + line_idx)
+    return np.bincount(keys % len(lines), minlength=len(lines))
+
+
+def evaluate(conf_threshold, max_distance, lines, direction):
+    """
+    Bir (güven, eşik) çifti için tüm önbellekleri ve çizgileri değerlendirir (işçi süreçte).
+
+    Return:
+    (conf, gate, (V, L) sayımlar, kare başına takip süresi)
+    """
+    counts = []
+    frames = 0
+    start = time.perf_counter()
+    for cache in _caches:
+        steps = track_steps(cache, conf_threshold, max_distance)
+        counts.append(count_lines(*steps, lines, direction))
+        frames += len(cache)
+    elapsed = time.perf_counter() - start
+    return conf_threshold, max_distance, np.array(counts), elapsed / max(1, frames)
+
+
+def sweep(cache_paths, truths, lines, confs, gates, direction="right_to_left", workers=None):
+    """
+    Izgaradaki tüm yapılandırmaları değerlendirir.
+
+    Parametreler:
+    cache_paths (list): Önbellek dosyaları
+    truths (list): Her önbellek için gerçek sayım
+    lines, confs, gates: Çizgi konumları, güven eşikleri ve eşleştirme eşikleri
+    direction (str): Sayım yönü
+    workers (int): İşçi süreç sayısı (varsayılan: çekirdek sayısı)
+
+    Return:
+    [{"line", "conf", "gate", "counts", "error", "ms_per_frame"}, ...] (hata, süre sırasıyla)
+    """
+    lines = np.sort(np.asarray(lines))
+    truths = np.asarray(truths)
+    pairs = list(product(confs, gates))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pairs)))
+
+    with ProcessPoolExecutor(workers, initializer=_load_caches, initargs=(cache_paths,)) as pool:
+        futures = [pool.submit(evaluate, conf, gate, lines, direction) for conf, gate in pairs]
+        outcomes = [f.result() for f in futures]
+
+    rows = []
+    for conf, gate, counts, seconds in outcomes:
+        errors = np.abs(counts - truths[:, None]).sum(axis=0)
+        for i, line in enumerate(lines.tolist()):
+            rows.append({"line": line, "conf": conf, "gate": gate, "counts": counts[:, i].tolist(),
+                         "error": int(errors[i]), "ms_per_frame": seconds * 1000})
+    rows.sort(key=lambda row: (row["error"], row["ms_per_frame"]))
+    return rows
+
+
+def parse_values(tokens, kind=float):
+    """
+    "200 250 300" veya "100:600:20" (başlangıç:bitiş:adım, bitiş hariç) biçimindeki değerleri listeye çevirir.
+    """
+    values = []
+    for token in tokens:
+        if ":" in token:
+            start, stop, step = (kind(x) for x in token.split(":"))
+            values.extend(kind(v) for v in np.arange(start, stop, step).tolist())
+        else:
+            values.append(kind(token))
+    return values
+
+
+def parse_case(text):
+    """
+    "önbellek.npz,gerçek_sayım" biçimindeki argümanı (yol, sayım) çiftine çevirir.
+    """
+    path, truth = text.rsplit(",", 1)
+    return path, int(truth)
+
+
+if __name__ == "__main__":
+    from counting import EggCounter
+
+    parser = argparse.ArgumentParser(description="Önbelleğe alınmış tespitler üzerinde parametre taraması")
+    parser.add_argument("--case", action="append", required=True,
+                        help="önbellek.npz,gerçek_sayım (ör. detection_cache/hat1-....npz,412); birden fazla verilebilir")
+    parser.add_argument("--lines", nargs="+", default=["100:1200:20"], help="Çizgi konumları veya başlangıç:bitiş:adım")
+    parser.add_argument("--confs", nargs="+", default=["0.3", "0.4", "0.5", "0.6", "0.7"], help="Güven eşikleri")
+    parser.add_argument("--gates", nargs="+", default=["30", "40", "50", "70"], help="Eşleştirme eşikleri (piksel)")
+    parser.add_argument("--direction", default="right_to_left", choices=("right_to_left", "left_to_right"))
+    parser.add_argument("--workers", type=int, default=None, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--tolerance", type=int, default=0, help="Doğru kabul edilen en fazla toplam sayım hatası")
+    parser.add_argument("--top", type=int, default=20, help="Yazdırılacak en iyi yapılandırma sayısı")
+    args = parser.parse_args()
+
+    cases = [parse_case(text) for text in args.case]
+    paths, truths = [path for path, _ in cases], [truth for _, truth in cases]
+    lines = parse_values(args.lines, int)
+    confs = parse_values(args.confs, float)
+    gates = parse_values(args.gates, float)
+    # Kayıt eşiğinden düşük güven eşikleri eksik tespitlerle taranmasın
+    for path in paths:
+        cache = DetectionCache.load(path)
+        if not cache.supports(min(confs)):
+            parser.error(f"{path} {cache.min_conf} güven eşiğiyle kaydedilmiş; --confs bu değerden küçük olamaz")
+
+    start = time.perf_counter()
+    rows = sweep(paths, truths, lines, confs, gates, args.direction, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{len(rows)} yapılandırma, {len(paths)} video, {elapsed:.2f} s")
+
+    print(f"{'çizgi':>6} {'güven':>6} {'eşik':>6} {'hata':>6} {'ms/kare':>8}  sayımlar (gerçek: {truths})")
+    for row in rows[:args.top]:
+        print(f"{row['line']:>6} {row['conf']:>6.2f} {row['gate']:>6.0f} {row['error']:>6} "
+              f"{row['ms_per_frame']:>8.3f}  {row['counts']}")
+
+    accurate = [row for row in rows if row["error"] <= args.tolerance]
+    if not accurate:
+        print(f"Hata toleransı ({args.tolerance}) içinde yapılandırma yok")
+    else:
+        best = min(accurate, key=lambda row: row["ms_per_frame"])
+        # En iyi yapılandırmayı EggCounter ile doğrula
+        counts = []
+        for path in paths:
+            egg_counter = EggCounter(best["line"], args.direction, max_distance=best["gate"])
+            for detections in DetectionCache.load(path).replay(best["conf"]):
+                egg_counter.update(detections)
+            counts.append(egg_counter.get_total_count())
+        status = "doğrulandı" if counts == best["counts"] else f"FARKLI: EggCounter {counts}"
+        print(f"En hızlı doğru yapılandırma: --line-position {best['line']} --conf {best['conf']:.2f} "
+              f"--max-distance {best['gate']:.0f} (hata {best['error']}, {best['ms_per_frame']:.3f} ms/kare, {status})")
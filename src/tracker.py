@@ -0,0 +1,314 @@
+import numpy as np
+
+"""
+CentroidTracker sınıfı, tespit merkezlerini önceki karedeki izlerle eşleştirir.
+İz merkezleri NumPy dizilerinde tutulur ve her iz en fazla bir tespite atanır
+(bire bir eşleştirme).
+
+Aday çiftler, hücre boyu eşleştirme eşiğine eşit düzgün bir ızgarayla (uniform
+grid) bulunur: eşik içindeki her iz, tespitin hücresinde veya komşu 8 hücreden
+birindedir. Izgara her karede izlerin tahmini konumlarından tek bir vektörel
+sıralamayla kurulur (iz bankaları zaten her karede yeniden yazılır) ve her
+tespit için 9 hücrenin aralığı ikili aramayla bulunur. Böylece mesafe yalnızca
+yakın çiftler için hesaplanır; maliyet toplam iz sayısıyla değil yerel
+yoğunlukla artar. index="dense" eski tam mesafe matrisini kullanır.
+
+İzler sabit boyutlu, yapılandırılmış (structured) bir dizide saklanır. Dizi
+iki bank halinde tutulur ve her karede bankalar yer değiştirir; böylece uzun
+çalışmalarda kare başına yeni iz nesnesi oluşturulmaz ve bellek yalnızca
+aynı anda görünen iz sayısıyla sınırlı kalır.
+
+Her iz, son iki gözlemden hesaplanan sabit hızını da taşır. Dedektörün
+çalıştırılmadığı (atlanan) karelerde predict() izleri bu hızla ilerletir;
+eşleştirme bir sonraki tespitte tahmini konuma göre yapılır.
+"""
+
+TRACK_DTYPE = np.dtype([
+    ("id", np.int64),  # İz ID'si
+    ("center", np.int64, (2,)),  # Son görülen merkez (x, y)
+    ("counted", np.bool_),  # Bu iz sayıldı mı?
+    ("missed", np.int32),  # Art arda kaçırılan kare sayısı
+    ("velocity", np.float64, (2,)),  # Kare başına hız (piksel/kare)
+    ("age", np.int32),  # Son gözlemden bu yana tahminle ilerletilen kare sayısı
+])
+
+# Izgarada bir hücrenin kendisi ve 8 komşusu (dx, dy)
+GRID_NEIGHBORS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.int64)
+
+
+class CentroidTracker:
+    def __init__(self, max_distance=50, method="greedy", max_missed=0, capacity=64, index="grid"):
+        """
+        CentroidTracker sınıfının başlatıcı metodu.
+
+        Parametreler:
+        max_distance (float): Eşleştirme için mesafe eşiği (piksel, eşik dahil değil)
+        method (str): Atama yöntemi ("greedy" veya "hungarian")
+            "greedy": Eşik altındaki tüm çiftler mesafeye göre sıralanır ve
+                      en yakından başlayarak bire bir atanır.
+            "hungarian": Toplam mesafeyi en aza indiren global atama (scipy gerekir).
+        max_missed (int): Bir izin silinmeden önce kaç kare boyunca tespit
+            edilmeden kalabileceği (0: eşleşmeyen iz hemen silinir)
+        capacity (int): Başlangıç iz kapasitesi; gerekirse iki katına çıkar
+        index (str): Aday çift arama yöntemi
+            "grid": Eşik boyunda hücrelerden oluşan ızgara (yerel yoğunlukla ölçeklenir)
+            "dense": Tüm tespit-iz çiftleri için mesafe matrisi
+        """
+        if method not in ("greedy", "hungarian"):
+            raise ValueError(f"Bilinmeyen atama yöntemi: {method}")
+        if index not in ("grid", "dense"):
+            raise ValueError(f"Bilinmeyen arama yöntemi: {index}")
+        if method == "hungarian":
+            try:
+                from scipy.optimize import linear_sum_assignment
+            except ImportError as e:
+                raise ImportError("'hungarian' yöntemi için scipy gereklidir") from e
+            self._linear_sum_assignment = linear_sum_assignment
+
+        self.max_distance = max_distance
+        self.method = method
+        self.max_missed = max_missed
+        self.index = index
+        self._tracks = np.zeros(capacity, dtype=TRACK_DTYPE)  # Aktif izler (ilk self.size satır)
+        self._spare = np.zeros(capacity, dtype=TRACK_DTYPE)  # Bir sonraki kare için yedek bank
+        self.size = 0  # Aktif iz sayısı
+        self.last_id = 0  # Son atanan ID (ilk ID 1'dir)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def capacity(self):
+        return len(self._tracks)
+
+    @property
+    def tracks(self):
+        """
+        Aktif izlerin görünümü. update() sonrasında ilk N satır, N tespitle
+        aynı sıradadır; kalan satırlar bu karede görülmeyen ama henüz
+        silinmemiş izlerdir.
+        """
+        return self._tracks[:self.size]
+
+    @property
+    def ids(self):
+        return self.tracks["id"]
+
+    @property
+    def centers(self):
+        return self.tracks["center"]
+
+    def positions(self):
+        """
+        İzlerin tahmini güncel konumlarını döndürür: son gözlenen merkez +
+        hız * (son gözlemden bu yana geçen kare). predict() hiç çağrılmadıysa
+        son gözlenen merkezlerle aynıdır.
+        """
+        tracks = self.tracks
+        if not tracks["age"].any():
+            return tracks["center"]
+        offset = np.rint(tracks["velocity"] * tracks["age"][:, None]).astype(np.int64)
+        return tracks["center"] + offset
+
+    def predict(self):
+        """
+        Tüm izleri sabit hız varsayımıyla bir kare ilerletir (dedektörün
+        çalıştırılmadığı kareler için). Gözlenen merkezler değişmez; yalnızca
+        son gözlemden bu yana geçen kare sayısı artar. Sonraki update()
+        eşleştirmeyi bu tahmini konumlara göre yapar; böylece her karede
+        çalışan yoldaki gibi izle tespit arasında yalnızca bir karelik hareket kalır.
+        """
+        self.tracks["age"] += 1
+
+    def distance_matrix(self, centers):
+        """
+        Tespit merkezleri ile izlerin tahmini konumları arasındaki kare mesafe matrisini döndürür.
+
+        Parametreler:
+        centers (np.ndarray): (N, 2) tespit merkezleri
+
+        Return:
+        (N, M) kare mesafe matrisi
+        """
+        diff = centers[:, None, :] - self.positions()[None, :, :]
+        return np.einsum("nmk,nmk->nm", diff, diff)
+
+    def candidate_pairs(self, centers):
+        """
+        Eşleştirme eşiği içindeki (tespit, iz) çiftlerini döndürür.
+
+        Parametreler:
+        centers (np.ndarray): (N, 2) tespit merkezleri
+
+        Return:
+        det_idx (np.ndarray): (P,) tespit indeksleri (artan)
+        trk_idx (np.ndarray): (P,) iz indeksleri (her tespit içinde artan)
+        dist_sq (np.ndarray): (P,) kare mesafeler
+        """
+        gate_sq = self.max_distance ** 2
+        if self.index == "dense":
+            dist_sq = self.distance_matrix(centers)
+            det_idx, trk_idx = np.nonzero(dist_sq < gate_sq)
+            return det_idx, trk_idx, dist_sq[det_idx, trk_idx]
+
+        positions = self.positions()
+        cell = max(self.max_distance, 1)
+        track_cells = np.floor_divide(positions, cell).astype(np.int64)
+        det_cells = np.floor_divide(centers, cell).astype(np.int64)
+        # Hücre (cx, cy) tek bir anahtara çevrilir; kenarlarda bir hücre pay bırakılır ki komşular taşmasın
+        origin = np.minimum(track_cells.min(0), det_cells.min(0)) - 1
+        rows = int(max(track_cells[:, 1].max(), det_cells[:, 1].max()) - origin[1] + 2)
+        track_keys = (track_cells[:, 0] - origin[0]) * rows + (track_cells[:, 1] - origin[1])
+        order = np.argsort(track_keys, kind="stable")
+        sorted_keys = track_keys[order]
+
+        neighbor_keys = ((det_cells[:, 0] - origin[0])[:, None] + GRID_NEIGHBORS[:, 0]) * rows \
+            + (det_cells[:, 1] - origin[1])[:, None] + GRID_NEIGHBORS[:, 1]
+        lo = np.searchsorted(sorted_keys, neighbor_keys, side="left").ravel()
+        counts = np.searchsorted(sorted_keys, neighbor_keys, side="right").ravel() - lo
+
+        # Her (tespit, hücre) aralığını çiftlere aç
+        total = int(counts.sum())
+        det_idx = np.repeat(np.arange(len(centers)).repeat(len(GRID_NEIGHBORS)), counts)
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        trk_idx = order[np.repeat(lo, counts) + within]
+        diff = centers[det_idx] - positions[trk_idx]
+        dist_sq = np.einsum("pk,pk->p", diff, diff)
+
+        keep = dist_sq < gate_sq
+        det_idx, trk_idx, dist_sq = det_idx[keep], trk_idx[keep], dist_sq[keep]
+        pair_order = np.lexsort((trk_idx, det_idx))
+        return det_idx[pair_order], trk_idx[pair_order], dist_sq[pair_order]
+
+    def _assign_greedy(self, det_idx, trk_idx, dist_sq, n, m):
+        assignment = np.full(n, -1, dtype=np.int64)
+        # Tespiti ve izi yalnızca tek bir çiftte geçen çiftler sıradan bağımsız olarak atanır
+        det_single = np.bincount(det_idx, minlength=n)[det_idx] == 1
+        trk_single = np.bincount(trk_idx, minlength=m)[trk_idx] == 1
+        unique = det_single & trk_single
+        assignment[det_idx[unique]] = trk_idx[unique]
+
+        det_idx, trk_idx, dist_sq = det_idx[~unique], trk_idx[~unique], dist_sq[~unique]
+        order = np.argsort(dist_sq, kind="stable")
+        det_taken = np.zeros(n, dtype=bool)
+        trk_taken = np.zeros(m, dtype=bool)
+        for d, t in zip(det_idx[order].tolist(), trk_idx[order].tolist()):
+            if det_taken[d] or trk_taken[t]:
+                continue
+            det_taken[d] = trk_taken[t] = True
+            assignment[d] = t
+        return assignment
+
+    def _assign_hungarian(self, det_idx, trk_idx, dist_sq, n, m):
+        assignment = np.full(n, -1, dtype=np.int64)
+        if not len(det_idx):
+            return assignment
+        # Yalnızca en az bir aday çifti olan tespit ve izler atamaya girer
+        dets, det_pos = np.unique(det_idx, return_inverse=True)
+        trks, trk_pos = np.unique(trk_idx, return_inverse=True)
+        gate_sq = self.max_distance ** 2
+        # Eşik dışındaki çiftlere çok büyük maliyet ver, sonra atamadan çıkar
+        cost = np.full((len(dets), len(trks)), gate_sq * (len(dets) + len(trks) + 1), dtype=np.float64)
+        cost[det_pos, trk_pos] = np.sqrt(dist_sq)
+        gated = np.ones(cost.shape, dtype=bool)
+        gated[det_pos, trk_pos] = False
+        rows, cols = self._linear_sum_assignment(cost)
+        keep = ~gated[rows, cols]
+        assignment[dets[rows[keep]]] = trks[cols[keep]]
+        return assignment
+
+    def restore(self, tracks, last_id):
+        """
+        Takipçi durumunu geri yükler (checkpoint'ten devam ederken).
+
+        Parametreler:
+        tracks (np.ndarray): TRACK_DTYPE dizisi (tracks özelliğinin bir kopyası)
+        last_id (int): Son atanan ID
+        """
+        self._reserve(len(tracks))
+        self._tracks[:len(tracks)] = tracks
+        self.size = len(tracks)
+        self.last_id = int(last_id)
+
+    def _reserve(self, size):
+        if size <= len(self._tracks):
+            return
+        capacity = len(self._tracks)
+        while capacity < size:
+            capacity *= 2
+        tracks = np.zeros(capacity, dtype=TRACK_DTYPE)
+        tracks[:self.size] = self._tracks[:self.size]
+        self._tracks = tracks
+        self._spare = np.zeros(capacity, dtype=TRACK_DTYPE)
+
+    def update(self, centers):
+        """
+        Yeni karedeki tespit merkezlerini mevcut izlerle eşleştirir ve izleri günceller.
+        Eşleşmeyen tespitlere yeni ID verilir. Eşleşmeyen izler max_missed kareden
+        uzun süre görülmezse silinir. Eşleşen izlerin hızı son gözlemden bu yana
+        alınan yoldan güncellenir; yeni izler bu karedeki eşleşen izlerin ortanca
+        hızıyla başlar (bant üzerindeki yumurtalar birlikte hareket eder).
+
+        Parametreler:
+        centers (np.ndarray): (N, 2) tamsayı tespit merkezleri
+
+        Return:
+        ids (np.ndarray): (N,) her tespitin iz ID'si
+        prev_centers (np.ndarray): (N, 2) eşleşen izin önceki merkezi
+        matched (np.ndarray): (N,) tespitin mevcut bir izle eşleşip eşleşmediği
+        """
+        centers = np.asarray(centers, dtype=np.int64).reshape(-1, 2)
+        n = len(centers)
+        active = self._tracks[:self.size]
+
+        if n and self.size:
+            pairs = self.candidate_pairs(centers)
+            if self.method == "hungarian":
+                assignment = self._assign_hungarian(*pairs, n, self.size)
+            else:
+                assignment = self._assign_greedy(*pairs, n, self.size)
+        else:
+            assignment = np.full(n, -1, dtype=np.int64)
+
+        matched = assignment >= 0
+        src = assignment[matched]
+
+        # Bu karede eşleşmeyen ama henüz süresi dolmamış izler
+        keep = active["missed"] < self.max_missed
+        keep[src] = False
+        survivors = np.flatnonzero(keep)
+
+        total = n + len(survivors)
+        self._reserve(total)
+        active = self._tracks[:self.size]
+        out = self._spare[:total]
+
+        prev_centers = np.zeros((n, 2), dtype=np.int64)
+        prev_centers[matched] = active["center"][src]
+
+        # Tespitlere ait izler ilk N satıra, tespit sırasıyla yazılır
+        n_new = n - len(src)
+        ids = out["id"][:n]
+        ids[matched] = active["id"][src]
+        ids[~matched] = np.arange(self.last_id + 1, self.last_id + 1 + n_new)
+        self.last_id += n_new
+
+        out["center"][:n] = centers
+        out["counted"][:n] = False
+        out["counted"][:n][matched] = active["counted"][src]
+        out["missed"][:n] = 0
+
+        # Hız = son gözlemden bu yana alınan yol / geçen kare sayısı (atlanan + kaçırılan kareler + bu kare)
+        steps = (active["age"][src] + active["missed"][src] + 1)[:, None]
+        velocity = out["velocity"][:n]
+        velocity[matched] = (centers[matched] - active["center"][src]) / steps
+        velocity[~matched] = np.median(velocity[matched], axis=0) if len(src) else 0.0
+        out["age"][:n] = 0
+
+        # Görülmeyen izler sona eklenir ve kaçırma sayaçları artırılır
+        out[n:] = active[survivors]
+        out["missed"][n:] += 1
+
+        self._tracks, self._spare = self._spare, self._tracks
+        self.size = total
+        return ids.copy(), prev_centers, matched